@@ -0,0 +1,145 @@
+# Kulcskocka Animációs Görbék - Panda3D Python
+#
+# A demókban az időfüggő viselkedés kézzel van kódolva (pl. current_stretch +=
+# stretch_speed * dt, majd normalized_stretch -> red_intensity leképezés).
+# Ez a modul újrahasznosítható görbe típust ad lineáris, Bezier és lépcsős
+# kulcsokkal. A görbék egész idő-tömbökre egyszerre kiértékelhetők (numpy),
+# és előre kiszámolt táblázatokba süthetők, így sok ezer animált paraméter
+# egyetlen vektorizált mintavételezéssel frissíthető objektumonkénti Python
+# aritmetika helyett.
+
+import numpy as np
+
+# Interpoláció típusok (a kulcstól a következő kulcsig érvényes)
+LINEAR = 0
+BEZIER = 1
+STEP = 2
+
+
+class AnimationCurve:
+    """
+    Egy skalár görbe kulcskockákból. A kulcsok idő szerint rendezettek;
+    az első kulcs előtt és az utolsó után a görbe konstans.
+    """
+
+    def __init__(self, keys=None):
+        self.times = np.zeros(0)
+        self.values = np.zeros(0)
+        self.modes = np.zeros(0, dtype=np.int8)
+        self.out_tangents = np.zeros(0)
+        self.in_tangents = np.zeros(0)
+        for key in keys or []:
+            self.add_key(*key)
+
+    def add_key(self, time, value, mode=LINEAR, out_tangent=0.0, in_tangent=0.0):
+        """
+        Kulcs hozzáadása. A Bezier kulcs érintői meredekségek (érték / másodperc):
+        az out_tangent a kulcsból kifelé, az in_tangent a kulcsba befelé hat.
+        """
+        index = int(np.searchsorted(self.times, time, side='right'))
+        self.times = np.insert(self.times, index, float(time))
+        self.values = np.insert(self.values, index, float(value))
+        self.modes = np.insert(self.modes, index, mode)
+        self.out_tangents = np.insert(self.out_tangents, index, float(out_tangent))
+        self.in_tangents = np.insert(self.in_tangents, index, float(in_tangent))
+        return self
+
+    @property
+    def start(self):
+        return float(self.times[0])
+
+    @property
+    def end(self):
+        return float(self.times[-1])
+
+    def sample(self, times):
+        """A görbe kiértékelése tetszőleges alakú idő-tömbre (vagy skalárra)."""
+        t = np.asarray(times, dtype=np.float64)
+        if len(self.times) == 0:
+            return np.zeros_like(t)
+        if len(self.times) == 1:
+            return np.full_like(t, self.values[0])
+
+        # Szegmens index: a kulcs, amely után t következik
+        seg = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times) - 2)
+        t0 = self.times[seg]
+        t1 = self.times[seg + 1]
+        v0 = self.values[seg]
+        v1 = self.values[seg + 1]
+        dt = t1 - t0
+        u = np.clip((t - t0) / np.where(dt > 0, dt, 1.0), 0.0, 1.0)
+
+        # Lineáris
+        result = v0 + (v1 - v0) * u
+
+        # Bezier: a vezérlőpontok az érintőkből (harmadolt szegmens hosszal)
+        mode = self.modes[seg]
+        if np.any(mode == BEZIER):
+            p1 = v0 + self.out_tangents[seg] * dt / 3.0
+            p2 = v1 - self.in_tangents[seg + 1] * dt / 3.0
+            inv = 1.0 - u
+            bezier = inv ** 3 * v0 + 3.0 * inv ** 2 * u * p1 + 3.0 * inv * u ** 2 * p2 + u ** 3 * v1
+            result = np.where(mode == BEZIER, bezier, result)
+
+        # Lépcsős: a kulcs értéke a következő kulcsig
+        result = np.where(mode == STEP, np.where(u < 1.0, v0, v1), result)
+        return result
+
+    def evaluate(self, time):
+        """Egyetlen időpont kiértékelése (float)."""
+        return float(self.sample(time))
+
+    def bake(self, samples=256, start=None, end=None):
+        """A görbe előre kiszámolt táblázattá alakítása."""
+        return CurveTable([self], samples, start, end)
+
+
+class CurveTable:
+    """
+    Egy vagy több görbe közös időtartományra sütött táblázata (görbe x minta).
+    A mintavételezés indexszámításból és lineáris interpolációból áll, keresés nélkül.
+    """
+
+    def __init__(self, curves, samples=256, start=None, end=None):
+        self.curves = list(curves)
+        self.start = min(c.start for c in self.curves) if start is None else float(start)
+        self.end = max(c.end for c in self.curves) if end is None else float(end)
+        self.samples = max(2, int(samples))
+
+        grid = np.linspace(self.start, self.end, self.samples)
+        self.table = np.stack([curve.sample(grid) for curve in self.curves])
+        self.scale = (self.samples - 1) / max(self.end - self.start, 1e-9)
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    def sample(self, times):
+        """
+        Mintavételezés. A 'times' alakja lehet:
+          - skalár: minden görbe ugyanabban az időpontban -> (görbék száma,)
+          - (görbék száma, ...) alakú tömb: görbénként saját időpontok
+        """
+        t = np.asarray(times, dtype=np.float64)
+        position = np.clip((t - self.start) * self.scale, 0.0, self.samples - 1)
+        index = np.minimum(position.astype(np.int64), self.samples - 2)
+        frac = position - index
+
+        if t.ndim == 0:
+            row = self.table
+            return row[:, index] + (row[:, index + 1] - row[:, index]) * frac
+
+        # Görbénként saját idők: a sorindexet az első tengely adja
+        rows = np.arange(len(self.curves)).reshape((-1,) + (1,) * (t.ndim - 1))
+        low = self.table[rows, index]
+        high = self.table[rows, index + 1]
+        return low + (high - low) * frac
+
+    def sample_curve(self, curve_index, times):
+        """Egyetlen görbe mintavételezése tetszőleges alakú idő-tömbre (pl. sok objektum)."""
+        t = np.asarray(times, dtype=np.float64)
+        position = np.clip((t - self.start) * self.scale, 0.0, self.samples - 1)
+        index = np.minimum(position.astype(np.int64), self.samples - 2)
+        frac = position - index
+        row = self.table[curve_index]
+        return row[index] + (row[index + 1] - row[index]) * frac
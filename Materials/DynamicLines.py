@@ -0,0 +1,78 @@
+# Helyben Frissített Vonal Geometria - Panda3D Python
+#
+# A MovingCubeParticlesDemo minden képkockában új LineSegs-et épít, a create()
+# eredményét kicsomagolja, make_copy()-t készít, és remove_all_geoms() után
+# cseréli a GeomNode tartalmát. Ez több allokáció és teljes buffer újratöltés
+# 24 vertexért. Itt egyetlen, tartós, indexelt GeomLines készül a közös
+# vertexekre; képkockánként csak a pozíciók íródnak felül helyben (memoryview),
+# az index buffer és a Geom/GeomNode szerkezet változatlan marad.
+#
+# Használat:
+#     lines = DynamicLines('cube_lines', 8, cube_edges)
+#     lines_np = render.attach_new_node(lines.node)
+#     lines.set_positions(positions)   # (8, 3) tömb vagy VBase3 lista
+
+from panda3d.core import (
+    GeomVertexData, GeomVertexFormat, GeomLines, GeomNode, Geom, GeomEnums,
+    BoundingBox, Point3
+)
+import numpy as np
+
+
+class DynamicLines:
+    """
+    Indexelt vonalhalmaz közös vertexekkel. Az élek (index párok) rögzítettek,
+    a vertex pozíciók képkockánként helyben frissíthetők.
+    """
+
+    def __init__(self, name, num_vertices, edges, bounds=None):
+        self.num_vertices = int(num_vertices)
+        edge_array = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.num_edges = len(edge_array)
+
+        # Vertex buffer: csak pozíció (v3), dinamikus használat
+        self.vdata = GeomVertexData(name, GeomVertexFormat.get_v3(), Geom.UH_dynamic)
+        self.vdata.unclean_set_num_rows(self.num_vertices)
+        self._modify_positions()[:] = 0.0
+
+        # Index buffer: egyszer töltjük fel, utána nem változik
+        prim = GeomLines(Geom.UH_static)
+        if self.num_vertices < 0xffff:
+            prim.set_index_type(GeomEnums.NT_uint16)
+            index_dtype = np.uint16
+        else:
+            prim.set_index_type(GeomEnums.NT_uint32)
+            index_dtype = np.uint32
+        index_handle = prim.modify_vertices()
+        index_handle.unclean_set_num_rows(edge_array.size)
+        np.frombuffer(memoryview(index_handle), dtype=index_dtype)[:] = edge_array.ravel()
+
+        self.geom = Geom(self.vdata)
+        self.geom.add_primitive(prim)
+        self.node = GeomNode(name)
+        self.node.add_geom(self.geom)
+
+        # A Geom a helyben módosított vertexekből nem számol új határt:
+        # rögzített határ esetén egyszer beállítjuk, egyébként frissítéskor számoljuk.
+        self.fixed_bounds = bounds is not None
+        if self.fixed_bounds:
+            self.node.set_bounds(bounds)
+        self.node.set_final(True)
+
+    def _modify_positions(self):
+        """Írható (N, 3) float32 nézet a vertex bufferre (a buffert módosítottnak jelöli)."""
+        return np.frombuffer(memoryview(self.vdata.modify_array(0)), dtype=np.float32).reshape(-1, 3)
+
+    def set_positions(self, positions):
+        """Az összes vertex pozíciójának felülírása egy másolással."""
+        if not isinstance(positions, np.ndarray):
+            positions = [tuple(p) for p in positions] # VBase3 lista támogatása
+        view = self._modify_positions()
+        view[:] = positions
+        if not self.fixed_bounds:
+            self._update_bounds(view)
+
+    def _update_bounds(self, view):
+        low = view.min(axis=0)
+        high = view.max(axis=0)
+        self.node.set_bounds(BoundingBox(Point3(*low.tolist()), Point3(*high.tolist())))
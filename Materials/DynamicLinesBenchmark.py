@@ -0,0 +1,112 @@
+# Dinamikus Vonal Mérés - Panda3D Python
+#
+# A MovingCubeParticlesDemo korábbi, képkockánként újraépített LineSegs
+# geometriáját hasonlítja össze a DynamicLines helyben frissített, indexelt
+# GeomLines megoldásával. Offscreen ablakban mér: külön a frissítés (CPU)
+# idejét és a teljes képkocka idejét (frissítés + kirajzolás, buffer feltöltés).
+#
+# Használat: python DynamicLinesBenchmark.py [képkockák száma]
+
+import sys
+import time
+from panda3d.core import loadPrcFileData, LineSegs, GeomNode
+import numpy as np
+
+loadPrcFileData('', 'window-type offscreen\naudio-library-name null\nsync-video false')
+
+from direct.showbase.ShowBase import ShowBase
+
+from DynamicLines import DynamicLines
+
+# A kocka élei (mint a demóban)
+CUBE_EDGES = [
+    (0, 1), (1, 2), (2, 3), (3, 0),
+    (4, 5), (5, 6), (6, 7), (7, 4),
+    (0, 4), (1, 5), (2, 6), (3, 7)
+]
+
+
+class LineSegsRebuild:
+    """Referencia: a demó korábbi módszere (új LineSegs, create(), make_copy(), csere)."""
+
+    def __init__(self, parent, edges):
+        self.edges = edges
+        self.node = GeomNode('linesegs_lines')
+        self.np = parent.attach_new_node(self.node)
+
+    def update(self, positions):
+        ls = LineSegs('cube_segments')
+        ls.set_thickness(3.0)
+        ls.set_color(1.0, 0.5, 0.0, 1.0)
+        pos = positions.tolist()
+        for i, j in self.edges:
+            ls.draw_to(*pos[i])
+            ls.draw_to(*pos[j])
+        self.node.remove_all_geoms()
+        new_geom = ls.create()
+        final_geom = new_geom.get_geom(0) if isinstance(new_geom, GeomNode) else new_geom
+        self.node.add_geom(final_geom.make_copy())
+
+
+class InPlaceLines:
+    """DynamicLines: tartós index buffer, csak a pozíciók íródnak felül."""
+
+    def __init__(self, parent, edges, num_vertices):
+        self.lines = DynamicLines('dynamic_lines', num_vertices, edges)
+        self.np = parent.attach_new_node(self.lines.node)
+        self.np.set_render_mode_thickness(3.0)
+        self.np.set_color(1.0, 0.5, 0.0, 1.0)
+
+    def update(self, positions):
+        self.lines.set_positions(positions)
+
+
+def random_graph(num_vertices, num_edges, rng):
+    """Véletlen vertexek és élek a nagyobb méretű méréshez."""
+    edges = rng.integers(0, num_vertices, size=(num_edges, 2))
+    return edges.tolist()
+
+
+def run(base, method, positions, velocities, frames):
+    """Képkockák léptetése; visszaadja a frissítés és a teljes képkocka átlagidejét (ms)."""
+    update_total = 0.0
+    frame_total = 0.0
+    dt = 1.0 / 60.0
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        positions += velocities * dt
+        update_start = time.perf_counter()
+        method.update(positions)
+        update_total += time.perf_counter() - update_start
+        base.graphicsEngine.render_frame()
+        frame_total += time.perf_counter() - frame_start
+    method.np.remove_node()
+    return update_total / frames * 1000.0, frame_total / frames * 1000.0
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    base = ShowBase()
+    base.disable_mouse()
+    base.camera.set_pos(-15, -15, 10)
+    base.camera.look_at(0, 0, 0)
+    rng = np.random.default_rng(1)
+
+    cases = [("kocka (8 vertex)", 8, CUBE_EDGES)]
+    for num_vertices, num_edges in [(1000, 3000), (10000, 30000)]:
+        cases.append((f"gráf ({num_vertices} vertex)", num_vertices, random_graph(num_vertices, num_edges, rng)))
+
+    print(f"{'eset':<22} {'él':>7} {'módszer':<10} {'frissítés (ms)':>15} {'képkocka (ms)':>14}")
+    for label, num_vertices, edges in cases:
+        for name, factory in [("LineSegs", lambda: LineSegsRebuild(base.render, edges)),
+                              ("helyben", lambda: InPlaceLines(base.render, edges, num_vertices))]:
+            positions = rng.uniform(-5.0, 5.0, size=(num_vertices, 3)).astype(np.float32)
+            velocities = rng.uniform(-0.5, 0.5, size=(num_vertices, 3)).astype(np.float32)
+            update_ms, frame_ms = run(base, factory(), positions, velocities, frames)
+            print(f"{label:<22} {len(edges):>7} {name:<10} {update_ms:>15.3f} {frame_ms:>14.3f}")
+
+    base.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,22 @@
 # Fénycsík (Glow) Material Demo - Panda3D Python
 #
-# Ez a script egy egyszerű GLSL shadert használ, hogy egy objektumot
-# sugárzóan fényes, "fénycsík" forrásként mutasson be a Panda3D-ben.
+# Ez a script az InstancedGlow modul emisszív shaderét használja, hogy egy
+# objektumot sugárzóan fényes, "fénycsík" forrásként mutasson be a Panda3D-ben.
 # A modelleket belsőleg generáljuk (meshként) az OSError elkerülése érdekében.
 
 import sys
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import (
-    Shader, PointLight, VBase4, AmbientLight, 
+    PointLight, VBase4, AmbientLight, 
     GeomVertexData, GeomVertexFormat, GeomVertexWriter, 
     GeomTriangles, GeomNode, NodePath, Geom
 )
 import numpy as np
 import math
 
+from MeshGenerators import create_cuboid_mesh
+from InstancedGlow import InstancedGlowGroup, create_instanced_glow_shader
+
 class GlowMaterialDemo(ShowBase):
     def __init__(self):
         ShowBase.__init__(self)
@@ -23,7 +26,7 @@ class GlowMaterialDemo(ShowBase):
         # ------------------------------------------------
         # A külső modellek betöltési hibáinak kiküszöbölésére
         self.glow_sphere = self._create_sphere_mesh("glow_sphere_mesh", 1.5, 30)
-        self.normal_cube = self._create_cube_mesh("normal_cube_mesh", 1.5)
+        self.normal_cube = create_cuboid_mesh("normal_cube_mesh", 1.5, 1.5, 1.5)
 
 
         # ------------------------------------------------
@@ -39,68 +42,12 @@ class GlowMaterialDemo(ShowBase):
         self.accept('q', sys.exit)
 
         # ------------------------------------------------
-        # 2. GLSL Shader Kód
+        # 2. Sugárzó Material (InstancedGlow)
         # ------------------------------------------------
-
-        # Vertex Shader (Egyszerű transzformáció)
-        vertex_shader = """
-        #version 130
-        
-        // A Panda3D beépített Mátrixai
-        uniform mat4 p3d_ModelViewProjectionMatrix;
-        uniform mat4 p3d_ModelViewMatrix; // Szükséges lehet a normálokhoz
-        
-        // A Panda3D beépített vertex attribútum
-        in vec4 p3d_Vertex;
-        
-        void main() {
-            gl_Position = p3d_ModelViewProjectionMatrix * p3d_Vertex;
-        }
-        """
-
-        # Fragment Shader (Egyszerű "Glow" material)
-        fragment_shader = """
-        #version 130
-        
-        // Uniform változó a material sugárzó színének beállításához
-        uniform vec4 glowColor;
-        
-        // Kimenet a frame buffer-be
-        out vec4 fragColor;
-        
-        void main() {
-            // Ezzel a shaderrel az objektum egyszerűen a 'glowColor' színt sugározza,
-            // figyelmen kívül hagyva a normál világítást.
-            fragColor = glowColor;
-        }
-        """
-
-        # Shader létrehozása
-        self.glow_shader = None
-        try:
-            # 1. kísérlet: Modern Panda3D (Shader.make és Shader.L_glsl)
-            self.glow_shader = Shader.make(
-                Shader.L_glsl,
-                vertex_shader,
-                fragment_shader
-            )
-            print("Shader betöltve a modern (L_glsl) módszerrel.")
-        except AttributeError:
-            # Ha az L_glsl nem érhető el, próbáljuk meg a régebbi load_source metódust
-            print("Figyelem: Az 'Shader.L_glsl' konstans nem található. Visszaesés a régebbi betöltési módszerre...")
-            try:
-                # Kísérlet a régebbi SL_GLSL konstans betöltésére
-                from panda3d.core import SL_GLSL
-                self.glow_shader = Shader.load_source(SL_GLSL, vertex_shader, fragment_shader)
-                print("Shader betöltve a régebbi (SL_GLSL) módszerrel.")
-            except (AttributeError, ImportError) as e:
-                # Kezeljük a felhasználó által jelentett ImportError-t is
-                print(f"Súlyos HIBA: A Panda3D shader konstansai ('L_glsl'/'SL_GLSL') nem érhetők el a dinamikus betöltéshez. A shader nem lesz alkalmazva. Hiba: {e}")
-                self.glow_shader = None
-        except Exception as e:
-            # Minden más hiba (pl. shader fordítási hiba)
-            print(f"Általános HIBA a shader betöltése során: {e}")
-            self.glow_shader = None
+        # A szín és az intenzitás példányadat az InstancedGlow buffer textúrájában,
+        # nem objektumonkénti 'glowColor' shader input: minden sugárzó objektum
+        # ugyanazt a shader állapotot használja (None, ha nem tölthető be)
+        self.glow_shader = create_instanced_glow_shader()
 
         
         # ------------------------------------------------
@@ -126,18 +73,11 @@ class GlowMaterialDemo(ShowBase):
         # ------------------------------------------------
         
         # EREDETI OBJEKTUM - Fénycsík material (Gömb)
-        glow_sphere_np = NodePath(self.glow_sphere)
-        glow_sphere_np.reparent_to(self.render)
-        glow_sphere_np.set_pos(0, 0, 0)
-
-        # Shader alkalmazása az objektumra
-        if self.glow_shader:
-            glow_sphere_np.set_shader(self.glow_shader)
-            # A 'glowColor' uniform beállítása (pl. egy erős kék fény)
-            glow_sphere_np.set_shader_input("glowColor", VBase4(0.1, 0.6, 1.0, 1.0))
-        else:
+        # Egy példány a glow csoportban: pozíció (0, 0, 0), erős kék fény
+        self.glow_spheres = InstancedGlowGroup("glow_spheres", self.glow_sphere, self.render, self.glow_shader)
+        self.glow_spheres.set_instances([(0, 0, 0)], [(0.1, 0.6, 1.0)])
+        if self.glow_shader is None:
             print("Figyelem: A sugárzó material nem töltődött be. A gömb csak sima kék lesz.")
-            glow_sphere_np.set_color(0.1, 0.6, 1.0, 1.0) 
 
         # EGY MÁSIK OBJEKTUM - Normál világítással (Kocka)
         
@@ -154,58 +94,6 @@ class GlowMaterialDemo(ShowBase):
     # 5. Geometria Generáló Függvények
     # ------------------------------------------------
 
-    def _create_cube_mesh(self, name, size):
-        """Kocka mesh generálása vertexek és normálok alapján."""
-        format = GeomVertexFormat.get_v3n3() # pozíció és normál
-        vdata = GeomVertexData(name, format, Geom.UHDynamic)
-        
-        vertex = GeomVertexWriter(vdata, 'vertex')
-        normal = GeomVertexWriter(vdata, 'normal')
-        
-        s = size / 2.0
-        
-        # A kocka vertexei
-        verts = [
-            (-s, -s, -s), (s, -s, -s), (s, s, -s), (-s, s, -s), # Alsó lap
-            (-s, -s, s), (s, -s, s), (s, s, s), (-s, s, s)    # Felső lap
-        ]
-        
-        # Kocka lapok (indexek) - Minden lap 2 háromszög (6 index)
-        # Normálok beállítása a lapokhoz
-        faces = [
-            # Z-negatív (Alsó)
-            (0, 3, 2, 0, 2, 1, (0, 0, -1)),
-            # Z-pozitív (Felső)
-            (4, 5, 6, 4, 6, 7, (0, 0, 1)),
-            # X-negatív (Bal)
-            (0, 4, 7, 0, 7, 3, (-1, 0, 0)),
-            # X-pozitív (Jobb)
-            (1, 2, 6, 1, 6, 5, (1, 0, 0)),
-            # Y-negatív (Hátsó)
-            (0, 1, 5, 0, 5, 4, (0, -1, 0)),
-            # Y-pozitív (Első)
-            (3, 7, 6, 3, 6, 2, (0, 1, 0))
-        ]
-
-        prim = GeomTriangles(Geom.UHDynamic)
-        
-        # A GeoemVertexData-nak a lapok indexeinek megfelelő vertexeket és normálokat adjuk
-        vdata_index = 0
-        for face in faces:
-            # Vertex pozíciók
-            for i in face[:6]:
-                vertex.add_data3f(verts[i])
-                normal.add_data3f(face[6]) # A normál a laphoz
-                prim.add_vertex(vdata_index)
-                vdata_index += 1
-
-        geom = Geom(vdata)
-        geom.add_primitive(prim)
-        
-        node = GeomNode(name)
-        node.add_geom(geom)
-        return node
-        
     def _create_sphere_mesh(self, name, radius, resolution):
         """Gömb mesh generálása (UV-mapping alapján)"""
         format = GeomVertexFormat.get_v3n3()
@@ -1,19 +1,22 @@
 # Fénycsík (Glow) Material Demo - Panda3D Python
 #
-# Ez a script egy egyszerű GLSL shadert használ, hogy egy objektumot
-# sugárzóan fényes, "fénycsík" forrásként mutasson be a Panda3D-ben.
+# Ez a script az InstancedGlow modul emisszív shaderét használja, hogy egy
+# objektumot sugárzóan fényes, "fénycsík" forrásként mutasson be a Panda3D-ben.
 # A modelleket belsőleg generáljuk (meshként) az OSError elkerülése érdekében.
 
 import sys
 from direct.showbase.ShowBase import ShowBase
 from panda3d.core import (
-    Shader, PointLight, VBase4, AmbientLight, 
+    PointLight, VBase4, AmbientLight, 
     GeomVertexData, GeomVertexFormat, GeomVertexWriter, 
     GeomTriangles, GeomNode, NodePath, Geom
 )
 # A numpy importot eltávolítom, mivel nem volt használva a mesh generátorokban
 import math 
 
+from MeshGenerators import create_cuboid_mesh
+from InstancedGlow import InstancedGlowGroup, create_instanced_glow_shader
+
 class GlowMaterialDemo(ShowBase):
     def __init__(self):
         ShowBase.__init__(self)
@@ -23,7 +26,7 @@ class GlowMaterialDemo(ShowBase):
         # ------------------------------------------------
         # Létrehozzuk a SUGÁRZÓ RUDAT (fénycsík material)
         # Méret: 0.5 széles, 0.5 magas, 6.0 hosszú (Y tengelyen)
-        self.glow_rod = self._create_cuboid_mesh("glow_rod_mesh", 0.5, 0.5, 6.0)
+        self.glow_rod = create_cuboid_mesh("glow_rod_mesh", 0.5, 0.5, 6.0)
         
         # Létrehozzuk a NORMÁL OBJEKTUMOT (Gömb)
         self.normal_sphere = self._create_sphere_mesh("normal_sphere_mesh", 1.5, 30)
@@ -42,68 +45,12 @@ class GlowMaterialDemo(ShowBase):
         self.accept('q', sys.exit)
 
         # ------------------------------------------------
-        # 2. GLSL Shader Kód
+        # 2. Sugárzó Material (InstancedGlow)
         # ------------------------------------------------
-
-        # Vertex Shader (Egyszerű transzformáció)
-        vertex_shader = """
-        #version 130
-        
-        // A Panda3D beépített Mátrixai
-        uniform mat4 p3d_ModelViewProjectionMatrix;
-        uniform mat4 p3d_ModelViewMatrix; // Szükséges lehet a normálokhoz
-        
-        // A Panda3D beépített vertex attribútum
-        in vec4 p3d_Vertex;
-        
-        void main() {
-            gl_Position = p3d_ModelViewProjectionMatrix * p3d_Vertex;
-        }
-        """
-
-        # Fragment Shader (Egyszerű "Glow" material)
-        fragment_shader = """
-        #version 130
-        
-        // Uniform változó a material sugárzó színének beállításához
-        uniform vec4 glowColor;
-        
-        // Kimenet a frame buffer-be
-        out vec4 fragColor;
-        
-        void main() {
-            // Ezzel a shaderrel az objektum egyszerűen a 'glowColor' színt sugározza,
-            // figyelmen kívül hagyva a normál világítást.
-            fragColor = glowColor;
-        }
-        """
-
-        # Shader létrehozása
-        self.glow_shader = None
-        try:
-            # 1. kísérlet: Modern Panda3D (Shader.make és Shader.L_glsl)
-            self.glow_shader = Shader.make(
-                Shader.L_glsl,
-                vertex_shader,
-                fragment_shader
-            )
-            print("Shader betöltve a modern (L_glsl) módszerrel.")
-        except AttributeError:
-            # Ha az L_glsl nem érhető el, próbáljuk meg a régebbi load_source metódust
-            print("Figyelem: Az 'Shader.L_glsl' konstans nem található. Visszaesés a régebbi betöltési módszerre...")
-            try:
-                # Kísérlet a régebbi SL_GLSL konstans betöltésére
-                from panda3d.core import SL_GLSL
-                self.glow_shader = Shader.load_source(SL_GLSL, vertex_shader, fragment_shader)
-                print("Shader betöltve a régebbi (SL_GLSL) módszerrel.")
-            except (AttributeError, ImportError) as e:
-                # Kezeljük a felhasználó által jelentett ImportError-t is
-                print(f"Súlyos HIBA: A Panda3D shader konstansai ('L_glsl'/'SL_GLSL') nem érhetők el a dinamikus betöltéshez. A shader nem lesz alkalmazva. Hiba: {e}")
-                self.glow_shader = None
-        except Exception as e:
-            # Minden más hiba (pl. shader fordítási hiba)
-            print(f"Általános HIBA a shader betöltése során: {e}")
-            self.glow_shader = None
+        # A szín és az intenzitás példányadat az InstancedGlow buffer textúrájában,
+        # nem objektumonkénti 'glowColor' shader input: minden sugárzó objektum
+        # ugyanazt a shader állapotot használja (None, ha nem tölthető be)
+        self.glow_shader = create_instanced_glow_shader()
 
         
         # ------------------------------------------------
@@ -129,19 +76,14 @@ class GlowMaterialDemo(ShowBase):
         # ------------------------------------------------
         
         # FÉNY RÚD OBJEKTUM - Fénycsík material
-        glow_rod_np = NodePath(self.glow_rod)
-        glow_rod_np.reparent_to(self.render)
-        glow_rod_np.set_pos(-3, 0, 0) # Elhelyezzük balra
-        glow_rod_np.set_hpr(90, 0, 0) # Elforgatjuk az X tengelyen álló helyzetbe
-
-        # Shader alkalmazása az objektumra
-        if self.glow_shader:
-            glow_rod_np.set_shader(self.glow_shader)
-            # A 'glowColor' uniform beállítása (pl. egy erős zöld fény)
-            glow_rod_np.set_shader_input("glowColor", VBase4(0.1, 1.0, 0.1, 1.0))
-        else:
+        # Egy példány a glow csoportban (erős zöld fény); a példány adat csak
+        # pozíciót és méretet tartalmaz, a forgatást a csoport gyökere adja
+        self.glow_rods = InstancedGlowGroup("glow_rods", self.glow_rod, self.render, self.glow_shader)
+        self.glow_rods.root.set_pos(-3, 0, 0) # Elhelyezzük balra
+        self.glow_rods.root.set_hpr(90, 0, 0) # Elforgatjuk az X tengelyen álló helyzetbe
+        self.glow_rods.set_instances([(0, 0, 0)], [(0.1, 1.0, 0.1)])
+        if self.glow_shader is None:
             print("Figyelem: A sugárzó material nem töltődött be. A rúd csak sima zöld lesz.")
-            glow_rod_np.set_color(0.1, 1.0, 0.1, 1.0) 
 
         # EGY MÁSIK OBJEKTUM - Normál világítással (Gömb)
         
@@ -158,58 +100,6 @@ class GlowMaterialDemo(ShowBase):
     # 5. Geometria Generáló Függvények
     # ------------------------------------------------
 
-    def _create_cuboid_mesh(self, name, x_size, y_size, z_size):
-        """Téglatest (rúd) mesh generálása egyedi méretekkel (X, Y, Z)."""
-        format = GeomVertexFormat.get_v3n3() # pozíció és normál
-        vdata = GeomVertexData(name, format, Geom.UHDynamic)
-        
-        vertex = GeomVertexWriter(vdata, 'vertex')
-        normal = GeomVertexWriter(vdata, 'normal')
-        
-        sx, sy, sz = x_size / 2.0, y_size / 2.0, z_size / 2.0
-        
-        # A téglatest vertexei
-        verts = [
-            (-sx, -sy, -sz), (sx, -sy, -sz), (sx, sy, -sz), (-sx, sy, -sz), # Alsó lap
-            (-sx, -sy, sz), (sx, -sy, sz), (sx, sy, sz), (-sx, sy, sz)    # Felső lap
-        ]
-        
-        # Téglatest lapok (indexek) - Minden lap 2 háromszög (6 index)
-        # Normálok beállítása a lapokhoz
-        faces = [
-            # Z-negatív (Alsó)
-            (0, 3, 2, 0, 2, 1, (0, 0, -1)),
-            # Z-pozitív (Felső)
-            (4, 5, 6, 4, 6, 7, (0, 0, 1)),
-            # X-negatív (Bal)
-            (0, 4, 7, 0, 7, 3, (-1, 0, 0)),
-            # X-pozitív (Jobb)
-            (1, 2, 6, 1, 6, 5, (1, 0, 0)),
-            # Y-negatív (Hátsó)
-            (0, 1, 5, 0, 5, 4, (0, -1, 0)),
-            # Y-pozitív (Első)
-            (3, 7, 6, 3, 6, 2, (0, 1, 0))
-        ]
-
-        prim = GeomTriangles(Geom.UHDynamic)
-        
-        # A GeoemVertexData-nak a lapok indexeinek megfelelő vertexeket és normálokat adjuk
-        vdata_index = 0
-        for face in faces:
-            # Vertex pozíciók
-            for i in face[:6]:
-                vertex.add_data3f(verts[i])
-                normal.add_data3f(face[6]) # A normál a laphoz
-                prim.add_vertex(vdata_index)
-                vdata_index += 1
-
-        geom = Geom(vdata)
-        geom.add_primitive(prim)
-        
-        node = GeomNode(name)
-        node.add_geom(geom)
-        return node
-        
     def _create_sphere_mesh(self, name, radius, resolution):
         """Gömb mesh generálása (UV-mapping alapján)"""
         format = GeomVertexFormat.get_v3n3()
@@ -0,0 +1,175 @@
+# Fénycsík (Glow) Stressz Teszt - Panda3D Python
+#
+# Több ezer különböző színű sugárzó rúd és gömb, az InstancedGlow modul
+# példányonkénti szín/intenzitás bufferével. A színek nem külön render állapotok,
+# így az egész jelenet néhány instancolt draw call-ból áll.
+#
+# Használat: python GlowStressDemo.py [példányszám] [batch méret]
+#   C     - minden példány új, véletlen színt kap (csak a buffer frissül)
+#   SPACE - az intenzitás pulzálásának be/kikapcsolása
+
+import sys
+import time
+from direct.showbase.ShowBase import ShowBase
+from direct.task import Task
+from panda3d.core import (
+    GeomVertexData, GeomVertexFormat, GeomVertexWriter,
+    GeomTriangles, GeomNode, Geom, loadPrcFileData
+)
+import numpy as np
+import math
+
+loadPrcFileData("", "show-frame-rate-meter true")
+loadPrcFileData("", "sync-video false")
+
+from InstancedGlow import InstancedGlowGroup, create_instanced_glow_shader
+from MeshGenerators import create_rod_mesh
+
+
+class GlowStressDemo(ShowBase):
+    def __init__(self, instance_count=10000, batch_size=4096):
+        ShowBase.__init__(self)
+
+        self.set_background_color(0, 0, 0, 1)
+        self.disable_mouse()
+        self.accept('escape', sys.exit)
+        self.accept('q', sys.exit)
+        self.accept('c', self.randomize_colors)
+        self.accept('space', self.toggle_pulse)
+
+        self.rng = np.random.default_rng(1)
+        self.pulse = True
+
+        # ------------------------------------------------
+        # 1. Jelenet generálása
+        # ------------------------------------------------
+        start = time.perf_counter()
+
+        # A rudak és gömbök egyetlen közös shadert használnak
+        shader = create_instanced_glow_shader()
+        rod_mesh = create_rod_mesh("stress_rod", 0.1, 1.5, radial_segments=8)
+        sphere_mesh = self._create_sphere_mesh("stress_sphere", 0.3, 12)
+
+        rod_count = instance_count // 2
+        sphere_count = instance_count - rod_count
+
+        # A példányok egy kocka alakú térfogatban helyezkednek el
+        extent = max(10.0, instance_count ** (1.0 / 3.0) * 1.5)
+        self.rods = InstancedGlowGroup("glow_rods", rod_mesh, self.render, shader, batch_size)
+        self.rods.set_instances(
+            self.rng.uniform(-extent, extent, (rod_count, 3)),
+            self._random_colors(rod_count),
+            self.rng.uniform(0.5, 1.5, rod_count),
+            self.rng.uniform(0.5, 1.5, rod_count)
+        )
+
+        self.spheres = InstancedGlowGroup("glow_spheres", sphere_mesh, self.render, shader, batch_size)
+        self.spheres.set_instances(
+            self.rng.uniform(-extent, extent, (sphere_count, 3)),
+            self._random_colors(sphere_count),
+            self.rng.uniform(0.5, 1.5, sphere_count),
+            self.rng.uniform(0.5, 1.5, sphere_count)
+        )
+        self.base_intensities = np.concatenate([self.rods.data[:, 1, 3], self.spheres.data[:, 1, 3]])
+
+        elapsed = time.perf_counter() - start
+        draw_calls = self.rods.get_num_draw_calls() + self.spheres.get_num_draw_calls()
+        print(f"{instance_count} példány létrehozva {elapsed * 1000:.1f} ms alatt, "
+              f"{draw_calls} draw call (batch méret: {batch_size}).")
+
+        # ------------------------------------------------
+        # 2. Kamera és animáció
+        # ------------------------------------------------
+        self.extent = extent
+        self.taskMgr.add(self.orbit_task, "OrbitTask")
+
+        self.messenger.send('aspectRatioChanged')
+
+    # ------------------------------------------------
+    # 3. Animáció és vezérlés
+    # ------------------------------------------------
+
+    def orbit_task(self, task):
+        """Kamera keringtetése és az intenzitás pulzálása (egy vektorizált lépésben)."""
+        t = task.time
+        radius = self.extent * 2.5
+        self.camera.set_pos(radius * math.sin(t * 0.2), -radius * math.cos(t * 0.2), self.extent * 0.8)
+        self.camera.look_at(0, 0, 0)
+
+        if self.pulse:
+            rod_count = self.rods.count
+            phase = np.sin(t * 3.0 + np.arange(len(self.base_intensities)) * 0.1)
+            intensities = self.base_intensities * (0.75 + 0.25 * phase)
+            self.rods.set_intensities(intensities[:rod_count])
+            self.spheres.set_intensities(intensities[rod_count:])
+
+        return Task.cont
+
+    def randomize_colors(self):
+        """Minden példány új színt kap; a render állapot nem változik."""
+        start = time.perf_counter()
+        self.rods.set_colors(self._random_colors(self.rods.count))
+        self.spheres.set_colors(self._random_colors(self.spheres.count))
+        print(f"Színfrissítés: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    def toggle_pulse(self):
+        self.pulse = not self.pulse
+
+    def _random_colors(self, count):
+        """Telített, véletlen színek (HSV -> RGB, vektorizálva)."""
+        h = self.rng.uniform(0.0, 6.0, count)
+        x = 1.0 - np.abs(h % 2.0 - 1.0)
+        sector = h.astype(int)
+        zeros = np.zeros(count)
+        ones = np.ones(count)
+        r = np.choose(sector % 6, [ones, x, zeros, zeros, x, ones])
+        g = np.choose(sector % 6, [x, ones, ones, x, zeros, zeros])
+        b = np.choose(sector % 6, [zeros, zeros, x, ones, ones, x])
+        return np.stack([r, g, b], axis=1).astype(np.float32)
+
+    # ------------------------------------------------
+    # 4. Geometria Generáló Függvények
+    # ------------------------------------------------
+
+    def _create_sphere_mesh(self, name, radius, resolution):
+        """Gömb mesh generálása (UV-mapping alapján)"""
+        format = GeomVertexFormat.get_v3n3()
+        vdata = GeomVertexData(name, format, Geom.UHStatic)
+
+        vertex = GeomVertexWriter(vdata, 'vertex')
+        normal = GeomVertexWriter(vdata, 'normal')
+
+        prim = GeomTriangles(Geom.UHStatic)
+
+        for i in range(resolution + 1):
+            lat = math.pi * i / resolution
+            for j in range(resolution + 1):
+                lon = 2 * math.pi * j / resolution
+                x = radius * math.sin(lat) * math.cos(lon)
+                y = radius * math.sin(lat) * math.sin(lon)
+                z = radius * math.cos(lat)
+                vertex.add_data3f(x, y, z)
+                normal.add_data3f(x / radius, y / radius, z / radius)
+
+        for i in range(resolution):
+            for j in range(resolution):
+                p1 = i * (resolution + 1) + j
+                p2 = i * (resolution + 1) + j + 1
+                p3 = (i + 1) * (resolution + 1) + j
+                p4 = (i + 1) * (resolution + 1) + j + 1
+                prim.add_vertices(p1, p3, p2)
+                prim.add_vertices(p2, p3, p4)
+
+        geom = Geom(vdata)
+        geom.add_primitive(prim)
+
+        node = GeomNode(name)
+        node.add_geom(geom)
+        return node
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    demo = GlowStressDemo(count, batch)
+    demo.run()
@@ -0,0 +1,239 @@
+# Instancolt Fénycsík (Glow) Material - Panda3D Python
+#
+# A GlowMaterialDemo-ban minden sugárzó objektum saját 'glowColor' shader
+# inputot kap, így minden szín külön render állapot és külön draw call.
+# Ez a modul ugyanazt az emisszív materialt példányonkénti adatokkal valósítja meg:
+# a pozíció/méret és a szín/intenzitás egy buffer textúrában (samplerBuffer) van,
+# a shader a gl_InstanceID alapján olvassa ki. Több ezer különböző színű rúd vagy
+# gömb így egyetlen shaderrel, néhány instancolt draw call-lal renderelődik.
+
+from panda3d.core import (
+    Shader, Texture, GeomEnums, NodePath, BoundingBox, Point3
+)
+import numpy as np
+
+# Példányonként 2 texel (RGBA32F): (x, y, z, méret), (r, g, b, intenzitás)
+TEXELS_PER_INSTANCE = 2
+
+# Ha a shader nem tölthető be, legfeljebb ennyi példányt rajzolunk ki hagyományosan
+FALLBACK_LIMIT = 256
+
+INSTANCED_GLOW_VERTEX_SHADER = """
+#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+
+// Példány adatok: 2 texel / példány
+uniform samplerBuffer instanceData;
+// A batch első példányának indexe a közös bufferben (float-ként átadva)
+uniform float instanceBase;
+
+in vec4 p3d_Vertex;
+
+flat out vec4 glow;
+
+void main() {
+    int base = (int(instanceBase) + gl_InstanceID) * 2;
+    vec4 offset = texelFetch(instanceData, base);
+    glow = texelFetch(instanceData, base + 1);
+
+    vec4 world = vec4(p3d_Vertex.xyz * offset.w + offset.xyz, 1.0);
+    gl_Position = p3d_ModelViewProjectionMatrix * world;
+}
+"""
+
+INSTANCED_GLOW_FRAGMENT_SHADER = """
+#version 140
+
+flat in vec4 glow;
+out vec4 fragColor;
+
+void main() {
+    // A szín az intenzitással szorozva sugárzik, a világítást figyelmen kívül hagyjuk
+    fragColor = vec4(glow.rgb * glow.a, 1.0);
+}
+"""
+
+
+def create_instanced_glow_shader():
+    """Kezeli a Panda3D verziókon keresztüli shader létrehozási hibákat."""
+    shader = None
+    try:
+        shader = Shader.make(
+            Shader.L_glsl,
+            INSTANCED_GLOW_VERTEX_SHADER,
+            INSTANCED_GLOW_FRAGMENT_SHADER
+        )
+    except AttributeError:
+        try:
+            # Panda3D 1.10: a nyelv konstans Shader.SL_GLSL néven érhető el
+            shader = Shader.make(Shader.SL_GLSL, INSTANCED_GLOW_VERTEX_SHADER, INSTANCED_GLOW_FRAGMENT_SHADER)
+        except AttributeError as e:
+            print(f"HIBA: A shader konstansai ('L_glsl'/'SL_GLSL') nem elérhetők. Hiba: {e}")
+            shader = None
+    except Exception as e:
+        print(f"Általános HIBA az instancolt shader betöltése során: {e}")
+        shader = None
+    return shader
+
+
+class InstancedGlowGroup:
+    """
+    Egy mesh sok sugárzó példánya, egyetlen shader állapottal.
+
+    A példányokat 'batch_size' méretű csoportokra bontjuk: minden csoport egy
+    instancolt draw call, saját befoglaló dobozzal, így a culling csoportonként működik.
+    """
+
+    def __init__(self, name, geom_node, parent, shader=None, batch_size=4096):
+        self.name = name
+        self.geom_node = geom_node
+        self.root = parent.attach_new_node(name)
+        self.shader = shader if shader is not None else create_instanced_glow_shader()
+        self.batch_size = batch_size
+
+        self.count = 0
+        self.data = None        # (count, 2, 4) float32 nézet a textúra RAM képére
+        self.texture = None
+        self.batches = []       # (NodePath, első index, darabszám)
+
+        # A mesh saját befoglaló sugara a csoportok dobozához
+        bounds = NodePath(geom_node).get_tight_bounds()
+        if bounds:
+            lo, hi = bounds
+            self.mesh_radius = max((hi - lo).length() / 2.0, 1e-3)
+        else:
+            self.mesh_radius = 1.0
+
+    # ------------------------------------------------
+    # Példányok feltöltése
+    # ------------------------------------------------
+
+    def set_instances(self, positions, colors, intensities=None, scales=None):
+        """
+        Az összes példány adatainak beállítása egyszerre (numpy tömbökből).
+        positions: (N, 3), colors: (N, 3) vagy (N, 4), intensities/scales: (N,) vagy None.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        count = len(positions)
+        colors = np.asarray(colors, dtype=np.float32).reshape(count, -1)
+        intensities = np.ones(count, np.float32) if intensities is None else np.asarray(intensities, np.float32)
+        scales = np.ones(count, np.float32) if scales is None else np.asarray(scales, np.float32)
+
+        self._allocate(count)
+        self.data[:, 0, :3] = positions
+        self.data[:, 0, 3] = scales
+        self.data[:, 1, :3] = colors[:, :3]
+        self.data[:, 1, 3] = intensities
+
+        self._build_batches()
+
+    def set_colors(self, colors, intensities=None, indices=None):
+        """
+        Csak a színek/intenzitások frissítése. Nincs új render állapot,
+        csak a buffer textúra érintett bájtjai íródnak felül.
+        """
+        if indices is None:
+            indices = slice(None)
+        data = self._modify_data()
+        data[indices, 1, :3] = np.asarray(colors, np.float32)[..., :3]
+        if intensities is not None:
+            data[indices, 1, 3] = intensities
+        self._refresh_fallback_colors()
+
+    def set_intensities(self, intensities, indices=None):
+        """Csak az intenzitások frissítése (pl. pulzáláshoz), egy vektorizált írással."""
+        if indices is None:
+            indices = slice(None)
+        data = self._modify_data()
+        data[indices, 1, 3] = intensities
+        self._refresh_fallback_colors()
+
+    def set_instance_color(self, index, color, intensity=None):
+        """Egyetlen példány színének módosítása (16 bájt a bufferben)."""
+        data = self._modify_data()
+        data[index, 1, :3] = color[:3]
+        if intensity is not None:
+            data[index, 1, 3] = intensity
+        self._refresh_fallback_colors()
+
+    def get_num_draw_calls(self):
+        """A csoport által használt draw call-ok száma."""
+        return len(self.batches)
+
+    # ------------------------------------------------
+    # Belső segédfüggvények
+    # ------------------------------------------------
+
+    def _allocate(self, count):
+        """Buffer textúra (és a rá mutató numpy nézet) lefoglalása."""
+        self.count = count
+        self.texture = Texture(f"{self.name}_instances")
+        self.texture.setup_buffer_texture(
+            max(1, count * TEXELS_PER_INSTANCE),
+            Texture.T_float, Texture.F_rgba32, GeomEnums.UH_dynamic
+        )
+        self.texture.make_ram_image()
+        self._modify_data()
+
+    def _modify_data(self):
+        """
+        Írható numpy nézet a textúra RAM képére (nincs másolás).
+        A modify_ram_image() hívás jelzi a Panda3D-nek, hogy a buffert újra fel kell tölteni.
+        """
+        buffer = memoryview(self.texture.modify_ram_image())
+        self.data = np.frombuffer(buffer, dtype=np.float32)[:self.count * 8].reshape(self.count, 2, 4)
+        return self.data
+
+    def _build_batches(self):
+        """A példányokat csoportokra bontja és csoportonként egy instancolt node-ot hoz létre."""
+        for batch_np, _, _ in self.batches:
+            batch_np.remove_node()
+        self.batches = []
+
+        if self.shader is None:
+            self._build_fallback()
+            return
+
+        for first in range(0, self.count, self.batch_size):
+            num = min(self.batch_size, self.count - first)
+            batch_np = self.root.attach_new_node(f"{self.name}_batch_{first}")
+            # A node másolata ugyanazt a Geom-ot használja (nincs vertex másolás)
+            NodePath(self.geom_node).copy_to(batch_np)
+
+            batch_np.set_shader(self.shader)
+            batch_np.set_shader_input("instanceData", self.texture)
+            batch_np.set_shader_input("instanceBase", float(first))
+            batch_np.set_instance_count(num)
+
+            # A shader mozgatja a vertexeket, ezért a culling a csoport dobozát használja
+            chunk = self.data[first:first + num, 0]
+            pad = float(chunk[:, 3].max()) * self.mesh_radius
+            lo = chunk[:, :3].min(axis=0) - pad
+            hi = chunk[:, :3].max(axis=0) + pad
+            batch_np.node().set_bounds(BoundingBox(Point3(*map(float, lo)), Point3(*map(float, hi))))
+            batch_np.node().set_final(True)
+
+            self.batches.append((batch_np, first, num))
+
+    def _build_fallback(self):
+        """Shader nélkül hagyományos, színezett másolatok (korlátozott darabszámmal)."""
+        num = min(self.count, FALLBACK_LIMIT)
+        if num < self.count:
+            print(f"Figyelem: Az instancolt shader nem érhető el, csak {num}/{self.count} példány jelenik meg.")
+        for i in range(num):
+            copy_np = self.root.attach_new_node(f"{self.name}_fallback_{i}")
+            NodePath(self.geom_node).copy_to(copy_np)
+            x, y, z, s = self.data[i, 0]
+            copy_np.set_pos(x, y, z)
+            copy_np.set_scale(s)
+            self.batches.append((copy_np, i, 1))
+        self._refresh_fallback_colors()
+
+    def _refresh_fallback_colors(self):
+        """Shader nélküli módban a színeket a node-okra kell átvinni."""
+        if self.shader is not None:
+            return
+        for copy_np, index, _ in self.batches:
+            r, g, b, intensity = self.data[index, 1]
+            copy_np.set_color(min(1.0, r * intensity), min(1.0, g * intensity), min(1.0, b * intensity), 1.0)
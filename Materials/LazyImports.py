@@ -0,0 +1,77 @@
+# Lusta (Lazy) Importálás a Nehéz Panda3D Alrendszerekhez
+#
+# A részecske demók modul betöltéskor importálták a direct.particles modulokat,
+# akkor is, ha a futás sosem ér el a részecskékig. Itt a részecske alrendszer
+# csak az első használatkor töltődik be, a korábbi hibatűrő viselkedés
+# (figyelmeztetés + "nem elérhető" jelzés) megmarad. Az intervallumokat és a
+# DirectGUI-t a ShowBase maga is betölti, ezeknél nincs mit spórolni.
+#
+# Használat:
+#     from LazyImports import particle_subsystem
+#     if particle_subsystem.available:          # itt történik az import
+#         effect = particle_subsystem.ParticleEffect()
+
+import importlib
+
+
+class LazySubsystem:
+    """
+    Egy alrendszer szimbólumai (név -> (modul, attribútum)), első hozzáféréskor betöltve.
+    Sikertelen importnál egyszer figyelmeztet, és az 'available' False lesz.
+    """
+
+    def __init__(self, name, symbols):
+        self._name = name
+        self._symbols = symbols
+        self._loaded = {}
+        self._available = None  # None: még nem próbáltuk betölteni
+
+    @property
+    def available(self):
+        """Betölti az alrendszert (ha még nem történt meg), és jelzi, hogy használható-e."""
+        if self._available is None:
+            self._load()
+        return self._available
+
+    @property
+    def is_loaded(self):
+        """Megtörtént-e már a betöltési kísérlet (indítási méréshez)."""
+        return self._available is not None
+
+    def _load(self):
+        try:
+            for symbol, (module_name, attribute) in self._symbols.items():
+                module = importlib.import_module(module_name)
+                self._loaded[symbol] = getattr(module, attribute)
+            self._available = True
+        except ImportError as e:
+            print(f"Figyelem: {self._name} modul importálási hiba: {e}. Az alrendszer nem lesz elérhető.")
+            self._available = False
+        except AttributeError as e:
+            print(f"Figyelem: Panda3D attribútum hiba a(z) {self._name} modulokban: {e}. Az alrendszer nem lesz elérhető.")
+            self._available = False
+
+    def __getattr__(self, symbol):
+        # Csak a nem létező attribútumoknál hívódik (a belső mezők normálisan elérhetők)
+        if symbol.startswith('_') or symbol not in self._symbols:
+            raise AttributeError(symbol)
+        if not self.available:
+            raise ImportError(f"A(z) {self._name} alrendszer nem elérhető ({symbol}).")
+        return self._loaded[symbol]
+
+
+# ----------------------------------------------------------------------
+# Alrendszerek
+# ----------------------------------------------------------------------
+
+particle_subsystem = LazySubsystem("Részecske", {
+    'Particles': ('direct.particles.Particles', 'Particles'),
+    'ParticleEffect': ('direct.particles.ParticleEffect', 'ParticleEffect'),
+    # A factory, az emitter és a renderer osztályok a panda3d.physics-ben vannak
+    'ParticleSystem': ('panda3d.physics', 'ParticleSystem'),
+    'PointParticleFactory': ('panda3d.physics', 'PointParticleFactory'),
+    'BaseParticleEmitter': ('panda3d.physics', 'BaseParticleEmitter'),
+    'SphereVolumeEmitter': ('panda3d.physics', 'SphereVolumeEmitter'),
+    'BaseParticleRenderer': ('panda3d.physics', 'BaseParticleRenderer'),
+    'SpriteParticleRenderer': ('panda3d.physics', 'SpriteParticleRenderer'),
+})
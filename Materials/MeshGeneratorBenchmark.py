@@ -0,0 +1,80 @@
+# Mesh Generátor Mérés - Panda3D Python
+#
+# A MeshGenerators tömbalapú téglatest/rúd generátorának futási ideje különböző
+# felosztásoknál, összevetve a demókban korábban használt, vertexenkénti
+# GeomVertexWriter feltöltéssel (ugyanazokkal a tömbökkel).
+#
+# Használat: python MeshGeneratorBenchmark.py
+
+import time
+from panda3d.core import (
+    GeomVertexData, GeomVertexFormat, GeomVertexWriter, GeomTriangles, GeomNode, Geom
+)
+
+from MeshGenerators import (
+    build_cuboid_arrays, create_cuboid_mesh, create_rod_mesh
+)
+
+# Ennél több vertexnél a vertexenkénti referencia mérés túl lassú lenne
+WRITER_REFERENCE_LIMIT = 200000
+
+
+def create_with_writer(name, positions, normals, triangles):
+    """Referencia: a régi demók módszere (GeomVertexWriter, vertexenkénti Python hívások)."""
+    vdata = GeomVertexData(name, GeomVertexFormat.get_v3n3(), Geom.UHStatic)
+    vertex = GeomVertexWriter(vdata, 'vertex')
+    normal = GeomVertexWriter(vdata, 'normal')
+    for p, n in zip(positions.tolist(), normals.tolist()):
+        vertex.add_data3f(*p)
+        normal.add_data3f(*n)
+
+    prim = GeomTriangles(Geom.UHStatic)
+    for a, b, c in triangles.tolist():
+        prim.add_vertices(a, b, c)
+
+    geom = Geom(vdata)
+    geom.add_primitive(prim)
+    node = GeomNode(name)
+    node.add_geom(geom)
+    return node
+
+
+def measure(func, *args, **kwargs):
+    """Egy hívás ideje másodpercben, és a visszatérési érték."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def vertex_count(node):
+    return node.get_geom(0).get_vertex_data().get_num_rows()
+
+
+def main():
+    print("--- TÉGLATEST (x, y, z felosztás) ---")
+    print(f"{'felosztás':>16} {'vertex':>10} {'háromszög':>10} {'tömb (ms)':>10} {'writer (ms)':>12}")
+    for segments in [(1, 1, 1), (8, 8, 64), (32, 32, 128), (64, 64, 256), (128, 128, 512)]:
+        elapsed, node = measure(create_cuboid_mesh, "bench_cuboid", 2.0, 2.0, 2.0, *segments)
+        verts = vertex_count(node)
+        tris = node.get_geom(0).get_primitive(0).get_num_primitives()
+
+        writer_ms = "-"
+        if verts <= WRITER_REFERENCE_LIMIT:
+            arrays = build_cuboid_arrays(2.0, 2.0, 2.0, *segments)
+            writer_elapsed, _ = measure(create_with_writer, "bench_writer", *arrays)
+            writer_ms = f"{writer_elapsed * 1000:.1f}"
+
+        label = "x".join(str(s) for s in segments)
+        print(f"{label:>16} {verts:>10} {tris:>10} {elapsed * 1000:>10.1f} {writer_ms:>12}")
+
+    print()
+    print("--- RÚD (kerület, hossz felosztás) ---")
+    print(f"{'felosztás':>16} {'vertex':>10} {'tömb (ms)':>10}")
+    for radial, length in [(16, 1), (32, 256), (64, 1024), (128, 2048)]:
+        elapsed, node = measure(create_rod_mesh, "bench_rod", 0.5, 6.0, radial, length)
+        label = f"{radial}x{length}"
+        print(f"{label:>16} {vertex_count(node):>10} {elapsed * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# Tesszellált Mesh Generátorok - Panda3D Python
+#
+# A demókban másolt _create_cuboid_mesh csak 12 háromszöget (36 külön vertexet)
+# készít, ami vertex szintű deformációhoz vagy fény-átmenethez használhatatlan.
+# Itt a téglatest és a rúd (henger) tengelyenként külön felosztható, a vertexek
+# lapon belül közösek (indexelt háromszögek), és minden numpy tömbműveletekkel
+# készül, majd egyetlen másolással kerül a GeomVertexData / index bufferbe.
+
+from panda3d.core import (
+    GeomVertexData, GeomVertexFormat, GeomTriangles, GeomNode, Geom, GeomEnums
+)
+import numpy as np
+
+# A téglatest 6 lapja: (normál tengely, előjel, u tengely, v tengely)
+# Az u x v = normál feltétel miatt a háromszögek kívülről nézve CCW sorrendűek.
+_CUBOID_FACES = [
+    (0, 1.0, 1, 2),   # +X (Jobb)
+    (0, -1.0, 2, 1),  # -X (Bal)
+    (1, 1.0, 2, 0),   # +Y (Első)
+    (1, -1.0, 0, 2),  # -Y (Hátsó)
+    (2, 1.0, 0, 1),   # +Z (Felső)
+    (2, -1.0, 1, 0),  # -Z (Alsó)
+]
+
+
+def _grid_triangles(rows, cols, offset):
+    """(rows+1) x (cols+1) rácspont háromszög indexei (rácsonként 2 háromszög)."""
+    grid = np.arange((rows + 1) * (cols + 1), dtype=np.uint32).reshape(rows + 1, cols + 1) + offset
+    a = grid[:-1, :-1]
+    b = grid[1:, :-1]
+    c = grid[1:, 1:]
+    d = grid[:-1, 1:]
+    return np.stack([a, b, c, a, c, d], axis=-1).reshape(-1, 3)
+
+
+def build_cuboid_arrays(x_size, y_size, z_size, x_segments=1, y_segments=1, z_segments=1):
+    """
+    Tesszellált téglatest tömbjei (origó középen).
+    Visszaadja: (pozíciók (N, 3), normálok (N, 3), háromszög indexek (M, 3)).
+    """
+    half = np.array([x_size, y_size, z_size], dtype=np.float32) / 2.0
+    segments = (max(1, int(x_segments)), max(1, int(y_segments)), max(1, int(z_segments)))
+
+    positions, normals, triangles = [], [], []
+    offset = 0
+    for axis, sign, u_axis, v_axis in _CUBOID_FACES:
+        nu, nv = segments[u_axis], segments[v_axis]
+        u = np.linspace(-half[u_axis], half[u_axis], nu + 1, dtype=np.float32)
+        v = np.linspace(-half[v_axis], half[v_axis], nv + 1, dtype=np.float32)
+        uu, vv = np.meshgrid(u, v, indexing='ij')
+
+        count = (nu + 1) * (nv + 1)
+        face_pos = np.empty((count, 3), dtype=np.float32)
+        face_pos[:, axis] = sign * half[axis]
+        face_pos[:, u_axis] = uu.ravel()
+        face_pos[:, v_axis] = vv.ravel()
+
+        face_normal = np.zeros((count, 3), dtype=np.float32)
+        face_normal[:, axis] = sign
+
+        positions.append(face_pos)
+        normals.append(face_normal)
+        triangles.append(_grid_triangles(nu, nv, offset))
+        offset += count
+
+    return np.concatenate(positions), np.concatenate(normals), np.concatenate(triangles)
+
+
+def build_rod_arrays(radius, length, radial_segments=16, length_segments=1, caps=True):
+    """
+    Tesszellált henger (rúd) a Z tengely mentén, origó középen.
+    A palást varrata mentén a vertexek duplikáltak, a sapkák külön normált kapnak.
+    """
+    radial_segments = max(3, int(radial_segments))
+    length_segments = max(1, int(length_segments))
+    half = length / 2.0
+
+    # Palást: (length_segments+1) gyűrű, gyűrűnként radial_segments+1 vertex
+    angles = np.linspace(0.0, 2.0 * np.pi, radial_segments + 1, dtype=np.float32)
+    heights = np.linspace(-half, half, length_segments + 1, dtype=np.float32)
+    hh, aa = np.meshgrid(heights, angles, indexing='ij')
+    cos_a = np.cos(aa).ravel()
+    sin_a = np.sin(aa).ravel()
+
+    side_pos = np.stack([radius * cos_a, radius * sin_a, hh.ravel()], axis=1)
+    side_normal = np.stack([cos_a, sin_a, np.zeros_like(cos_a)], axis=1)
+    side_tris = _grid_triangles(length_segments, radial_segments, 0)
+    # A rács sorai a hossz, oszlopai a szög mentén haladnak: a sorrend fordított (CCW kívülről)
+    side_tris = side_tris[:, ::-1]
+
+    positions = [side_pos]
+    normals = [side_normal]
+    triangles = [side_tris]
+    offset = len(side_pos)
+
+    if caps:
+        ring_cos = np.cos(angles[:-1])
+        ring_sin = np.sin(angles[:-1])
+        ring = np.arange(radial_segments, dtype=np.uint32)
+        for sign in (1.0, -1.0):
+            # Középpont + egy gyűrű, legyező háromszögekkel
+            cap_pos = np.empty((radial_segments + 1, 3), dtype=np.float32)
+            cap_pos[0] = (0.0, 0.0, sign * half)
+            cap_pos[1:, 0] = radius * ring_cos
+            cap_pos[1:, 1] = radius * ring_sin
+            cap_pos[1:, 2] = sign * half
+            cap_normal = np.zeros_like(cap_pos)
+            cap_normal[:, 2] = sign
+
+            first = offset + 1 + ring
+            second = offset + 1 + (ring + 1) % radial_segments
+            center = np.full(radial_segments, offset, dtype=np.uint32)
+            if sign > 0:
+                cap_tris = np.stack([center, first, second], axis=1)
+            else:
+                cap_tris = np.stack([center, second, first], axis=1)
+
+            positions.append(cap_pos)
+            normals.append(cap_normal)
+            triangles.append(cap_tris)
+            offset += len(cap_pos)
+
+    return (np.concatenate(positions).astype(np.float32),
+            np.concatenate(normals).astype(np.float32),
+            np.concatenate(triangles).astype(np.uint32))
+
+
+def make_geom_node(name, positions, normals, triangles, usage=Geom.UHStatic):
+    """
+    Pozíció/normál/index tömbökből GeomNode-ot készít.
+    A vertex adatok egyetlen másolással kerülnek a (v3n3, interleaved) bufferbe.
+    """
+    vertex_count = len(positions)
+    vdata = GeomVertexData(name, GeomVertexFormat.get_v3n3(), usage)
+    vdata.unclean_set_num_rows(vertex_count)
+    vertex_array = np.frombuffer(memoryview(vdata.modify_array(0)), dtype=np.float32).reshape(vertex_count, 6)
+    vertex_array[:, 0:3] = positions
+    vertex_array[:, 3:6] = normals
+
+    prim = GeomTriangles(usage)
+    if vertex_count < 0xffff:
+        prim.set_index_type(GeomEnums.NT_uint16)
+        index_dtype = np.uint16
+    else:
+        prim.set_index_type(GeomEnums.NT_uint32)
+        index_dtype = np.uint32
+    index_handle = prim.modify_vertices()
+    index_handle.unclean_set_num_rows(triangles.size)
+    np.frombuffer(memoryview(index_handle), dtype=index_dtype)[:] = triangles.ravel()
+
+    geom = Geom(vdata)
+    geom.add_primitive(prim)
+
+    node = GeomNode(name)
+    node.add_geom(geom)
+    return node
+
+
+def create_cuboid_mesh(name, x_size, y_size, z_size, x_segments=1, y_segments=1, z_segments=1,
+                       usage=Geom.UHStatic):
+    """Tesszellált téglatest mesh (GeomNode) egyedi méretekkel és felosztással (X, Y, Z)."""
+    arrays = build_cuboid_arrays(x_size, y_size, z_size, x_segments, y_segments, z_segments)
+    return make_geom_node(name, *arrays, usage=usage)
+
+
+def create_rod_mesh(name, radius, length, radial_segments=16, length_segments=1, caps=True,
+                    usage=Geom.UHStatic):
+    """Tesszellált rúd (henger) mesh (GeomNode) a Z tengely mentén."""
+    arrays = build_rod_arrays(radius, length, radial_segments, length_segments, caps)
+    return make_geom_node(name, *arrays, usage=usage)
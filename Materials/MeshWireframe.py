@@ -0,0 +1,183 @@
+# Tetszőleges Mesh Drótváza (Vertexek és Élek Kinyerése) - Panda3D Python
+#
+# A MovingCubeParticlesDemo 8 vertexe és 12 éle be van kódolva. Ez a modul
+# bármely generált vagy betöltött mesh-ből egyszer kinyeri az egyedi vertexeket
+# (a lapokon duplikált, csak normálban eltérő vertexeket pozíció szerint
+# összevonja) és az irányítatlan élek listáját. Minden numpy tömbművelettel
+# történik (memoryview a vertex és index bufferekre), az eredmény pedig
+# gyorsítótárba kerül (memóriában, és kérésre .npz fájlban is).
+#
+# Használat:
+#     positions, edges = extract_wireframe(model_np, cache_key='models/box.egg',
+#                                          cache_path=wireframe_cache_path('models/box.egg'))
+#     lines = DynamicLines('wire', len(positions), edges)
+
+import os
+import hashlib
+import tempfile
+from panda3d.core import GeomEnums, GeomVertexReader, NodePath
+import numpy as np
+
+# Pozíció összevonási tűrés (ennél közelebbi vertexek egynek számítanak)
+DEFAULT_TOLERANCE = 1e-5
+
+_INDEX_DTYPES = {
+    GeomEnums.NT_uint8: np.uint8,
+    GeomEnums.NT_uint16: np.uint16,
+    GeomEnums.NT_uint32: np.uint32,
+}
+
+# Memóriabeli gyorsítótár: kulcs -> (pozíciók, élek)
+_wireframe_cache = {}
+
+# A .npz gyorsítótár fájlok alapértelmezett helye (futások között megmarad)
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "panda3d_wireframe_cache")
+
+
+def _read_positions(vdata):
+    """A 'vertex' oszlop (N, 3) float32 tömbként (float32 formátumnál másolás nélküli olvasással)."""
+    fmt = vdata.get_format()
+    rows = vdata.get_num_rows()
+    column = fmt.get_column('vertex')
+    if (column is not None and column.get_numeric_type() == GeomEnums.NT_float32
+            and column.get_num_components() >= 3):
+        array_index = fmt.get_array_with('vertex')
+        stride = fmt.get_array(array_index).get_stride()
+        start = column.get_start()
+        raw = np.frombuffer(memoryview(vdata.get_array(array_index)), dtype=np.uint8).reshape(rows, stride)
+        return raw[:, start:start + 12].copy().view(np.float32).reshape(rows, 3)
+
+    # Egyéb formátum (pl. float64): lassabb, de általános olvasás
+    reader = GeomVertexReader(vdata, 'vertex')
+    positions = np.empty((rows, 3), dtype=np.float32)
+    for i in range(rows):
+        positions[i] = tuple(reader.get_data3())
+    return positions
+
+
+def _read_indices(prim):
+    """Egy primitív vertex indexei lapos tömbként (indexelt és nem indexelt esetben is)."""
+    if not prim.is_indexed():
+        first = prim.get_first_vertex()
+        return np.arange(first, first + prim.get_num_vertices(), dtype=np.int64)
+    dtype = _INDEX_DTYPES[prim.get_index_type()]
+    return np.frombuffer(memoryview(prim.get_vertices()), dtype=dtype).astype(np.int64)
+
+
+def _primitive_edges(prim):
+    """Egy primitív élei (index párok); a szalagok/legyezők előbb háromszögekre bomlanak."""
+    prim = prim.decompose()
+    indices = _read_indices(prim)
+    if prim.get_primitive_type() == GeomEnums.PT_polygons:
+        tris = indices.reshape(-1, 3)
+        return np.concatenate([tris[:, [0, 1]], tris[:, [1, 2]], tris[:, [2, 0]]])
+    if prim.get_primitive_type() == GeomEnums.PT_lines:
+        return indices.reshape(-1, 2)
+    return np.zeros((0, 2), dtype=np.int64) # Pontok: nincs él
+
+
+def _transform_positions(positions, mat):
+    """Pozíciók transzformálása egy LMatrix4f-fel (Panda3D sor-vektor konvenció)."""
+    m = np.array([[mat.get_cell(r, c) for c in range(4)] for r in range(4)], dtype=np.float32)
+    return positions @ m[:3, :3] + m[3, :3]
+
+
+def extract_wireframe_arrays(root, tolerance=DEFAULT_TOLERANCE):
+    """
+    Egyedi vertexek és élek a root alatti összes GeomNode-ból (a root koordináta-rendszerében).
+    Visszaadja: (pozíciók (N, 3) float32, élek (M, 2) int64).
+    """
+    root = NodePath(root) if not isinstance(root, NodePath) else root
+    geom_nps = list(root.find_all_matches('**/+GeomNode'))
+    if root.node().is_geom_node():
+        geom_nps.insert(0, root)
+
+    all_positions = []
+    all_edges = []
+    offset = 0
+    for geom_np in geom_nps:
+        node = geom_np.node()
+        mat = geom_np.get_mat(root)
+        for gi in range(node.get_num_geoms()):
+            geom = node.get_geom(gi)
+            positions = _read_positions(geom.get_vertex_data())
+            if not mat.is_identity():
+                positions = _transform_positions(positions, mat)
+            for pi in range(geom.get_num_primitives()):
+                edges = _primitive_edges(geom.get_primitive(pi))
+                if len(edges):
+                    all_edges.append(edges + offset)
+            all_positions.append(positions)
+            offset += len(positions)
+
+    if not all_positions:
+        return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 2), dtype=np.int64)
+
+    positions = np.concatenate(all_positions)
+    edges = np.concatenate(all_edges) if all_edges else np.zeros((0, 2), dtype=np.int64)
+
+    # 1. Vertex összevonás pozíció szerint (a tűrésre kerekítve)
+    quantized = np.round(positions / tolerance).astype(np.int64)
+    _, first_index, inverse = np.unique(quantized, axis=0, return_index=True, return_inverse=True)
+    unique_positions = positions[first_index]
+    edges = inverse.reshape(-1)[edges]
+
+    # 2. Irányítatlan, egyedi élek (a degenerált, önmagába mutató élek nélkül)
+    edges = np.sort(edges, axis=1)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    edges = np.unique(edges, axis=0)
+    return unique_positions.astype(np.float32), edges
+
+
+def wireframe_cache_path(key, source_path=None, tolerance=DEFAULT_TOLERANCE, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    .npz útvonal a cache_dir-ben a kulcshoz (a könyvtár létrejön, ha kell).
+    Ha a source_path létező fájl, a módosítási ideje is a névbe kerül, így a
+    megváltozott modell drótváza újra kinyerődik.
+    """
+    signature = f"{key}|{tolerance!r}"
+    if source_path is not None and os.path.isfile(source_path):
+        signature += f"|{os.path.getmtime(source_path)!r}"
+    digest = hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+    name = "".join(c if c.isalnum() else "_" for c in os.path.basename(str(key)))[:40]
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, f"{name}-{digest}.npz")
+
+
+def extract_wireframe(root, cache_key=None, cache_path=None, tolerance=DEFAULT_TOLERANCE):
+    """
+    Mint az extract_wireframe_arrays, gyorsítótárral:
+      - cache_key: memóriabeli kulcs (pl. modell útvonal vagy generátor paraméterek)
+      - cache_path: .npz fájl, amely a következő futásnál is megspórolja a kinyerést
+    A root függvény is lehet: csak gyorsítótár hiánynál hívódik meg (így a
+    modell betöltése vagy a mesh generálása is elmarad, ha van mentett drótváz).
+    """
+    if cache_key is not None and cache_key in _wireframe_cache:
+        return _wireframe_cache[cache_key]
+
+    result = None
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            with np.load(cache_path) as data:
+                result = (data['positions'], data['edges'])
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Figyelem: A drótváz gyorsítótár nem olvasható ({cache_path}): {e}")
+
+    if result is None:
+        if callable(root):
+            root = root()
+        result = extract_wireframe_arrays(root, tolerance)
+        if cache_path is not None:
+            try:
+                np.savez(cache_path, positions=result[0], edges=result[1])
+            except OSError as e:
+                print(f"Figyelem: A drótváz gyorsítótár nem írható ({cache_path}): {e}")
+
+    if cache_key is not None:
+        _wireframe_cache[cache_key] = result
+    return result
+
+
+def clear_wireframe_cache():
+    """A memóriabeli gyorsítótár ürítése."""
+    _wireframe_cache.clear()
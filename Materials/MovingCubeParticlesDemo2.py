@@ -2,42 +2,39 @@
 #
 # Egy kocka 8 sarkát (vertexeit) véletlenszerűen mozgatjuk.
 # Minden saroknál egy kis fehér részecske-effekt jelenik meg.
+#
+# Drótváz mód: python MovingCubeParticlesDemo2.py mesh [modell]
+# A kocka helyett egy tetszőleges (generált vagy betöltött) mesh összes vertexe
+# és éle mozog ugyanazzal a vertex dinamikával.
+#
+# --threaded: a szimuláció háttérszálon fut, a render task csak a dupla
+# pufferből olvas és tölt fel (SimulationThread).
 
 import sys
 from direct.showbase.ShowBase import ShowBase
 from direct.task import Task
 from panda3d.core import (
-    VBase3, VBase4, AmbientLight, PointLight, NodePath,
-    TransparencyAttrib, AlphaTestAttrib, Texture, 
-    # A LineSegs a dinamikus élvonal rajzoláshoz
-    LineSegs, GeomNode, LVector3f, Geom # Hozzáadva Geom az explicit típusellenőrzéshez
+    VBase3, VBase4, AmbientLight, PointLight, NodePath
 )
 import math
 import random
+import numpy as np
 
 # ----------------------------------------------------------------------
-# HIBAKEZELÉS: Shader és Részecske Rendszer Importálása
+# Részecskék: egyetlen közös, több emitteres rendszer (MultiEmitterSparks)
 # ----------------------------------------------------------------------
-PARTICLES_AVAILABLE = False
-try:
-    from direct.particles.Particles import Particles
-    from direct.particles.ParticleEffect import ParticleEffect
-    from direct.particles.ParticleEmitter import ParticleEmitter
-    from direct.particles.PointParticleFactory import PointParticleFactory
-    from direct.particles.ColorInterpolationParticleRenderer import ColorInterpolationParticleRenderer
-    # A Panda3D-nek a Texture és ColorRamp-et is tudnia kell importálni
-    from panda3d.core import ColorRamp
-    PARTICLES_AVAILABLE = True
-except ImportError as e:
-    print(f"Figyelem: Részecske modul importálási hiba: {e}. A részecske effekt nem lesz elérhető.")
-    try:
-        from panda3d.core import ColorRamp
-    except ImportError:
-        class ColorRamp:
-            def __init__(self): pass
-            def addComponent(self, color, value): pass
-except AttributeError as e:
-     print(f"Figyelem: Panda3D attribútum hiba a részecske modulokban: {e}. A részecske effekt nem lesz elérhető.")
+# A paramétereket a ParticleTemplates "vertex_spark" sablonja adja; a
+# direct.particles modulokra (és vertexenkénti ParticleEffect-re) nincs szükség.
+from ParticleTemplates import default_registry
+from MultiEmitterSparks import MultiEmitterSparks
+from DynamicLines import DynamicLines # A dinamikus élvonal rajzolása (helyben frissülő vertex puffer)
+from VertexDynamics import VertexDynamics
+from MeshWireframe import extract_wireframe, wireframe_cache_path
+from MeshGenerators import create_cuboid_mesh
+from SimulationThread import DoubleBuffer, SimulationThread
+
+# Drótváz módban ennyi vertex bocsát ki szikrákat (egyenletesen kiválasztva)
+MAX_MESH_EMITTERS = 256
 
 class MovingCubeParticlesDemo(ShowBase):
     def __init__(self):
@@ -74,46 +71,70 @@ class MovingCubeParticlesDemo(ShowBase):
             VBase3(-s, -s, s), VBase3(s, -s, s), VBase3(s, s, s), VBase3(-s, s, s)
         ]
         
-        # A 8 vertex (sarok) adatstruktúrája
-        self.vertex_data = []
-        
-        for i, pos in enumerate(initial_verts):
-            # JAVÍTÁS: Növelt sebességtartomány a látható mozgás érdekében
-            vel = LVector3f(random.uniform(-3.0, 3.0), random.uniform(-3.0, 3.0), random.uniform(-3.0, 3.0))
-            
-            # Minden vertexhez egy különálló részecske-effekt
-            p_effect = self._create_particles(f"vertex_particle_{i}")
-            if p_effect:
-                p_effect.start()
-            
-            self.vertex_data.append({
-                'pos': pos,
-                'vel': vel,
-                'particle_effect': p_effect,
-            })
+        self.target_center = VBase3(0, 0, 0) # A vertexek célközéppontja
+        self.max_dist = 6.0 # Maximális távolság a középponttól
+
+        # Parancssor: [mesh [modell]] [--threaded]
+        args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+        self.threaded = '--threaded' in sys.argv
+
+        # Drótváz mód: a mesh egyedi vertexei és élei (egyszer kinyerve, gyorsítótárazva)
+        self.mesh_mode = len(args) > 0 and args[0] == 'mesh'
+        if self.mesh_mode:
+            positions, self.cube_edges = self._load_wireframe(args[1] if len(args) > 1 else None)
+            radius = float(np.sqrt((positions ** 2).sum(axis=1)).max())
+            self.max_dist = radius * 1.2
+            velocities = np.random.uniform(-3.0, 3.0, size=positions.shape)
+            self.dynamics = VertexDynamics(positions, velocities, self.target_center, self.max_dist)
+            self.camera.set_pos(-2.5 * radius, -2.5 * radius, 1.7 * radius)
+            self.camera.look_at(0, 0, 0)
+            print(f"Drótváz mód: {len(positions)} vertex, {len(self.cube_edges)} él.")
+        else:
+            # A 8 vertex (sarok) pozíciói és sebességei (N, 3) tömbökben (struct-of-arrays)
+            velocities = []
+
+            for i in range(len(initial_verts)):
+                # JAVÍTÁS: Növelt sebességtartomány a látható mozgás érdekében
+                velocities.append((random.uniform(-3.0, 3.0), random.uniform(-3.0, 3.0), random.uniform(-3.0, 3.0)))
+
+            self.dynamics = VertexDynamics(initial_verts, velocities, self.target_center, self.max_dist)
+
+            # Élek meghatározása (indexek a 0-7-ig terjedő vertex listában)
+            self.cube_edges = [
+                (0, 1), (1, 2), (2, 3), (3, 0), # Alsó lap
+                (4, 5), (5, 6), (6, 7), (7, 4), # Felső lap
+                (0, 4), (1, 5), (2, 6), (3, 7)  # Függőleges élek
+            ]
             
+        # Szikrák: egyetlen részecske pool, az emitter vertexek pozícióiból szülve
+        # (drótváz módban legfeljebb MAX_MESH_EMITTERS egyenletesen kiválasztott vertex)
+        vertex_count = len(self.dynamics)
+        self.emitter_indices = np.unique(
+            np.linspace(0, vertex_count - 1, min(vertex_count, MAX_MESH_EMITTERS)).astype(np.int64))
+        self.sparks = MultiEmitterSparks.from_template(
+            default_registry.get("vertex_spark"), len(self.emitter_indices), name="vertex_sparks")
+        self.sparks_np = self.render.attach_new_node(self.sparks.node)
+        self.sparks.setup_render_state(self.sparks_np)
+
         # ------------------------------------------------
         # 4. Kocka Vonalak Renderelése
         # ------------------------------------------------
         
-        self.cube_node = GeomNode('cube_lines')
+        # Tartós, indexelt vonal geometria a közös vertexekre (helyben frissítve)
+        self.cube_lines = DynamicLines('cube_lines', len(self.dynamics), self.cube_edges)
+        self.cube_node = self.cube_lines.node
         self.cube_np = self.render.attach_new_node(self.cube_node)
         self.cube_np.set_render_mode_thickness(3.0) # Vonalvastagság
         self.cube_np.set_color(1.0, 0.5, 0.0, 1.0) # Narancssárga szín a vonalaknak
-
-        # Élek meghatározása (indexek a 0-7-ig terjedő vertex listában)
-        self.cube_edges = [
-            (0, 1), (1, 2), (2, 3), (3, 0), # Alsó lap
-            (4, 5), (5, 6), (6, 7), (7, 4), # Felső lap
-            (0, 4), (1, 5), (2, 6), (3, 7)  # Függőleges élek
-        ]
+        self.cube_lines.set_positions(self.dynamics.positions)
         
         # ------------------------------------------------
         # 5. Animációs ciklus indítása
         # ------------------------------------------------
+        self.sim_thread = None
+        if self.threaded:
+            self._start_simulation_thread()
         self.taskMgr.add(self.update_cube_and_particles, "UpdateCubeTask")
-        self.target_center = VBase3(0, 0, 0) # A vertexek célközéppontja
-        self.max_dist = 6.0 # Maximális távolság a középponttól
 
         self.messenger.send('aspectRatioChanged')
         
@@ -123,131 +144,73 @@ class MovingCubeParticlesDemo(ShowBase):
 
     def update_cube_and_particles(self, task):
         """Frissíti a vertex pozíciókat, a vonalakat és a részecskéket."""
-        dt = globalClock.getDt()
-
-        # Új LineSegs létrehozása (minden képkockában újra kell rajzolni)
-        ls = LineSegs('cube_segments')
-        ls.set_thickness(3.0)
-        ls.set_color(1.0, 0.5, 0.0, 1.0) 
+        if self.sim_thread:
+            # Szálas mód: csak a legutóbb publikált állapot feltöltése (nincs várakozás)
+            self.sim_thread.buffer.consume(self._upload_state)
+            return Task.cont
 
-        for data in self.vertex_data:
-            # 1. Pozíció Frissítése
-            data['pos'] += data['vel'] * dt
-            
-            # 2. Visszajátszási/Ütközési Logika (falba ütközés a center körül)
-            dist_to_center = (data['pos'] - self.target_center).length()
-            if dist_to_center > self.max_dist:
-                # Tükrözi a sebességet, hogy visszapattanjon
-                data['vel'] = -(data['vel']) 
-            
-            # 3. Partikula Emitter Pozíció Frissítése
-            if data['particle_effect']:
-                data['particle_effect'].setPos(data['pos'])
+        dt = globalClock.getDt()
+        self._simulate_step(dt)
                 
-        # 4. Kocka Éleinek Rajzolása
-        # Az élek rajzolása a frissített pozíciók alapján
-        for i, j in self.cube_edges:
-            start_pos = self.vertex_data[i]['pos']
-            end_pos = self.vertex_data[j]['pos']
-            ls.draw_to(start_pos.x, start_pos.y, start_pos.z)
-            ls.draw_to(end_pos.x, end_pos.y, end_pos.z)
-            
-        # 5. Renderelés: Törli a régi vonalakat és hozzáadja az újakat.
-        self.cube_node.remove_all_geoms() 
-        
-        new_geom = ls.create()
-        final_geom = None
-        
-        # 5a. A tényleges Geom objektum kinyerése (GeomNode-ból vagy Geom-ként)
-        if isinstance(new_geom, GeomNode):
-            if new_geom.get_num_geoms() > 0:
-                final_geom = new_geom.get_geom(0)
-        elif isinstance(new_geom, Geom):
-            final_geom = new_geom
-        else:
-            # Ha a LineSegs.create() sem Geom, sem GeomNode-ot nem ad vissza
-            return Task.cont 
-
-        # 5b. MÁSOTLAT KÉSZÍTÉSE ÉS HOZZÁADÁSA (A const hiba elkerülése végett)
-        if final_geom:
-            try:
-                # Ezt a másolatot kéri a GeomNode.add_geom() a legtöbb környezetben
-                mutable_geom = final_geom.make_copy()
-                self.cube_node.add_geom(mutable_geom)
-            except AttributeError:
-                # Ha make_copy() hiányzik (ritka), megpróbáljuk a const objektumot hozzáadni.
-                self.cube_node.add_geom(final_geom)
-                print("Figyelem: Nem sikerült másolatot készíteni a Geom-ról, const objektumot használunk.")
+        # 4. Kocka Éleinek Frissítése: csak a vertex pozíciók íródnak felül,
+        # az élek (index buffer) és a GeomNode változatlanok.
+        self.cube_lines.set_positions(self.dynamics.positions)
+        self.sparks.upload()
 
         return Task.cont
 
+    def _simulate_step(self, dt):
+        """A szimuláció egy lépése (render szálon vagy a szimulációs szálon)."""
+        # 1-2. Pozíció frissítése és visszapattanás (falba ütközés a center körül)
+        # egyetlen vektorizált lépésben az összes vertexre
+        self.dynamics.step(dt)
+
+        # 3. Szikrák: születés az emitter vertexekből és a közös pool léptetése
+        self.sparks.simulate(dt, self.dynamics.positions[self.emitter_indices])
+
     # ------------------------------------------------
-    # 7. Segéd Függvények (Partikla generátor)
+    # 7. Háttérszálas szimuláció (--threaded)
     # ------------------------------------------------
 
-    def _create_particles(self, name):
-        """Partikla effekt létrehozása egy vertexhez."""
-        
-        if not PARTICLES_AVAILABLE:
-            return None # Partikula rendszer nem elérhető
-            
-        p = ParticleEffect(name)
-        p.setRenderParent(self.render) # Globális render parent
-        p.setSystemLifespan(0.0) # Végtelen élettartam
-        
-        # Konfigurálja az 'Particles' objektumot
-        particles = Particles()
-        particles.setRenderParent(self.render) 
-        particles.setPoolSize(100)
-        particles.setBirthRate(0.05) # Lassú és állandó kibocsátás
-
-        # 1. Textúra létrehozása (1x1 fehér pont)
-        p_texture = Texture()
-        p_texture.setup_2d_texture(1, 1, Texture.T_unsigned_byte, Texture.F_rgba)
-        p_texture.setRamImage(b'\xff\xff\xff\xff') # Fehér (R, G, B, A = 255, 255, 255, 255)
-
-        # 2. Renderer beállítása (Color Interpolation)
-        renderer = ColorInterpolationParticleRenderer()
-        renderer.setUserAlpha(1.0)
-        renderer.setTexture(p_texture) 
-        
-        # Színátmenet: Fehér -> Fekete (elhalványulás)
-        color_ramp = ColorRamp() 
-        color_ramp.addComponent(VBase4(1.0, 1.0, 1.0, 1.0), 0.0) # Fehér
-        color_ramp.addComponent(VBase4(1.0, 1.0, 1.0, 0.5), 0.5) # Fehér/Szürke (átlátszó)
-        color_ramp.addComponent(VBase4(0.0, 0.0, 0.0, 0.0), 1.0) # Fekete (teljesen átlátszó)
-        renderer.setColorRamp(color_ramp)
-        
-        renderer.setXScaleFlag(True)
-        renderer.setYScaleFlag(True)
-        renderer.setInitialXScale(0.3)
-        renderer.setFinalXScale(0.1)
-        renderer.setInitialYScale(0.3)
-        renderer.setFinalYScale(0.1)
-        
-        particles.setRenderer(renderer)
-        particles.setAttrib(TransparencyAttrib.make(TransparencyAttrib.M_alpha)) # Blending engedélyezése
-        
-        # Factory beállítása (Részecskék tulajdonságai)
-        factory = PointParticleFactory()
-        factory.setLifespanBase(0.8) # Rövid élettartam
-        factory.setLifespanSpread(0.2)
-        
-        # Emitter beállítása (Honnan sugároz)
-        emitter = ParticleEmitter()
-        emitter.setEmissionType(emitter.ET_sphere) # Gömb alakú kibocsátás
-        emitter.setAmplitudeSpread(0.5)
-        emitter.setRadius(0.5) # Kis gömb a sarok körül
-        emitter.setExplicitLaunchVector(VBase4(0.0, 0.0, 0.0, 0.0))
-        emitter.setLaunchAngle(emitter.LAV_up)
-        emitter.setLaunchBand(10.0)
-        emitter.setEmissionVolume(emitter.EV_sphere)
-        
-        particles.setFactory(factory)
-        particles.setEmitter(emitter)
-        p.addParticles(particles)
-        
-        return p
+    def _start_simulation_thread(self):
+        """A szimuláció áthelyezése háttérszálra; az állapot dupla pufferen keresztül jut a renderhez."""
+        buffer = DoubleBuffer(
+            vertices=self.dynamics.positions,
+            spark_positions=self.sparks.positions,
+            spark_ages=self.sparks.ages,
+            spark_lifespans=self.sparks.lifespans,
+        )
+        self.sim_thread = SimulationThread(self._simulate_step, self._snapshot_state, buffer, rate=60.0)
+        self.sim_thread.start()
+        print("A szimuláció háttérszálon fut (--threaded).")
+
+    def _snapshot_state(self, back):
+        """Az aktuális állapot bemásolása a hátsó pufferbe (a szimulációs szálon)."""
+        np.copyto(back['vertices'], self.dynamics.positions)
+        np.copyto(back['spark_positions'], self.sparks.positions)
+        np.copyto(back['spark_ages'], self.sparks.ages)
+        np.copyto(back['spark_lifespans'], self.sparks.lifespans)
+
+    def _upload_state(self, front):
+        """A publikált állapot feltöltése a vertex bufferekbe (a render szálon)."""
+        self.cube_lines.set_positions(front['vertices'])
+        self.sparks.upload(front['spark_positions'], front['spark_ages'], front['spark_lifespans'])
+
+    # ------------------------------------------------
+    # 8. Segéd Függvények (Drótváz)
+    # ------------------------------------------------
+
+    def _load_wireframe(self, model_path=None):
+        """Mesh betöltése (vagy generálása) és a drótváz vertexeinek/éleinek kinyerése."""
+        # A kinyert drótváz .npz-be kerül: a következő indításkor a betöltés /
+        # generálás és a kinyerés is elmarad
+        if model_path:
+            return extract_wireframe(lambda: self.loader.load_model(model_path), cache_key=model_path,
+                                     cache_path=wireframe_cache_path(model_path, source_path=model_path))
+        # Alapértelmezés: tesszellált kocka (kb. 14 000 vertex, 41 000 él)
+        return extract_wireframe(lambda: create_cuboid_mesh("wire_cuboid", 10.0, 10.0, 10.0, 48, 48, 48),
+                                 cache_key="wire_cuboid_48",
+                                 cache_path=wireframe_cache_path("wire_cuboid_10x10x10_48"))
 
 
 demo = MovingCubeParticlesDemo()
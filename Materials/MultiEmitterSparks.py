@@ -0,0 +1,176 @@
+# Több Emitteres, Közös Részecske Rendszer - Panda3D Python
+#
+# A MovingCubeParticlesDemo minden kocka sarokhoz külön ParticleEffect-et
+# (100-as pool, saját renderer, saját kirajzolás) hozott létre. Itt egyetlen
+# részecske pool van: az emitterek pozícióit egy (E, 3) tömb adja, minden
+# emitter ebbe a közös poolba szül, és az egész egyetlen GeomPoints-ként,
+# egyetlen dinamikus vertex bufferből rajzolódik ki. A lépés költsége a
+# pool méretével nő, nem az emitterek számával, így több száz emitter is elfér.
+#
+# Használat:
+#     sparks = MultiEmitterSparks.from_template(default_registry.get("vertex_spark"), 8)
+#     sparks_np = render.attach_new_node(sparks.node)
+#     sparks.update(dt, emitter_positions)   # (E, 3) tömb
+
+from panda3d.core import (
+    GeomVertexData, GeomVertexFormat, GeomVertexArrayFormat, GeomPoints, GeomNode, Geom,
+    InternalName, OmniBoundingVolume, TransparencyAttrib
+)
+import numpy as np
+
+# Pozíció és float32 szín egy interleaved tömbben (a get_v3c4 színe uint8 lenne)
+_SPARK_ARRAY_FORMAT = GeomVertexArrayFormat()
+_SPARK_ARRAY_FORMAT.add_column(InternalName.get_vertex(), 3, Geom.NT_float32, Geom.C_point)
+_SPARK_ARRAY_FORMAT.add_column(InternalName.get_color(), 4, Geom.NT_float32, Geom.C_color)
+SPARK_FORMAT = GeomVertexFormat.register_format(_SPARK_ARRAY_FORMAT)
+
+# Alapértelmezett színátmenet: Fehér -> Fekete (elhalványulás)
+DEFAULT_COLOR_STOPS = (((1.0, 1.0, 1.0, 1.0), 0.0), ((0.0, 0.0, 0.0, 0.0), 1.0))
+
+
+class MultiEmitterSparks:
+    """
+    Közös részecske pool tetszőleges számú emitterhez (gyűrűs buffer: a
+    legrégebbi részecske helyére születik az új, ha a pool megtelt).
+    """
+
+    def __init__(self, name, capacity, birth_rate=0.05, litter_size=1,
+                 lifespan_base=0.8, lifespan_spread=0.2,
+                 emitter_radius=0.5, amplitude=1.0, amplitude_spread=0.5,
+                 color_stops=DEFAULT_COLOR_STOPS, point_size=0.3, seed=None):
+        self.capacity = int(capacity)
+        self.birth_rate = float(birth_rate) # Emitterenként ennyi másodpercenként születik 'litter_size' részecske
+        self.litter_size = int(litter_size)
+        self.lifespan_base = float(lifespan_base)
+        self.lifespan_spread = float(lifespan_spread)
+        self.emitter_radius = float(emitter_radius)
+        self.amplitude = float(amplitude)
+        self.amplitude_spread = float(amplitude_spread)
+        self.point_size = point_size
+        self.rng = np.random.default_rng(seed)
+
+        # Színátmenet táblázat (az életkor arányának függvényében)
+        stops = sorted(color_stops, key=lambda stop: stop[1])
+        self._ramp_t = np.array([t for _, t in stops], dtype=np.float32)
+        self._ramp_rgba = np.array([c for c, _ in stops], dtype=np.float32)
+
+        # Részecske állapot (struct-of-arrays)
+        self.positions = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.velocities = np.zeros((self.capacity, 3), dtype=np.float32)
+        self.ages = np.zeros(self.capacity, dtype=np.float32)
+        self.lifespans = np.zeros(self.capacity, dtype=np.float32) # 0: üres hely
+        self._cursor = 0           # A következő szülés helye a gyűrűs bufferben
+        self._birth_accum = 0.0    # Képkockák közötti tört születések
+        self._emitter_cursor = 0   # Körbeforgó emitter választás
+
+        # Egyetlen dinamikus pont geometria (pozíció + szín)
+        self.vdata = GeomVertexData(name, SPARK_FORMAT, Geom.UH_dynamic)
+        self.vdata.unclean_set_num_rows(self.capacity)
+        view = self._modify_vertex_view()
+        view[:] = 0.0
+        prim = GeomPoints(Geom.UH_static)
+        prim.add_consecutive_vertices(0, self.capacity)
+        geom = Geom(self.vdata)
+        geom.add_primitive(prim)
+        self.node = GeomNode(name)
+        self.node.add_geom(geom)
+        # A részecskék az emitterek körül bárhol lehetnek: a levágást nem végezzük el
+        self.node.set_bounds(OmniBoundingVolume())
+        self.node.set_final(True)
+
+    @staticmethod
+    def estimate_capacity(emitter_count, birth_rate, lifespan_max, litter_size=1, headroom=1.25):
+        """Az egyszerre élő részecskék várható legnagyobb száma (tartalékkal)."""
+        alive = max(1, emitter_count) * litter_size * lifespan_max / max(birth_rate, 1e-6)
+        return int(np.ceil(alive * headroom)) + 1
+
+    @classmethod
+    def from_template(cls, template, emitter_count, name=None, seed=None):
+        """
+        Rendszer egy ParticleEffectTemplate paramétereivel. A pool a várható élő
+        részecskeszámhoz igazodik (legfeljebb a sablon poolja x emitterek).
+        """
+        capacity = min(template.pool_size * max(1, emitter_count),
+                       cls.estimate_capacity(emitter_count, template.birth_rate,
+                                             template.lifespan_base + template.lifespan_spread))
+        return cls(name or template.name, capacity,
+                   birth_rate=template.birth_rate,
+                   lifespan_base=template.lifespan_base, lifespan_spread=template.lifespan_spread,
+                   emitter_radius=template.emitter_radius,
+                   amplitude=template.amplitude, amplitude_spread=template.amplitude_spread,
+                   color_stops=template.color_stops, point_size=template.initial_scale, seed=seed)
+
+    def setup_render_state(self, node_path):
+        """A kirajzolás beállításai: perspektivikus pontméret, átlátszóság, mélységírás nélkül."""
+        node_path.set_render_mode_perspective(True)
+        node_path.set_render_mode_thickness(self.point_size)
+        node_path.set_transparency(TransparencyAttrib.M_alpha)
+        node_path.set_depth_write(False)
+        node_path.set_light_off()
+        node_path.set_bin('fixed', 0)
+
+    def _modify_vertex_view(self):
+        """Írható (N, 7) float32 nézet: x, y, z, r, g, b, a (a buffert módosítottnak jelöli)."""
+        return np.frombuffer(memoryview(self.vdata.modify_array(0)), dtype=np.float32).reshape(-1, 7)
+
+    def get_alive_count(self):
+        return int(np.count_nonzero(self.ages < self.lifespans))
+
+    def _spawn(self, count, emitter_positions):
+        """'count' új részecske a körbeforgó emitterekből, a gyűrűs buffer következő helyeire."""
+        count = min(count, self.capacity)
+        slots = (self._cursor + np.arange(count)) % self.capacity
+        self._cursor = int((self._cursor + count) % self.capacity)
+
+        emitter_count = len(emitter_positions)
+        emitters = (self._emitter_cursor + np.arange(count)) % emitter_count
+        self._emitter_cursor = int((self._emitter_cursor + count) % emitter_count)
+
+        # Egyenletes irány a gömbön; a kezdőpont a gömb felületén, a sebesség kifelé mutat
+        direction = self.rng.normal(size=(count, 3)).astype(np.float32)
+        direction /= np.maximum(np.linalg.norm(direction, axis=1, keepdims=True), 1e-6)
+        speed = self.amplitude + self.rng.uniform(-self.amplitude_spread, self.amplitude_spread, size=(count, 1))
+
+        self.positions[slots] = emitter_positions[emitters] + direction * self.emitter_radius
+        self.velocities[slots] = direction * speed.astype(np.float32)
+        self.ages[slots] = 0.0
+        self.lifespans[slots] = self.lifespan_base + self.rng.uniform(
+            -self.lifespan_spread, self.lifespan_spread, size=count)
+
+    def simulate(self, dt, emitter_positions):
+        """Születés minden emitterből és a részecskék léptetése (Panda3D hívás nélkül)."""
+        emitter_positions = np.asarray(emitter_positions, dtype=np.float32).reshape(-1, 3)
+
+        # 1. Születések (emitterenként birth_rate másodpercenként litter_size darab)
+        if len(emitter_positions) and self.birth_rate > 0.0:
+            self._birth_accum += len(emitter_positions) * self.litter_size * dt / self.birth_rate
+            births = int(self._birth_accum)
+            if births:
+                self._birth_accum -= births
+                self._spawn(births, emitter_positions)
+
+        # 2. Öregedés és mozgás (az egész pool egyszerre)
+        self.ages += dt
+        self.positions += self.velocities * np.float32(dt)
+
+    def upload(self, positions=None, ages=None, lifespans=None):
+        """
+        A vertex buffer feltöltése. Alapértelmezésben a saját állapotból, de
+        kaphat pillanatképet is (pl. a szimulációs szál dupla pufferéből).
+        """
+        positions = self.positions if positions is None else positions
+        ages = self.ages if ages is None else ages
+        lifespans = self.lifespans if lifespans is None else lifespans
+
+        # Szín az életkor arányából (színátmenet); a halott részecskék teljesen átlátszók
+        life = np.clip(ages / np.maximum(lifespans, 1e-6), 0.0, 1.0)
+        view = self._modify_vertex_view()
+        view[:, 0:3] = positions
+        for channel in range(4):
+            view[:, 3 + channel] = np.interp(life, self._ramp_t, self._ramp_rgba[:, channel])
+        view[ages >= lifespans, 6] = 0.0
+
+    def update(self, dt, emitter_positions):
+        """Születés, léptetés és a vertex buffer feltöltése egy hívásban."""
+        self.simulate(dt, emitter_positions)
+        self.upload()
@@ -0,0 +1,60 @@
+# Több Emitteres Szikra Mérés - Panda3D Python
+#
+# A MultiEmitterSparks egy lépésének (születés, léptetés, vertex buffer
+# feltöltés) ideje különböző emitter számoknál:
+#   1. emitterenként állandó kibocsátás (a teljes részecskeszám az emitterekkel nő)
+#   2. állandó teljes pool (az emitterek száma nő, a részecskeszám nem)
+# A második táblázat mutatja, hogy a költség a részecskeszámtól függ, nem az
+# emitterek számától.
+#
+# Használat: python MultiEmitterSparksBenchmark.py [lépések száma]
+
+import sys
+import time
+import numpy as np
+
+from MultiEmitterSparks import MultiEmitterSparks
+
+BIRTH_RATE = 0.05        # Mint a korábbi effektek (emitterenként 20 részecske / s)
+LIFESPAN_MAX = 1.0
+FIXED_POOL = 20000
+
+
+def measure(sparks, emitter_count, steps, dt=1.0 / 60.0):
+    """Átlagos lépésidő (ms) és az élő részecskék száma a mérés végén."""
+    rng = np.random.default_rng(1)
+    emitters = rng.uniform(-5.0, 5.0, size=(emitter_count, 3)).astype(np.float32)
+    # Bemelegítés: a pool feltöltődik
+    for _ in range(60):
+        sparks.update(dt, emitters)
+    start = time.perf_counter()
+    for _ in range(steps):
+        emitters += 0.01
+        sparks.update(dt, emitters)
+    return (time.perf_counter() - start) / steps * 1000.0, sparks.get_alive_count()
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    emitter_counts = [8, 64, 256, 1024]
+
+    print("--- EMITTERENKÉNT ÁLLANDÓ KIBOCSÁTÁS (becsült pool) ---")
+    print(f"{'emitter':>8} {'pool':>8} {'élő':>8} {'ms/lépés':>10}")
+    for count in emitter_counts:
+        capacity = MultiEmitterSparks.estimate_capacity(count, BIRTH_RATE, LIFESPAN_MAX)
+        sparks = MultiEmitterSparks("bench", capacity, birth_rate=BIRTH_RATE, seed=1)
+        ms, alive = measure(sparks, count, steps)
+        print(f"{count:>8} {sparks.capacity:>8} {alive:>8} {ms:>10.3f}")
+
+    print()
+    print(f"--- ÁLLANDÓ {FIXED_POOL} HELYES POOL ---")
+    print(f"{'emitter':>8} {'pool':>8} {'élő':>8} {'ms/lépés':>10}")
+    for count in emitter_counts:
+        # A születési ütem úgy skálázódik, hogy a teljes kibocsátás állandó legyen
+        sparks = MultiEmitterSparks("bench", FIXED_POOL, birth_rate=count / 20000.0, seed=1)
+        ms, alive = measure(sparks, count, steps)
+        print(f"{count:>8} {sparks.capacity:>8} {alive:>8} {ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
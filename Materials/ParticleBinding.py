@@ -0,0 +1,134 @@
+# Partikula Paraméter Kötés - Panda3D Python
+#
+# A demók minden képkockában végigjárják az effekt objektumait
+# (pl. getEmitters()[0].getFactory()) és akkor is meghívják a C++ settereket
+# (setPos, setLifespanBase), ha az érték nem változott.
+# Ez a vékony réteg a direct.particles effekt emitterét, factory-ját és
+# rendererét egyszer oldja fel, a paramétereket típusosan tárolja, és a
+# C++ objektumba csak akkor ír, ha az új érték epsilonnál jobban eltér.
+
+DEFAULT_EPSILON = 1e-3
+
+# Szabványos paraméterek: név -> (objektum, setter, típus)
+# Az objektum a Particles rendszer egyik komponense ('particles', 'factory', 'emitter', 'renderer').
+STANDARD_PARAMS = {
+    'birth_rate': ('particles', 'setBirthRate', float),
+    'litter_size': ('particles', 'setLitterSize', int),
+    'pool_size': ('particles', 'setPoolSize', int),
+    'lifespan_base': ('factory', 'setLifespanBase', float),
+    'lifespan_spread': ('factory', 'setLifespanSpread', float),
+    'mass_base': ('factory', 'setMassBase', float),
+    'terminal_velocity_base': ('factory', 'setTerminalVelocityBase', float),
+    'amplitude': ('emitter', 'setAmplitude', float),
+    'amplitude_spread': ('emitter', 'setAmplitudeSpread', float),
+    'user_alpha': ('renderer', 'setUserAlpha', float),
+}
+
+
+class ParticleParam:
+    """Egyetlen skalár paraméter: a setter csak valódi változáskor hívódik."""
+
+    def __init__(self, name, setter, kind=float, epsilon=DEFAULT_EPSILON):
+        self.name = name
+        self.setter = setter
+        self.kind = kind
+        # Egész típusnál minden eltérés számít
+        self.epsilon = epsilon if kind is float else 0
+        self.value = None
+        self.pushes = 0
+
+    def set(self, value):
+        """Beállítja az értéket. Visszaadja, hogy történt-e C++ hívás."""
+        value = self.kind(value)
+        if self.value is not None and abs(value - self.value) <= self.epsilon:
+            return False
+        self.setter(value)
+        self.value = value
+        self.pushes += 1
+        return True
+
+    def invalidate(self):
+        """A következő set() mindenképp írni fog (pl. az effekt újraindítása után)."""
+        self.value = None
+
+
+class VectorParam(ParticleParam):
+    """Vektor paraméter (pl. pozíció): komponensenkénti epsilon összehasonlítás."""
+
+    def __init__(self, name, setter, epsilon=DEFAULT_EPSILON):
+        ParticleParam.__init__(self, name, setter, tuple, epsilon)
+        self.epsilon = epsilon
+
+    def set(self, *value):
+        if len(value) == 1:
+            value = value[0]
+        value = tuple(float(c) for c in value)
+        if self.value is not None and all(abs(a - b) <= self.epsilon for a, b in zip(value, self.value)):
+            return False
+        self.setter(*value)
+        self.value = value
+        self.pushes += 1
+        return True
+
+
+class ParticleEffectBinding:
+    """
+    Egy ParticleEffect (és annak egyik Particles rendszere) gyorsítótárazott kötése.
+    A komponensek és setterek feloldása csak a konstruktorban és a bind()-ban történik.
+    """
+
+    def __init__(self, effect, particles_index=0, epsilon=DEFAULT_EPSILON):
+        self.effect = effect
+        self.epsilon = epsilon
+
+        # Komponensek feloldása egyszer
+        self.particles = effect.getParticlesList()[particles_index]
+        self.components = {
+            'particles': self.particles,
+            'factory': self.particles.getFactory(),
+            'emitter': self.particles.getEmitter(),
+            'renderer': self.particles.getRenderer(),
+        }
+        self.factory = self.components['factory']
+        self.emitter = self.components['emitter']
+        self.renderer = self.components['renderer']
+
+        self.params = {}
+        self.position = VectorParam('position', effect.setPos, epsilon)
+
+    def bind(self, name, component=None, setter_name=None, kind=None, epsilon=None):
+        """
+        Paraméter regisztrálása. Szabványos névnél (STANDARD_PARAMS) elég a név,
+        egyébként meg kell adni a komponenst és a setter nevét.
+        """
+        if component is None or setter_name is None:
+            component, setter_name, default_kind = STANDARD_PARAMS[name]
+            kind = kind or default_kind
+        setter = getattr(self.components[component], setter_name)
+        param = ParticleParam(name, setter, kind or float, self.epsilon if epsilon is None else epsilon)
+        self.params[name] = param
+        return param
+
+    def __getitem__(self, name):
+        return self.params[name]
+
+    def set(self, name, value):
+        """Paraméter beállítása névvel; nem regisztrált szabványos név automatikusan kötődik."""
+        param = self.params.get(name)
+        if param is None:
+            param = self.bind(name)
+        return param.set(value)
+
+    def set_pos(self, *pos):
+        """Az effekt pozíciója, csak valódi változás esetén írva."""
+        return self.position.set(*pos)
+
+    def invalidate(self):
+        """Minden gyorsítótárazott érték érvénytelenítése."""
+        self.position.invalidate()
+        for param in self.params.values():
+            param.invalidate()
+
+    def get_push_count(self):
+        """Összesen hány C++ setter hívás történt (profilozáshoz)."""
+        return self.position.pushes + sum(p.pushes for p in self.params.values())
@@ -0,0 +1,166 @@
+# Partikula Effekt Sablonok - Panda3D Python
+#
+# A demók _create_particles függvényei minden effekthez új 1x1-es textúrát és
+# új színátmenetet építettek, a paramétereket pedig helyben írták le. Itt egy
+# effektet egyszer írunk le (sablon), a változatlan erőforrások megosztottak:
+# minden klón ugyanazt a fehér textúrát (egyetlen GPU textúra objektum) és a
+# sablon egyszer kiszámolt színátmenet szakaszait kapja.
+# A factory, az emitter és a renderer klónonként a Particles nyilvános
+# setterein keresztül készül el: a Particles ezeket típusnévből építi (nem
+# vesz át meglévő objektumot), a renderer pedig a saját rendszere
+# geometriáját tartja. Egy klón létrehozása ezért nagyjából annyi idő, mint
+# egy effekt felépítése a nulláról; a megtakarítás a textúrákban van
+# (N helyett 1, lásd ParticleTemplatesBenchmark.py).
+
+from panda3d.core import VBase4, Texture
+
+from LazyImports import particle_subsystem
+
+# Az összes sablon által megosztott 1x1-es fehér textúra (egyetlen GPU textúra objektum)
+_white_texture = None
+
+
+def get_white_texture():
+    """Megosztott 1x1 fehér RGBA textúra (első híváskor jön létre)."""
+    global _white_texture
+    if _white_texture is None:
+        _white_texture = Texture("particle_white_1x1")
+        _white_texture.setup_2d_texture(1, 1, Texture.T_unsigned_byte, Texture.F_rgba)
+        _white_texture.setRamImage(b'\xff\xff\xff\xff') # Fehér (R, G, B, A = 255, 255, 255, 255)
+    return _white_texture
+
+
+class ParticleEffectTemplate:
+    """
+    Egy pontszerű, színátmenetes részecske effekt leírása.
+    A paraméterek a demók korábbi _create_particles függvényeit követik.
+    """
+
+    def __init__(self, name, pool_size=100, birth_rate=0.05,
+                 lifespan_base=1.0, lifespan_spread=0.2, mass_base=None, terminal_velocity_base=None,
+                 color_stops=(((1.0, 1.0, 1.0, 1.0), 0.0), ((0.0, 0.0, 0.0, 0.0), 1.0)),
+                 initial_scale=0.3, final_scale=0.1,
+                 emitter_radius=0.5, amplitude=1.0, amplitude_spread=0.5,
+                 system_lifespan=0.0):
+        self.name = name
+        self.pool_size = pool_size
+        self.birth_rate = birth_rate
+        self.lifespan_base = lifespan_base
+        self.lifespan_spread = lifespan_spread
+        self.mass_base = mass_base
+        self.terminal_velocity_base = terminal_velocity_base
+        self.color_stops = tuple(sorted(color_stops, key=lambda stop: stop[1]))
+        self.initial_scale = initial_scale
+        self.final_scale = final_scale
+        self.emitter_radius = emitter_radius
+        self.amplitude = amplitude
+        self.amplitude_spread = amplitude_spread
+        self.system_lifespan = system_lifespan
+
+        # Színátmenet: a szomszédos színpontok közti lineáris szakaszok (a klónok közösen használják)
+        self.color_segments = [(start_t, end_t, VBase4(*start_color), VBase4(*end_color))
+                               for (start_color, start_t), (end_color, end_t)
+                               in zip(self.color_stops, self.color_stops[1:])]
+
+    def configure(self, particles, texture):
+        """A sablon paraméterei egy Particles rendszerre, a megadott textúrával."""
+        ps = particle_subsystem
+        particles.setBirthRate(self.birth_rate)
+        particles.setSystemLifespan(self.system_lifespan)
+
+        particles.setFactory("PointParticleFactory")
+        factory = particles.getFactory()
+        factory.setLifespanBase(self.lifespan_base)
+        factory.setLifespanSpread(self.lifespan_spread)
+        if self.mass_base is not None:
+            factory.setMassBase(self.mass_base)
+        if self.terminal_velocity_base is not None:
+            factory.setTerminalVelocityBase(self.terminal_velocity_base)
+
+        particles.setEmitter("SphereVolumeEmitter")
+        emitter = particles.getEmitter()
+        emitter.setEmissionType(ps.BaseParticleEmitter.ET_RADIATE) # Gömbből kifelé
+        emitter.setRadius(self.emitter_radius)
+        emitter.setAmplitude(self.amplitude)
+        emitter.setAmplitudeSpread(self.amplitude_spread)
+
+        particles.setRenderer("SpriteParticleRenderer")
+        renderer = particles.getRenderer()
+        renderer.setTexture(texture)
+        renderer.setAlphaMode(ps.BaseParticleRenderer.PR_ALPHA_USER) # Átlátszóság a színátmenetből
+        renderer.setUserAlpha(1.0)
+        renderer.setXScaleFlag(True)
+        renderer.setYScaleFlag(True)
+        renderer.setInitialXScale(self.initial_scale)
+        renderer.setFinalXScale(self.final_scale)
+        renderer.setInitialYScale(self.initial_scale)
+        renderer.setFinalYScale(self.final_scale)
+        color_manager = renderer.getColorInterpolationManager()
+        for segment in self.color_segments:
+            color_manager.addLinear(*segment)
+
+    def instantiate(self, effect_name, render_parent):
+        """Egy új effekt a sablonból. Ha a részecske rendszer nem elérhető, None."""
+        if not particle_subsystem.available:
+            return None
+        ps = particle_subsystem
+        particles = ps.Particles(f"{effect_name}-particles", self.pool_size)
+        particles.setRenderParent(render_parent)
+        self.configure(particles, get_white_texture())
+
+        p = ps.ParticleEffect(effect_name)
+        p.addParticles(particles)
+        return p
+
+
+class ParticleTemplateRegistry:
+    """Névvel elérhető sablonok; a clone() a közös textúrával készít belőlük effektet."""
+
+    def __init__(self):
+        self.templates = {}
+        self.clone_count = 0
+
+    def register(self, template):
+        self.templates[template.name] = template
+        return template
+
+    def get(self, name):
+        return self.templates[name]
+
+    def clone(self, template_name, effect_name, render_parent):
+        """Új effekt a megnevezett sablonból (vagy None, ha nincs részecske rendszer)."""
+        effect = self.templates[template_name].instantiate(effect_name, render_parent)
+        if effect is not None:
+            self.clone_count += 1
+        return effect
+
+    def get_texture_count(self):
+        """A klónok által használt különálló textúra objektumok száma."""
+        return 1 if _white_texture is not None else 0
+
+
+# ----------------------------------------------------------------------
+# A demók közös sablonjai
+# ----------------------------------------------------------------------
+
+default_registry = ParticleTemplateRegistry()
+
+# Fehér, elhalványuló pont a mozgó kocka sarkaihoz (MovingCubeParticlesDemo)
+default_registry.register(ParticleEffectTemplate(
+    "vertex_spark", pool_size=100, birth_rate=0.05,
+    lifespan_base=0.8, lifespan_spread=0.2,
+    color_stops=(((1.0, 1.0, 1.0, 1.0), 0.0),  # Fehér
+                 ((1.0, 1.0, 1.0, 0.5), 0.5),  # Fehér/Szürke (átlátszó)
+                 ((0.0, 0.0, 0.0, 0.0), 1.0)), # Fekete (teljesen átlátszó)
+    initial_scale=0.3, final_scale=0.1, emitter_radius=0.5,
+))
+
+# Sárga szikrák a nyújtott rúd körül (SpaghettifyBoxDemo2)
+default_registry.register(ParticleEffectTemplate(
+    "yellow_spark", pool_size=500, birth_rate=0.01,
+    lifespan_base=1.0, lifespan_spread=0.2, mass_base=1.0, terminal_velocity_base=0.1,
+    color_stops=(((1.0, 1.0, 0.0, 1.0), 0.0),  # Sárga
+                 ((1.0, 0.5, 0.0, 0.5), 0.5),  # Narancs (átlátszó)
+                 ((0.0, 0.0, 0.0, 0.0), 1.0)), # Fekete (teljesen átlátszó)
+    initial_scale=0.2, final_scale=0.05, emitter_radius=2.0,
+))
@@ -0,0 +1,82 @@
+# Partikula Sablon Klónozás Mérés - Panda3D Python
+#
+# N effekt létrehozásának ideje két módon:
+#   1. a nulláról (mint a demók korábbi _create_particles függvényei): minden
+#      effekt saját 1x1-es textúrát kap
+#   2. a sablon klónjaként: a textúra és a színátmenet megosztott
+# A factory, az emitter és a renderer mindkét esetben effektenként készül, így
+# az idő nagyjából azonos; a különbség a különálló textúrák számában van.
+#
+# Használat: python ParticleTemplatesBenchmark.py [effektek száma ...]
+
+import sys
+import time
+from panda3d.core import NodePath, Texture
+
+from LazyImports import particle_subsystem
+from ParticleTemplates import ParticleEffectTemplate, ParticleTemplateRegistry
+
+REPEATS = 5
+
+
+def build_from_scratch(template, effect_name, render_parent):
+    """Egy effekt a sablon paramétereivel, de saját textúrával (mint a demók korábban)."""
+    ps = particle_subsystem
+    texture = Texture(f"{effect_name}-white")
+    texture.setup_2d_texture(1, 1, Texture.T_unsigned_byte, Texture.F_rgba)
+    texture.setRamImage(b'\xff\xff\xff\xff')
+
+    particles = ps.Particles(f"{effect_name}-particles", template.pool_size)
+    particles.setRenderParent(render_parent)
+    template.configure(particles, texture)
+
+    effect = ps.ParticleEffect(effect_name)
+    effect.addParticles(particles)
+    return effect
+
+
+def measure(create, count):
+    """A legjobb idő REPEATS ismétlésből (ms) és az utolsó kör effektjei."""
+    best = None
+    for _ in range(REPEATS):
+        render_parent = NodePath("render")
+        start = time.perf_counter()
+        effects = [create(f"effect_{i}", render_parent) for i in range(count)]
+        elapsed = (time.perf_counter() - start) * 1000.0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, effects
+
+
+def count_distinct(effects, getter):
+    """Hány különálló C++ objektumot ad a getter az effektek Particles rendszerein."""
+    return len({getter(effect.getParticlesList()[0]).this for effect in effects})
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [8, 64, 256, 1024]
+    if not particle_subsystem.available:
+        print("A részecske rendszer nem elérhető.")
+        return
+
+    template = ParticleEffectTemplate("bench_spark", pool_size=100, birth_rate=0.05,
+                                      lifespan_base=0.8, lifespan_spread=0.2,
+                                      color_stops=(((1.0, 1.0, 1.0, 1.0), 0.0),
+                                                   ((1.0, 1.0, 1.0, 0.5), 0.5),
+                                                   ((0.0, 0.0, 0.0, 0.0), 1.0)))
+    registry = ParticleTemplateRegistry()
+    registry.register(template)
+    registry.clone("bench_spark", "warmup", NodePath("render")) # Bemelegítés (a közös textúra elkészül)
+
+    print(f"{'effekt':>7} {'nulláról (ms)':>14} {'klón (ms)':>10} {'arány':>7} {'textúra':>11}")
+    for count in counts:
+        scratch_ms, scratch = measure(
+            lambda name, parent: build_from_scratch(template, name, parent), count)
+        clone_ms, clones = measure(
+            lambda name, parent: registry.clone("bench_spark", name, parent), count)
+        print(f"{count:>7} {scratch_ms:>14.2f} {clone_ms:>10.2f} {scratch_ms / clone_ms:>6.2f}x "
+              f"{count_distinct(scratch, lambda p: p.getRenderer().getTexture()):>6} / "
+              f"{count_distinct(clones, lambda p: p.getRenderer().getTexture()):<2}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Háttérszálas Szimuláció Dupla Pufferelt Állapottal - Panda3D Python
+#
+# A demókban a szimuláció a render szálon, a task-ban fut, így a költsége
+# közvetlenül a képkocka időhöz adódik. Itt a szimuláció egy külön szálon
+# lép (rögzített időlépéssel; a numpy-nehéz részek alatt a GIL felszabadul),
+# és egy dupla pufferbe publikál. A render task csak olvas és feltölt:
+# sosem vár a szimulációra, ha nincs új állapot, a legutóbbi marad a képen.
+# Ha a szimuláció rövid ideig túllépi a keretét, legfeljebb max_steps lépéssel
+# zárkózik fel, a többi lemaradást eldobja (nincs "halálspirál").
+#
+# Használat:
+#     buffer = DoubleBuffer(positions=np.zeros((n, 3), np.float32))
+#     sim = SimulationThread(step, snapshot, buffer, rate=60.0)
+#     sim.start()
+#     ...                                 # render task:
+#     buffer.consume(upload)              # upload(front) csak új állapotnál hívódik
+
+import threading
+import time
+import numpy as np
+
+
+class DoubleBuffer:
+    """
+    Két azonos szerkezetű állapot készlet (név -> numpy tömb). Az író a hátsó
+    készletbe ír, a publish() cserél; az olvasó a zár alatt a legutóbb
+    publikált elülső készletet látja, így olvasás közben sosem íródik felül.
+    """
+
+    def __init__(self, **arrays):
+        self._buffers = [
+            {name: np.array(value, copy=True) for name, value in arrays.items()},
+            {name: np.array(value, copy=True) for name, value in arrays.items()},
+        ]
+        self._front = 0
+        self._lock = threading.Lock()
+        self.version = 0
+        self._consumed_version = 0
+
+    @property
+    def back(self):
+        """Az író (szimulációs szál) készlete."""
+        return self._buffers[1 - self._front]
+
+    def publish(self):
+        """A hátsó készlet elérhetővé tétele az olvasónak (csere)."""
+        with self._lock:
+            self._front = 1 - self._front
+            self.version += 1
+
+    def consume(self, apply):
+        """
+        Ha a legutóbbi hívás óta új állapot jelent meg, apply(elülső készlet) a zár alatt.
+        Visszaadja, hogy volt-e új állapot.
+        """
+        with self._lock:
+            if self.version == self._consumed_version:
+                return False
+            apply(self._buffers[self._front])
+            self._consumed_version = self.version
+            return True
+
+    def discard(self):
+        """A még át nem vett állapot eldobása (pl. újraindítás után elavult)."""
+        with self._lock:
+            self._consumed_version = self.version
+
+
+class SimulationThread:
+    """
+    Rögzített időlépésű szimulációs szál.
+      - step(dt): a szimuláció egy lépése (csak ez a szál módosítja az állapotot)
+      - snapshot(back): az állapot bemásolása a dupla puffer hátsó készletébe
+    A fő szálról az állapotot csak a state_lock alatt szabad módosítani (pl. újraindítás);
+    a lépés, a pillanatkép és a publikálás együtt a zár alatt történik.
+    """
+
+    def __init__(self, step, snapshot, buffer, rate=60.0, max_steps=4, name="SimulationThread"):
+        self.step = step
+        self.snapshot = snapshot
+        self.buffer = buffer
+        self.step_dt = 1.0 / rate
+        self.max_steps = max_steps
+        self.state_lock = threading.Lock()
+
+        # Statisztika (profilozáshoz)
+        self.steps_done = 0
+        self.dropped_steps = 0
+        self.last_tick_ms = 0.0
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """A szál leállítása (a folyamatban lévő lépés még befejeződik)."""
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def is_running(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        accumulator = 0.0
+        last = time.perf_counter()
+        while not self._stop_event.is_set():
+            now = time.perf_counter()
+            accumulator += now - last
+            last = now
+
+            steps = int(accumulator / self.step_dt)
+            if steps > self.max_steps:
+                # Túl nagy lemaradás: a felesleget eldobjuk, hogy a szál utolérje magát
+                self.dropped_steps += steps - self.max_steps
+                steps = self.max_steps
+                accumulator = steps * self.step_dt
+
+            if steps:
+                tick_start = time.perf_counter()
+                with self.state_lock:
+                    for _ in range(steps):
+                        self.step(self.step_dt)
+                    self.snapshot(self.buffer.back)
+                    self.buffer.publish()
+                accumulator -= steps * self.step_dt
+                self.steps_done += steps
+                self.last_tick_ms = (time.perf_counter() - tick_start) * 1000.0
+
+            # Várakozás a következő lépésig (a leállítás azonnal felébreszti)
+            self._stop_event.wait(max(0.0, self.step_dt - accumulator))
@@ -0,0 +1,141 @@
+# Háttérszálas Szimuláció Mérés - Panda3D Python
+#
+# A render ciklus képkocka idejének eloszlása (átlag, 99. percentilis, legnagyobb)
+# ugyanazzal a VertexDynamics szimulációval:
+#   - szinkron: a szimuláció a render ciklusban fut
+#   - szálas:   a SimulationThread lép, a render ciklus csak a dupla pufferből másol
+# Minden 50. szimulációs lépés mesterségesen túllépi a keretét (rövid kiugrás).
+# A kiugrás valódi CPU munka, két változatban:
+#   - python: tiszta Python ciklus, a GIL végig foglalt (a render szál csak a
+#     szálváltási intervallumokban jut szóhoz)
+#   - numpy:  nagy tömbműveletek, amelyek alatt a NumPy felszabadítja a GIL-t
+#
+# Használat: python SimulationThreadBenchmark.py [vertexek száma] [képkockák száma]
+
+import sys
+import time
+import numpy as np
+
+from VertexDynamics import VertexDynamics
+from SimulationThread import DoubleBuffer, SimulationThread
+
+FRAME_BUDGET = 1.0 / 60.0
+SPIKE_EVERY = 50
+SPIKE_SECONDS = 0.03
+SPIKE_KINDS = ('python', 'numpy')
+
+
+def python_work(iterations):
+    """Tiszta Python aritmetika (a GIL alatt)."""
+    total = 0.0
+    for i in range(iterations):
+        total += (i % 7) * 0.5
+    return total
+
+
+def numpy_work(array, iterations):
+    """Elemenkénti NumPy műveletek egy nagy tömbön (a GIL nélkül futnak)."""
+    for _ in range(iterations):
+        np.sin(array, out=array)
+        np.multiply(array, 1.5, out=array)
+    return array
+
+
+def calibrate(work, target_seconds):
+    """Hány iteráció tart nagyjából target_seconds ideig (egy szálon mérve)."""
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        work(iterations)
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_seconds / 4:
+            return max(1, int(iterations * target_seconds / elapsed))
+        iterations *= 2
+
+
+class SpikySimulation:
+    """A VertexDynamics lépése, időnként egy extra, CPU-igényes lépéssel."""
+
+    def __init__(self, count, spike):
+        self.dynamics = VertexDynamics.random(count, seed=1)
+        self.spike = spike
+        self.steps = 0
+
+    def step(self, dt):
+        self.dynamics.step(dt)
+        self.steps += 1
+        if self.steps % SPIKE_EVERY == 0:
+            self.spike()
+
+
+def render_work(positions, target):
+    """A render oldali munka helyettesítője: a pozíciók feltöltése egy bufferbe."""
+    np.copyto(target, positions)
+
+
+def frame_loop(frames, frame):
+    """
+    frame() képkockánként, FRAME_BUDGET ütemben. A képkocka ideje a tervezett
+    kezdéstől a munka végéig tart, így a késve ébredés (pl. a GIL-re várva) is
+    beleszámít, nem csak a frame() futása.
+    """
+    frame_times = []
+    scheduled = time.perf_counter()
+    for _ in range(frames):
+        frame()
+        end = time.perf_counter()
+        frame_times.append(end - scheduled)
+        scheduled = max(scheduled + FRAME_BUDGET, end)
+        time.sleep(max(0.0, scheduled - time.perf_counter()))
+    return np.array(frame_times) * 1000.0
+
+
+def run_sync(count, frames, spike):
+    sim = SpikySimulation(count, spike)
+    target = np.empty_like(sim.dynamics.positions)
+
+    def frame():
+        sim.step(FRAME_BUDGET)
+        render_work(sim.dynamics.positions, target)
+    return frame_loop(frames, frame)
+
+
+def run_threaded(count, frames, spike):
+    sim = SpikySimulation(count, spike)
+    target = np.empty_like(sim.dynamics.positions)
+    buffer = DoubleBuffer(positions=sim.dynamics.positions)
+    thread = SimulationThread(sim.step, lambda back: np.copyto(back['positions'], sim.dynamics.positions),
+                              buffer, rate=1.0 / FRAME_BUDGET)
+    thread.start()
+    frame_times = frame_loop(frames, lambda: buffer.consume(lambda front: render_work(front['positions'], target)))
+    thread.stop()
+    return frame_times, thread
+
+
+def report(kind, label, times):
+    print(f"{kind:<8} {label:<10} {times.mean():>9.3f} {np.percentile(times, 99):>9.3f} {times.max():>9.3f}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    scratch = np.random.default_rng(1).random(1 << 20)
+    spikes = {
+        'python': (python_work, calibrate(python_work, SPIKE_SECONDS)),
+        'numpy': (lambda n: numpy_work(scratch, n), calibrate(lambda n: numpy_work(scratch, n), SPIKE_SECONDS)),
+    }
+
+    print(f"{count} vertex, {frames} képkocka, minden {SPIKE_EVERY}. lépés +~{SPIKE_SECONDS * 1000:.0f} ms CPU munka")
+    print(f"{'kiugrás':<8} {'mód':<10} {'átlag ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for kind in SPIKE_KINDS:
+        work, iterations = spikes[kind]
+        spike = lambda: work(iterations)
+        report(kind, "szinkron", run_sync(count, frames, spike))
+        times, thread = run_threaded(count, frames, spike)
+        report(kind, "szálas", times)
+        print(f"{'':<8} szimulációs lépések: {thread.steps_done}, eldobott lépések: {thread.dropped_steps}")
+
+
+if __name__ == "__main__":
+    main()
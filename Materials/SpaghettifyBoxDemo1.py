@@ -2,15 +2,24 @@
 #
 # Egy kocka függőlegesen nyúlik (Z-tengelyen), miközben színe
 # vörösről feketére halványul a "spagettizálódás" illúzióját keltve.
+#
+# --threaded: az animáció (görbe mintavételezés) háttérszálon lép, a render
+# task csak a dupla pufferből olvassa a paramétereket (SimulationThread).
 
 import sys
 from direct.showbase.ShowBase import ShowBase
 from direct.task import Task
 from panda3d.core import (
-    Shader, VBase4, GeomVertexData, GeomVertexFormat, GeomVertexWriter, 
-    GeomTriangles, GeomNode, NodePath, Geom, AmbientLight, PointLight
+    Shader, VBase4, NodePath, AmbientLight, PointLight,
+    BoundingBox, Point3
 )
 import math 
+import numpy as np
+
+from MeshGenerators import create_cuboid_mesh
+from AnimationCurve import AnimationCurve, CurveTable, BEZIER
+from SimulationThread import DoubleBuffer, SimulationThread
+
 
 class SpaghettifyBoxDemo(ShowBase):
     def __init__(self):
@@ -35,13 +44,38 @@ class SpaghettifyBoxDemo(ShowBase):
         # 2. Shader Kód (Színátmenet vezérlése)
         # ------------------------------------------------
 
-        # Vertex Shader (Egyszerű transzformáció)
+        # Vertex Shader (Árapály deformáció a GPU-n)
+        # A nyúlás, a sugár szűkülése és a csavarás vertexenként számolódik,
+        # így a Python oldalon képkockánként csak egy uniform változik.
         vertex_shader = """
         #version 130
         uniform mat4 p3d_ModelViewProjectionMatrix;
+
+        // Tidal.x: nyúlás (1.0 = eredeti), Tidal.y: szűkülés a csúcs felé (0..1),
+        // Tidal.z: csavarás a teljes hosszon (radián), Tidal.w: fél hossz (objektum tér)
+        uniform vec4 Tidal;
+
         in vec4 p3d_Vertex;
+
         void main() {
-            gl_Position = p3d_ModelViewProjectionMatrix * p3d_Vertex;
+            vec3 p = p3d_Vertex.xyz;
+            float half_len = Tidal.w;
+
+            // 0.0 a talpnál, 1.0 a csúcson
+            float t = clamp((p.z + half_len) / (2.0 * half_len), 0.0, 1.0);
+
+            // Térfogatmegtartó vékonyodás, a csúcs felé további szűküléssel
+            float radius = inversesqrt(Tidal.x) * (1.0 - Tidal.y * t);
+            float angle = Tidal.z * t;
+            float c = cos(angle);
+            float s = sin(angle);
+            vec2 xy = p.xy * radius;
+            xy = vec2(c * xy.x - s * xy.y, s * xy.x + c * xy.y);
+
+            // Nyúlás a Z tengely mentén, a talp helyben marad
+            float z = -half_len + (p.z + half_len) * Tidal.x;
+
+            gl_Position = p3d_ModelViewProjectionMatrix * vec4(xy, z, 1.0);
         }
         """
 
@@ -84,11 +118,14 @@ class SpaghettifyBoxDemo(ShowBase):
         # ------------------------------------------------
         
         # A spagettizálódó kocka/rúd (Alapméret: 2x2x2)
-        initial_size = 2.0
-        self.box_geom = self._create_cuboid_mesh("spaghetti_box", initial_size, initial_size, initial_size)
+        self.initial_size = 2.0
+        self.box_geom = create_cuboid_mesh(
+            "spaghetti_box", self.initial_size, self.initial_size, self.initial_size,
+            x_segments=8, y_segments=8, z_segments=64
+        )
         self.box_np = NodePath(self.box_geom)
         self.box_np.reparent_to(self.render)
-        self.box_np.set_pos(0, 0, initial_size / 2.0) # Középre igazítás Z-ben
+        self.box_np.set_pos(0, 0, self.initial_size / 2.0) # Középre igazítás Z-ben
         
         if self.spaghetti_shader:
             self.box_np.set_shader(self.spaghetti_shader)
@@ -100,8 +137,38 @@ class SpaghettifyBoxDemo(ShowBase):
         self.current_stretch = 1.0
         self.max_stretch = 20.0
         self.stretch_speed = 4.0
+        self.max_taper = 0.7            # A csúcs sugara maximális nyúlásnál 30%-ra szűkül
+        self.max_twist = 2.0 * math.pi  # Egy teljes csavarás maximális nyúlásnál
+
+        # Animációs görbék (idő -> paraméter), egy közös táblázatba sütve.
+        # A képkockánkénti frissítés egyetlen vektorizált mintavételezés.
+        duration = (self.max_stretch - 1.0) / self.stretch_speed
+        self.anim_time = 0.0
+        self.curves = CurveTable([
+            # Nyúlás: lineáris, ugyanazzal a sebességgel, mint korábban
+            AnimationCurve([(0.0, 1.0), (duration, self.max_stretch)]),
+            # Vörös intenzitás: 1.0 -> 0.0
+            AnimationCurve([(0.0, 1.0), (duration, 0.0)]),
+            # Szűkülés és csavarás: lassan induló és lassan érkező Bezier
+            AnimationCurve([(0.0, 0.0, BEZIER), (duration, self.max_taper, BEZIER)]),
+            AnimationCurve([(0.0, 0.0, BEZIER), (duration, self.max_twist, BEZIER)]),
+        ], samples=256)
+
+        if self.spaghetti_shader:
+            self._apply_deformation(self.current_stretch, 0.0, 0.0)
+            # A vertex shader a node eredeti határain túlra mozgatja a vertexeket:
+            # a befoglaló dobozt a maximális nyúlásra állítjuk, hogy a culling ne vágja le
+            half = self.initial_size / 2.0
+            top = -half + self.initial_size * self.max_stretch
+            self.box_np.node().set_bounds(BoundingBox(Point3(-half, -half, -half), Point3(half, half, top)))
+            self.box_np.node().set_final(True)
 
         # Animációs ciklus indítása
+        self.sim_thread = None
+        self.threaded = '--threaded' in sys.argv
+        if self.threaded:
+            self._start_simulation_thread()
+            print("Az animáció háttérszálon fut (--threaded).")
         self.taskMgr.add(self.spaghettify_task, "SpaghettifyTask")
 
         self.messenger.send('aspectRatioChanged')
@@ -112,28 +179,35 @@ class SpaghettifyBoxDemo(ShowBase):
 
     def spaghettify_task(self, task):
         """Kezeli a nyúlást és a szín halványítását."""
-        dt = globalClock.getDt()
+        params = None
+        if self.sim_thread:
+            # Szálas mód: a legutóbb publikált (idő, paraméterek) átvétele, várakozás nélkül
+            if not self.sim_thread.buffer.consume(self._read_state):
+                return Task.cont # Nincs új állapot: a legutóbbi marad a képen
+            anim_time, params = self.published_time, self.published_params
+        else:
+            dt = globalClock.getDt()
 
-        # 1. Nyújtás/Visszaállás
-        self.current_stretch += self.stretch_speed * dt
+            # 1. Nyújtás/Visszaállás (az animációs idő léptetése)
+            self.anim_time += dt
+            anim_time = self.anim_time
         
-        if self.current_stretch >= self.max_stretch:
+        if anim_time >= self.curves.end:
             self.current_stretch = self.max_stretch
-            # Az animáció befejezésekor megállítjuk a task-ot, amíg újra nem indítjuk
+            # Az animáció befejezésekor megállítjuk a task-ot (és a szálat), amíg újra nem indítjuk
+            self._stop_simulation_thread()
             return Task.done
         
-        # Skála alkalmazása (csak Z tengelyen)
-        self.box_np.set_scale(1.0, 1.0, self.current_stretch)
-        # Középre igazítás (hogy felfelé nyúljon a talajtól)
-        self.box_np.set_z(self.current_stretch / 2.0) 
+        # Minden animált paraméter egyetlen táblázat-mintavételezésből
+        if params is None:
+            params = self.curves.sample(anim_time)
+        stretch, red_intensity, taper, twist = params.tolist()
+        self.current_stretch = stretch
+
+        # Deformáció alkalmazása (shaderrel a GPU-n, különben Z skálázással)
+        self._apply_deformation(stretch, taper, twist)
 
         # 2. Szín Halványítása (Vörösről Feketére)
-        # 0.0 (kezdeti nyúlás) és 1.0 (maximális nyúlás) közötti normalizált érték
-        normalized_stretch = (self.current_stretch - 1.0) / (self.max_stretch - 1.0)
-        
-        # A vörös intenzitás csökken, ahogy a nyúlás nő (1.0 -> 0.0)
-        red_intensity = max(0.0, 1.0 - normalized_stretch) 
-        
         if self.spaghetti_shader:
             self.box_np.set_shader_input("RedIntensity", red_intensity)
 
@@ -141,9 +215,13 @@ class SpaghettifyBoxDemo(ShowBase):
 
     def reset_animation(self):
         """Visszaállítja a kockát az eredeti állapotába és újraindítja az animációt."""
+        # A futó szál (animáció közbeni újraindítás) leáll, így az idő szabadon írható
+        self._stop_simulation_thread()
+        self.anim_time = 0.0
+        if self.threaded:
+            self._start_simulation_thread()
         self.current_stretch = 1.0
-        self.box_np.set_scale(1.0, 1.0, self.current_stretch)
-        self.box_np.set_z(self.box_np.get_scale()[2] / 2.0)
+        self._apply_deformation(self.current_stretch, 0.0, 0.0)
         if self.spaghetti_shader:
             self.box_np.set_shader_input("RedIntensity", 1.0)
         
@@ -151,6 +229,58 @@ class SpaghettifyBoxDemo(ShowBase):
         if not self.taskMgr.hasTaskNamed("SpaghettifyTask"):
              self.taskMgr.add(self.spaghettify_task, "SpaghettifyTask")
              
+    def _apply_deformation(self, stretch, taper, twist):
+        """A nyúlás alkalmazása: shaderrel a GPU deformál, különben a node skálázódik."""
+        if self.spaghetti_shader:
+            # Egyetlen uniform: (nyúlás, szűkülés, csavarás, fél hossz)
+            self.box_np.set_shader_input("Tidal", VBase4(
+                stretch,
+                taper,
+                twist,
+                self.initial_size / 2.0
+            ))
+        else:
+            # Skála alkalmazása (csak Z tengelyen)
+            self.box_np.set_scale(1.0, 1.0, stretch)
+            # Középre igazítás (hogy felfelé nyúljon a talajtól)
+            self.box_np.set_z(stretch / 2.0)
+
+    # ------------------------------------------------
+    # Háttérszálas animáció (--threaded)
+    # ------------------------------------------------
+
+    def _start_simulation_thread(self):
+        """Az animációs idő léptetése és a görbe mintavételezés háttérszálon."""
+        buffer = DoubleBuffer(
+            time=np.zeros(1),
+            params=self.curves.sample(0.0),
+        )
+        self.published_time = 0.0
+        self.published_params = None
+        self.sim_thread = SimulationThread(self._simulate_step, self._snapshot_state, buffer, rate=60.0)
+        self.sim_thread.start()
+
+    def _stop_simulation_thread(self):
+        """A szimulációs szál leállítása (az animáció végén vagy újraindítás előtt)."""
+        if self.sim_thread:
+            self.sim_thread.stop()
+            self.sim_thread = None
+
+    def _simulate_step(self, dt):
+        """Egy animációs lépés a szimulációs szálon (a görbe végén megáll)."""
+        if self.anim_time < self.curves.end:
+            self.anim_time += dt
+
+    def _snapshot_state(self, back):
+        """Az animációs idő és a mintavételezett paraméterek a hátsó pufferbe."""
+        back['time'][0] = self.anim_time
+        back['params'][:] = self.curves.sample(self.anim_time)
+
+    def _read_state(self, front):
+        """A publikált állapot átvétele a render szálon (a puffer zárja alatt)."""
+        self.published_time = float(front['time'][0])
+        self.published_params = front['params'].copy()
+
     # ------------------------------------------------
     # 6. Segéd függvények (Shader és Mesh generátor)
     # ------------------------------------------------
@@ -167,10 +297,9 @@ class SpaghettifyBoxDemo(ShowBase):
             )
         except AttributeError:
             try:
-                # Visszaesés a régebbi SL_GLSL konstansra
-                from panda3d.core import SL_GLSL
-                shader = Shader.load_source(SL_GLSL, vertex_s, fragment_s)
-            except (AttributeError, ImportError) as e:
+                # Visszaesés a Panda3D 1.10-es Shader.SL_GLSL konstansra
+                shader = Shader.make(Shader.SL_GLSL, vertex_s, fragment_s)
+            except AttributeError as e:
                 print(f"HIBA: A shader konstansai ('L_glsl'/'SL_GLSL') nem elérhetők. Hiba: {e}")
                 shader = None
         except Exception as e:
@@ -178,49 +307,6 @@ class SpaghettifyBoxDemo(ShowBase):
             shader = None
         return shader
 
-    def _create_cuboid_mesh(self, name, x_size, y_size, z_size):
-        """Téglatest mesh generálása egyedi méretekkel (X, Y, Z)."""
-        format = GeomVertexFormat.get_v3n3() # pozíció és normál
-        vdata = GeomVertexData(name, format, Geom.UHDynamic)
-        
-        vertex = GeomVertexWriter(vdata, 'vertex')
-        normal = GeomVertexWriter(vdata, 'normal')
-        
-        sx, sy, sz = x_size / 2.0, y_size / 2.0, z_size / 2.0
-        
-        # A téglatest vertexei
-        verts = [
-            (-sx, -sy, -sz), (sx, -sy, -sz), (sx, sy, -sz), (-sx, sy, -sz), # Alsó lap
-            (-sx, -sy, sz), (sx, -sy, sz), (sx, sy, sz), (-sx, sy, sz)    # Felső lap
-        ]
-        
-        # Lapok (indexek) és normálok
-        faces = [
-            (0, 3, 2, 0, 2, 1, (0, 0, -1)), # Alsó
-            (4, 5, 6, 4, 6, 7, (0, 0, 1)),  # Felső
-            (0, 4, 7, 0, 7, 3, (-1, 0, 0)), # Bal
-            (1, 2, 6, 1, 6, 5, (1, 0, 0)),  # Jobb
-            (0, 1, 5, 0, 5, 4, (0, -1, 0)), # Hátsó
-            (3, 7, 6, 3, 6, 2, (0, 1, 0))   # Első
-        ]
-
-        prim = GeomTriangles(Geom.UHDynamic)
-        
-        vdata_index = 0
-        for face in faces:
-            for i in face[:6]:
-                vertex.add_data3f(verts[i])
-                normal.add_data3f(face[6]) 
-                prim.add_vertex(vdata_index)
-                vdata_index += 1
-
-        geom = Geom(vdata)
-        geom.add_primitive(prim)
-        
-        node = GeomNode(name)
-        node.add_geom(geom)
-        return node
-
 
 demo = SpaghettifyBoxDemo()
 demo.run()
\ No newline at end of file
@@ -3,45 +3,33 @@
 # Egy kocka függőlegesen nyúlik (Z-tengelyen), miközben színe
 # vörösről feketére halványul a "spagettizálódás" illúzióját keltve.
 # Kiegészítve kis sárga részecskékkel a nyúló objektum körül.
+#
+# --threaded: az animáció (görbe mintavételezés) háttérszálon lép, a render
+# task csak a dupla pufferből olvassa a paramétereket (SimulationThread).
 
 import sys
 from direct.showbase.ShowBase import ShowBase
 from direct.task import Task
 from panda3d.core import (
-    Shader, VBase4, GeomVertexData, GeomVertexFormat, GeomVertexWriter, 
-    GeomTriangles, GeomNode, NodePath, Geom, AmbientLight, PointLight,
-    Texture, TextureStage, TransparencyAttrib, AlphaTestAttrib # Tiszta core importok
+    Shader, VBase4, NodePath, AmbientLight, PointLight,
+    BoundingBox, Point3 # Tiszta core importok
 )
 
 import math 
+import numpy as np
+
+from MeshGenerators import create_cuboid_mesh
+from AnimationCurve import AnimationCurve, CurveTable, BEZIER
+from SimulationThread import DoubleBuffer, SimulationThread
+from ParticleBinding import ParticleEffectBinding
 
 # ----------------------------------------------------------------------
-# HIBAKEZELÉS: Részecske Rendszer Importálása
+# HIBAKEZELÉS: Részecske Rendszer (lusta) Importálása
 # ----------------------------------------------------------------------
-PARTICLES_AVAILABLE = False
-try:
-    from direct.particles.Particles import Particles
-    from direct.particles.ParticleEffect import ParticleEffect
-    from direct.particles.ParticleEmitter import ParticleEmitter
-    from direct.particles.PointParticleFactory import PointParticleFactory
-    from direct.particles.LinearNoiseForce import LinearNoiseForce
-    from direct.particles.ColorInterpolationParticleRenderer import ColorInterpolationParticleRenderer
-    # ColorRamp a core-ban van, de külön ellenőriztük a korábbi hibákat
-    from panda3d.core import ColorRamp
-    PARTICLES_AVAILABLE = True
-except ImportError as e:
-    print(f"Figyelem: Részecske modul importálási hiba: {e}. A részecske effekt nem lesz elérhető.")
-    # Ha ColorRamp hibázik, használjuk a helyettesítő osztályt, de a fő flag FALSE marad
-    try:
-        from panda3d.core import ColorRamp
-    except ImportError:
-        class ColorRamp:
-            def __init__(self):
-                pass
-            def addComponent(self, color, value):
-                pass
-except AttributeError as e:
-     print(f"Figyelem: Panda3D attribútum hiba a részecske modulokban: {e}. A részecske effekt nem lesz elérhető.")
+# A direct.particles modulok csak az első használatkor töltődnek be
+# (particle_subsystem.available), a hibatűrő jelzés megmarad. Az effektek a
+# ParticleTemplates közös sablonjainak klónjai (megosztott textúra és színátmenet).
+from ParticleTemplates import default_registry
 
 class SpaghettifyBoxDemo(ShowBase):
     def __init__(self):
@@ -66,13 +54,38 @@ class SpaghettifyBoxDemo(ShowBase):
         # 2. Shader Kód (Színátmenet vezérlése)
         # ------------------------------------------------
 
-        # Vertex Shader (Egyszerű transzformáció)
+        # Vertex Shader (Árapály deformáció a GPU-n)
+        # A nyúlás, a sugár szűkülése és a csavarás vertexenként számolódik,
+        # így a Python oldalon képkockánként csak egy uniform változik.
         vertex_shader = """
         #version 130
         uniform mat4 p3d_ModelViewProjectionMatrix;
+
+        // Tidal.x: nyúlás (1.0 = eredeti), Tidal.y: szűkülés a csúcs felé (0..1),
+        // Tidal.z: csavarás a teljes hosszon (radián), Tidal.w: fél hossz (objektum tér)
+        uniform vec4 Tidal;
+
         in vec4 p3d_Vertex;
+
         void main() {
-            gl_Position = p3d_ModelViewProjectionMatrix * p3d_Vertex;
+            vec3 p = p3d_Vertex.xyz;
+            float half_len = Tidal.w;
+
+            // 0.0 a talpnál, 1.0 a csúcson
+            float t = clamp((p.z + half_len) / (2.0 * half_len), 0.0, 1.0);
+
+            // Térfogatmegtartó vékonyodás, a csúcs felé további szűküléssel
+            float radius = inversesqrt(Tidal.x) * (1.0 - Tidal.y * t);
+            float angle = Tidal.z * t;
+            float c = cos(angle);
+            float s = sin(angle);
+            vec2 xy = p.xy * radius;
+            xy = vec2(c * xy.x - s * xy.y, s * xy.x + c * xy.y);
+
+            // Nyúlás a Z tengely mentén, a talp helyben marad
+            float z = -half_len + (p.z + half_len) * Tidal.x;
+
+            gl_Position = p3d_ModelViewProjectionMatrix * vec4(xy, z, 1.0);
         }
         """
 
@@ -116,7 +129,10 @@ class SpaghettifyBoxDemo(ShowBase):
         
         # A spagettizálódó kocka/rúd (Alapméret: 2x2x2)
         self.initial_size = 2.0
-        self.box_geom = self._create_cuboid_mesh("spaghetti_box", self.initial_size, self.initial_size, self.initial_size)
+        self.box_geom = create_cuboid_mesh(
+            "spaghetti_box", self.initial_size, self.initial_size, self.initial_size,
+            x_segments=8, y_segments=8, z_segments=64
+        )
         self.box_np = NodePath(self.box_geom)
         self.box_np.reparent_to(self.render)
         self.box_np.set_pos(0, 0, self.initial_size / 2.0) # Középre igazítás Z-ben
@@ -131,15 +147,51 @@ class SpaghettifyBoxDemo(ShowBase):
         self.particle_effect = self._create_particles(self.box_np)
         
         # Inicializáljuk a partikula rendszert, ha elérhető
+        self.particle_binding = None
         if self.particle_effect:
             self.particle_effect.disable() # Kezdetben inaktív
+            # Emitter/factory egyszeri feloldása; a task csak változáskor ír a C++ objektumokba
+            self.particle_binding = ParticleEffectBinding(self.particle_effect)
+            self.particle_binding.bind('lifespan_base', epsilon=0.01)
         
         # Animációs változók
         self.current_stretch = 1.0
         self.max_stretch = 20.0
         self.stretch_speed = 4.0
+        self.max_taper = 0.7            # A csúcs sugara maximális nyúlásnál 30%-ra szűkül
+        self.max_twist = 2.0 * math.pi  # Egy teljes csavarás maximális nyúlásnál
+
+        # Animációs görbék (idő -> paraméter), egy közös táblázatba sütve.
+        # A képkockánkénti frissítés egyetlen vektorizált mintavételezés.
+        duration = (self.max_stretch - 1.0) / self.stretch_speed
+        self.anim_time = 0.0
+        self.curves = CurveTable([
+            # Nyúlás: lineáris, ugyanazzal a sebességgel, mint korábban
+            AnimationCurve([(0.0, 1.0), (duration, self.max_stretch)]),
+            # Vörös intenzitás: 1.0 -> 0.0
+            AnimationCurve([(0.0, 1.0), (duration, 0.0)]),
+            # Szűkülés és csavarás: lassan induló és lassan érkező Bezier
+            AnimationCurve([(0.0, 0.0, BEZIER), (duration, self.max_taper, BEZIER)]),
+            AnimationCurve([(0.0, 0.0, BEZIER), (duration, self.max_twist, BEZIER)]),
+            # Partikula élettartam (2.0 s -> 0.5 s, a vörös intenzitással együtt halványul)
+            AnimationCurve([(0.0, 2.0), (duration, 0.5)]),
+        ], samples=256)
+
+        if self.spaghetti_shader:
+            self._apply_deformation(self.current_stretch, 0.0, 0.0)
+            # A vertex shader a node eredeti határain túlra mozgatja a vertexeket:
+            # a befoglaló dobozt a maximális nyúlásra állítjuk, hogy a culling ne vágja le
+            half = self.initial_size / 2.0
+            top = -half + self.initial_size * self.max_stretch
+            self.box_np.node().set_bounds(BoundingBox(Point3(-half, -half, -half), Point3(half, half, top)))
+            self.box_np.node().set_final(True)
 
         # Animációs ciklus indítása
+        self.sim_thread = None
+        self.threaded = '--threaded' in sys.argv
+        if self.threaded:
+            self._start_simulation_thread()
+            print("Az animáció háttérszálon fut (--threaded).")
         self.taskMgr.add(self.spaghettify_task, "SpaghettifyTask")
         if self.particle_effect:
             self.particle_effect.start() # Indítás a task-kal együtt
@@ -152,139 +204,143 @@ class SpaghettifyBoxDemo(ShowBase):
 
     def spaghettify_task(self, task):
         """Kezeli a nyúlást és a szín halványítását."""
-        dt = globalClock.getDt()
+        params = None
+        if self.sim_thread:
+            # Szálas mód: a legutóbb publikált (idő, paraméterek) átvétele, várakozás nélkül
+            if not self.sim_thread.buffer.consume(self._read_state):
+                return Task.cont # Nincs új állapot: a legutóbbi marad a képen
+            anim_time, params = self.published_time, self.published_params
+        else:
+            dt = globalClock.getDt()
 
-        # 1. Nyújtás/Visszaállás
-        self.current_stretch += self.stretch_speed * dt
+            # 1. Nyújtás/Visszaállás (az animációs idő léptetése)
+            self.anim_time += dt
+            anim_time = self.anim_time
         
-        if self.current_stretch >= self.max_stretch:
+        if anim_time >= self.curves.end:
             self.current_stretch = self.max_stretch
             if self.particle_effect:
                 self.particle_effect.softStop() # Partikula effektek fokozatos leállítása
+            self._stop_simulation_thread() # A szál se publikáljon tovább, amíg újra nem indul
             return Task.done
         
-        # Skála alkalmazása (csak Z tengelyen)
-        self.box_np.set_scale(1.0, 1.0, self.current_stretch)
-        # Középre igazítás (hogy felfelé nyúljon a talajtól)
-        self.box_np.set_z(self.current_stretch / 2.0) 
+        # Minden animált paraméter egyetlen táblázat-mintavételezésből
+        if params is None:
+            params = self.curves.sample(anim_time)
+        stretch, red_intensity, taper, twist, lifespan = params.tolist()
+        self.current_stretch = stretch
+
+        # Deformáció alkalmazása (shaderrel a GPU-n, különben Z skálázással)
+        self._apply_deformation(stretch, taper, twist)
 
         # 2. Szín Halványítása (Vörösről Feketére)
-        # 0.0 (kezdeti nyúlás) és 1.0 (maximális nyúlás) közötti normalizált érték
-        normalized_stretch = (self.current_stretch - 1.0) / (self.max_stretch - 1.0)
-        
-        # A vörös intenzitás csökken, ahogy a nyúlás nő (1.0 -> 0.0)
-        red_intensity = max(0.0, 1.0 - normalized_stretch) 
-        
         if self.spaghetti_shader:
             self.box_np.set_shader_input("RedIntensity", red_intensity)
 
         # 3. Partikula emitter pozíciójának frissítése (a nyúló objektum követése)
         if self.particle_effect:
             # Csak a Z pozíciót állítjuk, hogy a rúd tetején maradjon az emitter
-            emitter_z = self.box_np.get_z() + (self.initial_size / 2.0) * self.current_stretch
-            self.particle_effect.setPos(0, 0, emitter_z)
+            emitter_z = self._get_top_z()
+            self.particle_binding.set_pos(0, 0, emitter_z)
             
             # Partikula kibocsátás sebességének beállítása (halványul, ahogy nyúlik)
-            emitter = self.particle_effect.getEmitters()[0].getFactory()
-            emitter.setLifespanBase(0.5 + 1.5 * red_intensity) # Az élettartam is csökkenhet
+            self.particle_binding.set('lifespan_base', lifespan) # Az élettartam is csökkenhet
 
         return Task.cont
 
     def reset_animation(self):
         """Visszaállítja a kockát az eredeti állapotába és újraindítja az animációt."""
+        # A futó szál (animáció közbeni újraindítás) leáll, így az idő szabadon írható
+        self._stop_simulation_thread()
+        self.anim_time = 0.0
+        if self.threaded:
+            self._start_simulation_thread()
         self.current_stretch = 1.0
-        self.box_np.set_scale(1.0, 1.0, self.current_stretch)
-        self.box_np.set_z(self.initial_size / 2.0)
+        self._apply_deformation(self.current_stretch, 0.0, 0.0)
         if self.spaghetti_shader:
             self.box_np.set_shader_input("RedIntensity", 1.0)
         
         # Partikula újraindítása
         if self.particle_effect:
-            emitter_z = self.box_np.get_z() + self.initial_size / 2.0
-            self.particle_effect.setPos(0, 0, emitter_z)
+            emitter_z = self._get_top_z()
+            self.particle_binding.invalidate()
+            self.particle_binding.set_pos(0, 0, emitter_z)
             self.particle_effect.start() 
         
         # Újraindítja a task-ot, ha már befejeződött
         if not self.taskMgr.hasTaskNamed("SpaghettifyTask"):
              self.taskMgr.add(self.spaghettify_task, "SpaghettifyTask")
              
+    def _apply_deformation(self, stretch, taper, twist):
+        """A nyúlás alkalmazása: shaderrel a GPU deformál, különben a node skálázódik."""
+        if self.spaghetti_shader:
+            # Egyetlen uniform: (nyúlás, szűkülés, csavarás, fél hossz)
+            self.box_np.set_shader_input("Tidal", VBase4(
+                stretch,
+                taper,
+                twist,
+                self.initial_size / 2.0
+            ))
+        else:
+            # Skála alkalmazása (csak Z tengelyen)
+            self.box_np.set_scale(1.0, 1.0, stretch)
+            # Középre igazítás (hogy felfelé nyúljon a talajtól)
+            self.box_np.set_z(stretch / 2.0)
+
+    def _get_top_z(self):
+        """A nyúló rúd csúcsának Z pozíciója (ide kerül a partikula emitter)."""
+        if self.spaghetti_shader:
+            # A shader a talpat helyben hagyja, a csúcs a nyúlással arányosan emelkedik
+            base_z = self.box_np.get_z() - self.initial_size / 2.0
+            return base_z + self.initial_size * self.current_stretch
+        return self.box_np.get_z() + (self.initial_size / 2.0) * self.current_stretch
+
     # ------------------------------------------------
-    # 6. Segéd függvények (Shader és Mesh generátor)
+    # Háttérszálas animáció (--threaded)
     # ------------------------------------------------
 
-    def _create_particles(self, parent_np):
-        """Partikula effekt létrehozása sárga szikrákhoz."""
-        
-        if not PARTICLES_AVAILABLE:
-            return None # Partikula rendszer nem elérhető
-            
-        p = ParticleEffect()
-        p.setRenderParent(self.render)
-        p.setSystemLifespan(0.0)
-        p.setPos(parent_np.get_pos()) # Kezdő pozíció
-        
-        # Konfigurálja az 'Particles' objektumot
-        particles = Particles()
-        particles.setRenderParent(self.render) 
-        particles.setPoolSize(500)
-        particles.setBirthRate(0.01) # Gyors kibocsátás
+    def _start_simulation_thread(self):
+        """Az animációs idő léptetése és a görbe mintavételezés háttérszálon."""
+        buffer = DoubleBuffer(
+            time=np.zeros(1),
+            params=self.curves.sample(0.0),
+        )
+        self.published_time = 0.0
+        self.published_params = None
+        self.sim_thread = SimulationThread(self._simulate_step, self._snapshot_state, buffer, rate=60.0)
+        self.sim_thread.start()
+
+    def _stop_simulation_thread(self):
+        """A szimulációs szál leállítása (az animáció végén vagy újraindítás előtt)."""
+        if self.sim_thread:
+            self.sim_thread.stop()
+            self.sim_thread = None
+
+    def _simulate_step(self, dt):
+        """Egy animációs lépés a szimulációs szálon (a görbe végén megáll)."""
+        if self.anim_time < self.curves.end:
+            self.anim_time += dt
+
+    def _snapshot_state(self, back):
+        """Az animációs idő és a mintavételezett paraméterek a hátsó pufferbe."""
+        back['time'][0] = self.anim_time
+        back['params'][:] = self.curves.sample(self.anim_time)
+
+    def _read_state(self, front):
+        """A publikált állapot átvétele a render szálon (a puffer zárja alatt)."""
+        self.published_time = float(front['time'][0])
+        self.published_params = front['params'].copy()
 
-        # RENDERER LÉTREHOZÁSA ÉS TEXTÚRA BIZTOSÍTÁSA (JAVÍTÁS)
-        
-        # 1. Textúra létrehozása (1x1 fehér pont, Panda3D-kompatibilisen)
-        p_texture = Texture()
-        # Állítsuk be a textúrát 1x1-es méretű, RGBA formátumú fehérre
-        p_texture.setup_2d_texture(1, 1, Texture.T_unsigned_byte, Texture.F_rgba)
-        p_texture.setRamImage(b'\xff\xff\xff\xff') # Fehér (R, G, B, A = 255, 255, 255, 255)
-
-        # 2. Renderer beállítása (Color Interpolation)
-        renderer = ColorInterpolationParticleRenderer()
-        renderer.setUserAlpha(1.0)
-        renderer.setTexture(p_texture) # Az új, generált textúra használata
-        
-        # Színátmenet: Sárga -> Narancs -> Fekete
-        color_ramp = ColorRamp() 
-        color_ramp.addComponent(VBase4(1.0, 1.0, 0.0, 1.0), 0.0) # Sárga
-        color_ramp.addComponent(VBase4(1.0, 0.5, 0.0, 0.5), 0.5) # Narancs (átlátszó)
-        color_ramp.addComponent(VBase4(0.0, 0.0, 0.0, 0.0), 1.0) # Fekete (teljesen átlátszó)
-        renderer.setColorRamp(color_ramp)
-        
-        renderer.setXScaleFlag(True)
-        renderer.setYScaleFlag(True)
-        renderer.setInitialXScale(0.2)
-        renderer.setFinalXScale(0.05)
-        renderer.setInitialYScale(0.2)
-        renderer.setFinalYScale(0.05)
-        
-        particles.setRenderer(renderer)
-        # Blending beállítása az áttetszőséghez
-        particles.setAttrib(TransparencyAttrib.make(TransparencyAttrib.M_alpha))
-        # particles.setAttrib(AlphaTestAttrib.make(AlphaTestAttrib.M_greater, 0.0)) # Ezt eltávolítjuk
-        
-        # Factory beállítása (Részecskék tulajdonságai)
-        factory = PointParticleFactory()
-        factory.setLifespanBase(1.0)
-        factory.setLifespanSpread(0.2)
-        factory.setMassBase(1.0)
-        factory.setTerminalVelocityBase(0.1)
-        
-        # Emitter beállítása (Honnan sugároz)
-        emitter = ParticleEmitter()
-        emitter.setEmissionType(emitter.ET_sphere) # Gömb alakú kibocsátás
-        emitter.setAmplitudeSpread(0.5)
-        emitter.setRadius(2.0) # A rúd körül
-        emitter.setExplicitLaunchVector(VBase4(0.0, 0.0, 0.0, 0.0))
-        emitter.setLaunchAngle(emitter.LAV_up)
-        emitter.setLaunchBand(10.0)
-        emitter.setEmissionVolume(emitter.EV_sphere)
-        
-        # Hozzáadjuk a factory-t és az emittert a rendszerhez
-        particles.setFactory(factory)
-        particles.setEmitter(emitter)
+    # ------------------------------------------------
+    # 6. Segéd függvények (Shader és Mesh generátor)
+    # ------------------------------------------------
 
-        # Hozzáadjuk a részecske rendszerhez az effektet
-        p.addParticles(particles)
-        
+    def _create_particles(self, parent_np):
+        """Partikula effekt létrehozása sárga szikrákhoz (a közös sablon klónja)."""
+        p = default_registry.clone("yellow_spark", "spaghetti_sparks", self.render)
+        if p is not None:
+            self.enableParticles() # A részecske és fizika kezelő feladatai
+            p.setPos(parent_np.get_pos()) # Kezdő pozíció
         return p
 
 
@@ -300,10 +356,9 @@ class SpaghettifyBoxDemo(ShowBase):
             )
         except AttributeError:
             try:
-                # Visszaesés a régebbi SL_GLSL konstansra
-                from panda3d.core import SL_GLSL
-                shader = Shader.load_source(SL_GLSL, vertex_s, fragment_s)
-            except (AttributeError, ImportError) as e:
+                # Visszaesés a Panda3D 1.10-es Shader.SL_GLSL konstansra
+                shader = Shader.make(Shader.SL_GLSL, vertex_s, fragment_s)
+            except AttributeError as e:
                 print(f"HIBA: A shader konstansai ('L_glsl'/'SL_GLSL') nem elérhetők. Hiba: {e}")
                 shader = None
         except Exception as e:
@@ -311,49 +366,6 @@ class SpaghettifyBoxDemo(ShowBase):
             shader = None
         return shader
 
-    def _create_cuboid_mesh(self, name, x_size, y_size, z_size):
-        """Téglatest mesh generálása egyedi méretekkel (X, Y, Z)."""
-        format = GeomVertexFormat.get_v3n3() # pozíció és normál
-        vdata = GeomVertexData(name, format, Geom.UHDynamic)
-        
-        vertex = GeomVertexWriter(vdata, 'vertex')
-        normal = GeomVertexWriter(vdata, 'normal')
-        
-        sx, sy, sz = x_size / 2.0, y_size / 2.0, z_size / 2.0
-        
-        # A téglatest vertexei
-        verts = [
-            (-sx, -sy, -sz), (sx, -sy, -sz), (sx, sy, -sz), (-sx, sy, -sz), # Alsó lap
-            (-sx, -sy, sz), (sx, -sy, sz), (sx, sy, sz), (-sx, sy, sz)    # Felső lap
-        ]
-        
-        # Lapok (indexek) és normálok
-        faces = [
-            (0, 3, 2, 0, 2, 1, (0, 0, -1)), # Alsó
-            (4, 5, 6, 4, 6, 7, (0, 0, 1)),  # Felső
-            (0, 4, 7, 0, 7, 3, (-1, 0, 0)), # Bal
-            (1, 2, 6, 1, 6, 5, (1, 0, 0)),  # Jobb
-            (0, 1, 5, 0, 5, 4, (0, -1, 0)), # Hátsó
-            (3, 7, 6, 3, 6, 2, (0, 1, 0))   # Első
-        ]
-
-        prim = GeomTriangles(Geom.UHDynamic)
-        
-        vdata_index = 0
-        for face in faces:
-            for i in face[:6]:
-                vertex.add_data3f(verts[i])
-                normal.add_data3f(face[6]) 
-                prim.add_vertex(vdata_index)
-                vdata_index += 1
-
-        geom = Geom(vdata)
-        geom.add_primitive(prim)
-        
-        node = GeomNode(name)
-        node.add_geom(geom)
-        return node
-
 
 demo = SpaghettifyBoxDemo()
 demo.run()
\ No newline at end of file
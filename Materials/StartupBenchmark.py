@@ -0,0 +1,92 @@
+# Indítási Idő Mérés - Panda3D Python
+#
+# Minden demót külön, friss Python folyamatban indít el (offscreen ablakkal),
+# és méri a hideg indítás idejét az első kirajzolt képkockáig. Kiírja azt is,
+# hogy a nehéz alrendszerek (részecskék, intervallumok, DirectGUI) betöltődtek-e,
+# így látszik, mit spórol a LazyImports réteg.
+# Összehasonlításként megméri a korábbi, modul szintű részecske importok költségét.
+#
+# Használat: python StartupBenchmark.py [ismétlésszám] [demó fájlok...]
+
+import os
+import subprocess
+import sys
+import glob
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# A gyermek folyamat: a ShowBase.run helyett egy képkockát léptet, majd kilép
+LAUNCHER = r"""
+import os, sys, time, runpy
+start = time.perf_counter()
+from panda3d.core import loadPrcFileData
+loadPrcFileData('', 'window-type offscreen\naudio-library-name null\nnotify-level fatal')
+from direct.showbase import ShowBase as showbase_module
+
+def first_frame_then_exit(self):
+    self.taskMgr.step()
+    elapsed = time.perf_counter() - start
+    loaded = [name for name in ('direct.particles', 'direct.interval', 'direct.gui')
+              if any(m == name or m.startswith(name + '.') for m in sys.modules)]
+    print('RESULT %.6f %d %s' % (elapsed, len(sys.modules), ','.join(loaded) or '-'), flush=True)
+    os._exit(0)
+
+showbase_module.ShowBase.run = first_frame_then_exit
+path = sys.argv[1]
+sys.path.insert(0, os.path.dirname(path))
+sys.argv = [path]
+runpy.run_path(path, run_name='__main__')
+"""
+
+# A korábbi, modul szintű (eager) részecske importok költsége
+EAGER_IMPORTS = r"""
+import time
+start = time.perf_counter()
+import LazyImports
+lazy = time.perf_counter() - start
+start = time.perf_counter()
+# Ugyanazok a modulok, mint a particle_subsystem első használatakor
+if not LazyImports.particle_subsystem.available:
+    raise SystemExit('A részecske alrendszer nem tölthető be')
+eager = time.perf_counter() - start
+print('RESULT %.6f %.6f' % (eager, lazy), flush=True)
+"""
+
+
+def run_child(code, *args):
+    """Gyermek folyamat futtatása; a RESULT sor mezőit adja vissza."""
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=HERE, capture_output=True, text=True, timeout=120
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return line.split()[1:]
+    raise RuntimeError(f"A mérés nem futott le: {result.stderr.strip()[-500:]}")
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    demos = sys.argv[2:] or sorted(glob.glob(os.path.join(HERE, "*Demo*.py")))
+
+    print("--- MODUL SZINTŰ IMPORTOK (friss folyamat) ---")
+    eager, lazy = zip(*(map(float, run_child(EAGER_IMPORTS)) for _ in range(repeats)))
+    print(f"Részecske modulok azonnal: {min(eager) * 1000:8.1f} ms")
+    print(f"LazyImports betöltése:     {min(lazy) * 1000:8.1f} ms")
+    print()
+
+    print("--- HIDEG INDÍTÁS AZ ELSŐ KÉPKOCKÁIG ---")
+    print(f"{'demó':<32} {'idő (ms)':>10} {'modulok':>8}  betöltött alrendszerek")
+    for demo in demos:
+        path = os.path.abspath(demo)
+        try:
+            runs = [run_child(LAUNCHER, path) for _ in range(repeats)]
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"{os.path.basename(path):<32} HIBA: {e}")
+            continue
+        best = min(runs, key=lambda r: float(r[0]))
+        print(f"{os.path.basename(path):<32} {float(best[0]) * 1000:>10.1f} {best[1]:>8}  {best[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Vektorizált Vertex Dinamika (Struct-of-Arrays) - Panda3D Python
+#
+# A MovingCubeParticlesDemo a vertexeket dict-ek listájában tárolta (LVector3f
+# pozíció és sebesség), és vertexenként Python ciklusban integrált, majd
+# .length() hívással ellenőrizte a max_dist határt. Itt a pozíciók és a
+# sebességek egy-egy (N, 3) float32 tömbben vannak, és egy lépés (integrálás,
+# határ teszt, visszapattanás) néhány numpy művelet az összes vertexre.
+# Ugyanez a kód hajt 8 vagy 100 000 vertexet.
+
+import numpy as np
+
+
+class VertexDynamics:
+    """
+    N vertex pozíciója és sebessége (N, 3) tömbökben. A step() a center körüli
+    max_dist sugarú gömbön kívülre jutott vertexek sebességét megfordítja.
+    """
+
+    def __init__(self, positions, velocities, center=(0.0, 0.0, 0.0), max_dist=6.0):
+        self.positions = np.array([tuple(p) for p in positions] if not isinstance(positions, np.ndarray)
+                                  else positions, dtype=np.float32).reshape(-1, 3)
+        self.velocities = np.array([tuple(v) for v in velocities] if not isinstance(velocities, np.ndarray)
+                                   else velocities, dtype=np.float32).reshape(-1, 3)
+        self.center = np.asarray(tuple(center), dtype=np.float32)
+        self.max_dist = float(max_dist)
+
+        # Előre lefoglalt munkatömbök (a lépés nem allokál új tömböt)
+        count = len(self.positions)
+        self._delta = np.empty((count, 3), dtype=np.float32)
+        self._dist_sq = np.empty(count, dtype=np.float32)
+        self._outside = np.empty(count, dtype=bool)
+
+    @classmethod
+    def random(cls, count, extent=5.0, speed=0.5, center=(0.0, 0.0, 0.0), max_dist=6.0, seed=None):
+        """Véletlen pozíciók (±extent) és sebességek (±speed) – méréshez és nagy vertexszámhoz."""
+        rng = np.random.default_rng(seed)
+        positions = rng.uniform(-extent, extent, size=(count, 3)).astype(np.float32)
+        velocities = rng.uniform(-speed, speed, size=(count, 3)).astype(np.float32)
+        return cls(positions, velocities, center, max_dist)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def step(self, dt):
+        """
+        Egy szimulációs lépés minden vertexre:
+        integrálás, távolság teszt a középponttól, és a kint lévők sebességének tükrözése.
+        Visszaadja a visszapattant vertexek számát.
+        """
+        # 1. Pozíció frissítése (pos += vel * dt)
+        np.multiply(self.velocities, np.float32(dt), out=self._delta)
+        self.positions += self._delta
+
+        # 2. Határ teszt (négyzetes távolsággal, gyökvonás nélkül)
+        np.subtract(self.positions, self.center, out=self._delta)
+        np.einsum('ij,ij->i', self._delta, self._delta, out=self._dist_sq)
+        np.greater(self._dist_sq, np.float32(self.max_dist * self.max_dist), out=self._outside)
+
+        # 3. Visszapattanás: a kint lévő vertexek sebessége megfordul
+        bounced = int(np.count_nonzero(self._outside))
+        if bounced:
+            self.velocities[self._outside] *= -1.0
+        return bounced
@@ -0,0 +1,63 @@
+# Vertex Dinamika Mérés - Panda3D Python
+#
+# A VertexDynamics vektorizált lépésének áteresztőképessége 8-tól 100 000
+# vertexig, összevetve a MovingCubeParticlesDemo korábbi, vertexenkénti
+# (dict + LVector3f) Python ciklusával.
+#
+# Használat: python VertexDynamicsBenchmark.py [lépések száma]
+
+import sys
+import time
+from panda3d.core import LVector3f, VBase3
+
+from VertexDynamics import VertexDynamics
+
+# Ennél több vertexnél a vertexenkénti referencia mérés túl lassú lenne
+LOOP_REFERENCE_LIMIT = 100000
+
+
+def make_vertex_data(dynamics):
+    """Referencia: a demó korábbi adatszerkezete (dict-ek listája)."""
+    return [{'pos': VBase3(*p), 'vel': LVector3f(*v)}
+            for p, v in zip(dynamics.positions.tolist(), dynamics.velocities.tolist())]
+
+
+def step_loop(vertex_data, dt, target_center, max_dist):
+    """Referencia: a demó korábbi, vertexenkénti lépése."""
+    for data in vertex_data:
+        data['pos'] += data['vel'] * dt
+        if (data['pos'] - target_center).length() > max_dist:
+            data['vel'] = -(data['vel'])
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    dt = 1.0 / 60.0
+    center = VBase3(0, 0, 0)
+
+    print(f"{'vertex':>8} {'numpy (ms/lépés)':>17} {'Mvertex/s':>10} {'ciklus (ms/lépés)':>18} {'gyorsulás':>10}")
+    for count in [8, 100, 1000, 10000, 100000]:
+        dynamics = VertexDynamics.random(count, seed=1)
+        reference = make_vertex_data(dynamics)
+
+        start = time.perf_counter()
+        for _ in range(steps):
+            dynamics.step(dt)
+        vector_ms = (time.perf_counter() - start) / steps * 1000.0
+
+        loop_ms = None
+        if count <= LOOP_REFERENCE_LIMIT:
+            loop_steps = max(1, steps // 10) if count >= 10000 else steps
+            start = time.perf_counter()
+            for _ in range(loop_steps):
+                step_loop(reference, dt, center, dynamics.max_dist)
+            loop_ms = (time.perf_counter() - start) / loop_steps * 1000.0
+
+        throughput = count / (vector_ms / 1000.0) / 1e6
+        loop_text = f"{loop_ms:.3f}" if loop_ms is not None else "-"
+        speedup = f"{loop_ms / vector_ms:.1f}x" if loop_ms is not None else "-"
+        print(f"{count:>8} {vector_ms:>17.4f} {throughput:>10.1f} {loop_text:>18} {speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
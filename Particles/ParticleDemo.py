@@ -1,18 +1,21 @@
+import numpy as np
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import AmbientLight, VBase4, loadPrcFileData, NodePath, PointLight, LVector3, TransparencyAttrib
+from panda3d.core import VBase4, loadPrcFileData, PointLight, TransparencyAttrib
 from direct.task import Task
-from direct.interval.IntervalGlobal import Sequence, Parallel, LerpFunc, Func, Wait
 
 # Configuration to disable the default splash window for cleaner execution
 loadPrcFileData("", "notify-level-audio error")
-loadPrcFileData("", "window-title Panda3D Simple Particle Demo (Intervals)")
+loadPrcFileData("", "window-title Panda3D Simple Particle Demo (Curves)")
 loadPrcFileData("", "show-frame-rate-meter true")
 
+# Resolution of the baked life cycle table (samples over the normalized age)
+LIFE_SAMPLES = 256
+
 class ParticleDemo(ShowBase):
     """
     A simple Panda3D application demonstrating a fire/spark effect using 
-    Panda3D's robust Task and Interval system instead of the legacy 
-    direct.particles module, bypassing common import errors.
+    Panda3D's Task system and a baked keyframe table instead
+    of the legacy direct.particles module, bypassing common import errors.
     """
     def __init__(self):
         ShowBase.__init__(self)
@@ -26,6 +29,24 @@ class ParticleDemo(ShowBase):
         self.active_particles = []
         self.max_particles = 100
 
+        # Per-particle life data, indexed like active_particles
+        self.birth_times = np.zeros(0)
+        self.life_durations = np.ones(0)
+        self.initial_scales = np.zeros(0)
+        self.targets = np.zeros((0, 3))
+
+        # Life cycle over normalized age (0 = birth, 1 = death), baked once.
+        # Scale: grows to 1.5x in the first 20% of the life, then shrinks to 0.0
+        # Color: yellow/orange to dark transparent smoke
+        color_start = (1.0, 0.8, 0.2, 1.0)
+        color_end = (0.1, 0.1, 0.1, 0.0)
+        # Rows: scale, r, g, b, a; columns: LIFE_SAMPLES evenly spaced ages
+        ages = np.linspace(0.0, 1.0, LIFE_SAMPLES)
+        scale_row = np.interp(ages, (0.0, 0.2, 1.0), (1.0, 1.5, 0.0))
+        color_rows = [np.interp(ages, (0.0, 1.0), (start, end))
+                      for start, end in zip(color_start, color_end)]
+        self.life_table = np.vstack([scale_row] + color_rows)
+
         # Set up a light source to illuminate the particles
         plight = PointLight('plight')
         plight.setColor(VBase4(1, 0.5, 0.2, 1)) # Orange light
@@ -47,6 +68,8 @@ class ParticleDemo(ShowBase):
         # --- 2. Particle Task Setup ---
         # Add a task to continuously spawn new particles
         self.taskMgr.doMethodLater(0.01, self.spawn_particle, "SpawnParticleTask")
+        # One task animates every particle from the baked curves
+        self.taskMgr.add(self.update_particles, "UpdateParticlesTask")
 
     def spawn_particle(self, task):
         """Spawns a new particle and starts its life cycle animation."""
@@ -72,65 +95,51 @@ class ParticleDemo(ShowBase):
         life_duration = 1.0 + (globalClock.getFrameTime() * 0.5) % 1 # 1.0 to 2.0 seconds
         final_z = 5.0 + life_duration * 1.5 # How high it rises
 
-        # 2. Define the Particle Animation (Intervals)
-        
-        # A. Movement: Move upwards with some horizontal drift
-        move_interval = particle.posInterval(
-            life_duration,
-            pos=LVector3(rand_x * 0.5, rand_y * 0.5, final_z),
-            startPos=particle.getPos()
-        )
-        
-        # B. Scaling and Fading (Visuals)
-        # Scale: Grows slightly then shrinks to 0.0
-        scale_up = particle.scaleInterval(life_duration * 0.2, initial_scale * 1.5, startScale=initial_scale)
-        scale_down = particle.scaleInterval(life_duration * 0.8, 0.0, startScale=initial_scale * 1.5)
-        scale_sequence = Sequence(scale_up, scale_down)
-        
-        # Color: Lerp (interpolate) from bright yellow/orange to dark transparent
-        color_start = VBase4(1.0, 0.8, 0.2, 1.0) # Yellow/Orange
-        color_end = VBase4(0.1, 0.1, 0.1, 0.0) # Dark/Transparent (Smoke)
-        
-        color_interval = LerpFunc(
-            self.update_color_and_alpha,
-            duration=life_duration,
-            fromData=0.0,
-            toData=1.0,
-            extraArgs=[particle, color_start, color_end]
-        )
-
-        # 3. Combine animations and deletion (Life Cycle)
-        # Parallel runs movement, scale, and color at the same time
-        # Sequence ensures it's removed after all animations complete
-        life_cycle = Sequence(
-            Parallel(move_interval, scale_sequence, color_interval),
-            Func(self.destroy_particle, particle) # Function to clean up the particle
-        )
-        
-        life_cycle.start()
+        # 2. Register the particle; update_particles animates it from here on
+        particle.setTransparency(TransparencyAttrib.MAlpha)
         self.active_particles.append(particle)
+        self.birth_times = np.append(self.birth_times, globalClock.getFrameTime())
+        self.life_durations = np.append(self.life_durations, life_duration)
+        self.initial_scales = np.append(self.initial_scales, initial_scale)
+        self.targets = np.vstack([self.targets, (rand_x * 0.5, rand_y * 0.5, final_z)])
         
         return Task.cont
 
-    def update_color_and_alpha(self, t, particle, start_color, end_color):
-        """Custom LerpFunc to handle color and alpha interpolation."""
-        
-        # Simple linear interpolation
-        r = start_color[0] * (1-t) + end_color[0] * t
-        g = start_color[1] * (1-t) + end_color[1] * t
-        b = start_color[2] * (1-t) + end_color[2] * t
-        a = start_color[3] * (1-t) + end_color[3] * t
+    def update_particles(self, task):
+        """Samples the life cycle curves for all particles at once and applies them."""
+        if not self.active_particles:
+            return Task.cont
 
-        particle.setColor(VBase4(r, g, b, a), 1) # Set the color with a priority (1)
-        
-        # Enable transparency
-        particle.setTransparency(TransparencyAttrib.MAlpha)
+        # Normalized age of every particle, then one interpolated table lookup
+        ages = np.clip((globalClock.getFrameTime() - self.birth_times) / self.life_durations, 0.0, 1.0)
+        position = ages * (LIFE_SAMPLES - 1)
+        index = np.minimum(position.astype(np.int64), LIFE_SAMPLES - 2)
+        low = self.life_table[:, index]
+        high = self.life_table[:, index + 1]
+        scale, r, g, b, a = low + (high - low) * (position - index)
+        scales = scale * self.initial_scales
+
+        # Movement: straight line from the start point to the target
+        start = np.array([0.0, 0.0, 0.5])
+        positions = start + (self.targets - start) * ages[:, None]
 
-    def destroy_particle(self, particle):
-        """Removes the particle from the scene and the active list."""
-        if particle in self.active_particles:
-            self.active_particles.remove(particle)
-        particle.removeNode()
+        for i, particle in enumerate(self.active_particles):
+            particle.setPos(*positions[i])
+            particle.setScale(scales[i])
+            particle.setColor(r[i], g[i], b[i], a[i], 1) # Set the color with a priority (1)
+
+        # Remove the particles that reached the end of their life
+        finished = ages >= 1.0
+        if finished.any():
+            for i in np.flatnonzero(finished):
+                self.active_particles[i].removeNode()
+            alive = ~finished
+            self.active_particles = [p for p, keep in zip(self.active_particles, alive) if keep]
+            self.birth_times = self.birth_times[alive]
+            self.life_durations = self.life_durations[alive]
+            self.initial_scales = self.initial_scales[alive]
+            self.targets = self.targets[alive]
+        return Task.cont
 
 # Run the application
 if __name__ == "__main__":
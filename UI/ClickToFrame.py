@@ -1,8 +1,11 @@
 from direct.showbase.ShowBase import ShowBase
-from panda3d.core import WindowProperties, LVector2, MouseButton
+from panda3d.core import WindowProperties
 from direct.gui.DirectFrame import DirectFrame
 from direct.gui.OnscreenText import OnscreenText
-import math # Szükség lehet matematikai számításokhoz
+
+from LayoutCache import LayoutCache
+from KeyedTimers import KeyedTimers
+from PanelManager import PanelManager
 
 class ManualClickApp(ShowBase):
     def __init__(self):
@@ -12,118 +15,106 @@ class ManualClickApp(ShowBase):
         # 1. Konstansok beállítása
         self.WINDOW_SIZE = 750
         self.FRAME_SIZE = 500
-        
+
         # 2. Ablak méretének beállítása 750x750-re
         props = WindowProperties()
         props.setSize(self.WINDOW_SIZE, self.WINDOW_SIZE)
         props.setTitle("Kézi Koordináta Ellenőrzés")
         self.win.requestProperties(props)
-        
+
         # 3. Szöveg megjelenítésére szolgáló objektum létrehozása
         self.status_text = OnscreenText(
             text="Kattints az ablakba!",
-            pos=(0, 0.9), 
-            scale=0.07,   
-            fg=(1, 1, 1, 1), 
+            pos=(0, 0.9),
+            scale=0.07,
+            fg=(1, 1, 1, 1),
             mayChange=True
         )
-        
-        # 4. FRAME KORDINÁTÁK KISZÁMÍTÁSA PIXELBEN (Függőlegesen inverz)
-        # Panda3D: (0,0) a bal alsó sarok. A GUI rendszer a bal felső sarkot használja.
-        
-        # Mivel a Frame középen (0,0) van, a szélei a 750-es ablakban:
-        # A középpont koordinátái: (750 / 2, 750 / 2) = (375, 375)
-        
-        FRAME_OFFSET = self.FRAME_SIZE / 2 # 250
-        CENTER = self.WINDOW_SIZE / 2 # 375
-        
-        # Koordináták a Panda3D (bal alsó) 2D rendszerében:
-        self.frame_min_x = CENTER - FRAME_OFFSET # 375 - 250 = 125
-        self.frame_max_x = CENTER + FRAME_OFFSET # 375 + 250 = 625
-        
-        # A Y tengelyt fordítva kell kezelni, ha a Panda3D 2D-s koordináta rendszere (bal alsó)
-        # és az egér kurzorának (bal felső) Y tengelyét használjuk.
-        # A DirectGUI azonban a bal felső sarkot használja (0,0), így egyszerűbb, ha a Y tengelyt is a bal felsőtől számoljuk:
-        
-        self.frame_min_y = CENTER - FRAME_OFFSET # 125 (Bal felső: 0-tól)
-        self.frame_max_y = CENTER + FRAME_OFFSET # 625 (Bal felső: 0-tól)
-
-        # 5. 500x500-as Panel (DirectFrame) Létrehozása VIZUÁLIS SEGÉDLETNEK
-        panel_width_scale = 0.666 
+
+        # 4. Pixel <-> aspect2d átváltás: az ablak tényleges méretéből, csak
+        # átméretezéskor számolódik újra (nincs beégetett ablakméret)
+        self.layout = LayoutCache()
+
+        # 5. 500x500 pixeles Panel (DirectFrame) Létrehozása
         self.target_frame = DirectFrame(
-            frameColor=(0.1, 0.1, 0.8, 0.9),  # Kék szín 
-            frameSize=(-panel_width_scale, panel_width_scale, 
-                       -panel_width_scale, panel_width_scale), 
+            frameColor=(0.1, 0.1, 0.8, 0.9),  # Kék szín
+            frameSize=(-0.5, 0.5, -0.5, 0.5), # A valódi méretet az on_layout_changed adja
             pos=(0, 0, 0),
-            text="Frame: X: 125-625, Y: 125-625", 
+            text="",
             text_scale=0.05
         )
 
-        # 6. Esemény regisztrálása a kattintásra
-        # A 'mouse1' eseményre hívódik meg a manuális ellenőrzés
-        self.accept('mouse1', self.check_click_position)
-        
-        # 7. Információ kiírása a konzolra
+        # 6. Kattintás ellenőrzése: a PanelManager végzi a találat-vizsgálatot
+        # (a panel nem húzható, csak 'click' eseményt ad)
+        self.panel_manager = PanelManager(layout=self.layout)
+        self.target_panel = self.panel_manager.add_panel(self.target_frame, draggable=False)
+        self.panel_manager.on_press = self.on_click
+        self.panel_manager.on_miss = self.on_miss
+
+        self.timers = KeyedTimers()
+
+        # 7. A panel mérete pixelben rögzített: ablak átméretezéskor újraszámoljuk
+        self.layout.add_listener(self.on_layout_changed)
+        self.on_layout_changed(self.layout)
+
+    def on_layout_changed(self, layout):
+        """Ablak átméretezés: a Frame FRAME_SIZE pixeles marad, a felirat a pixel határokat mutatja."""
+        half_w, half_h = layout.pixel_size_to_aspect(self.FRAME_SIZE / 2, self.FRAME_SIZE / 2)
+        center_x, center_y = self.target_panel.get_center()
+        self.panel_manager.set_panel_bounds(
+            self.target_panel, (center_x - half_w, center_x + half_w, center_y - half_h, center_y + half_h))
+
+        frame_min_x, frame_max_x, frame_min_y, frame_max_y = self.get_frame_pixel_bounds()
+        self.target_frame['text'] = (f"Frame: X: {frame_min_x:.0f}-{frame_max_x:.0f}, "
+                                     f"Y: {frame_min_y:.0f}-{frame_max_y:.0f}")
         self.log_frame_positions()
 
+    def get_frame_pixel_bounds(self):
+        """A Frame határai pixelben (min_x, max_x, min_y, max_y), Y a bal felső saroktól."""
+        min_x, max_x, min_y, max_y = self.target_panel.bounds
+        frame_min_x, frame_max_y = self.layout.aspect_to_pixel(min_x, min_y)
+        frame_max_x, frame_min_y = self.layout.aspect_to_pixel(max_x, max_y)
+        return frame_min_x, frame_max_x, frame_min_y, frame_max_y
+
     def log_frame_positions(self):
         """Kiírja a frame pozícióit a konzolra ellenőrzés céljából."""
+        frame_min_x, frame_max_x, frame_min_y, frame_max_y = self.get_frame_pixel_bounds()
         print("--- FRAME POZÍCIÓK (Pixel) ---")
-        print(f"Ablak mérete: {self.WINDOW_SIZE}x{self.WINDOW_SIZE}")
-        print(f"Frame X minimális: {self.frame_min_x}")
-        print(f"Frame X maximális: {self.frame_max_x}")
-        print(f"Frame Y minimális: {self.frame_min_y} (Bal felsőtől)")
-        print(f"Frame Y maximális: {self.frame_max_y} (Bal felsőtől)")
+        print(f"Ablak mérete: {self.layout.width}x{self.layout.height}")
+        print(f"Frame X minimális: {frame_min_x:.0f}")
+        print(f"Frame X maximális: {frame_max_x:.0f}")
+        print(f"Frame Y minimális: {frame_min_y:.0f} (Bal felsőtől)")
+        print(f"Frame Y maximális: {frame_max_y:.0f} (Bal felsőtől)")
         print("-------------------------------")
 
-
-    def check_click_position(self):
-        """
-        Kiolvassa az egér pozícióját és kézzel ellenőrzi, hogy a Frame-ben van-e.
-        """
-        # Ellenőrizzük, hogy az egér aktív-e és elérhető-e a pozíció
+    def log_click(self):
         if base.mouseWatcherNode.hasMouse():
-            # Lekérjük az egér normált (scaled) koordinátáit (-1-től 1-ig)
-            mouse_norm = base.mouseWatcherNode.getMouse() 
-            
-            # Átalakítjuk a normált koordinátákat pixel koordinátákra (0-tól 750-ig)
-            # X: (normált_x + 1) * (WINDOW_SIZE / 2)
-            mouse_x_pixel = (mouse_norm.getX() + 1) * (self.WINDOW_SIZE / 2)
-            
-            # Y: A Panda3D normált Y koordinátája alulról felfelé nő (-1-től 1-ig).
-            # Pixel Y koordinátát a bal felső saroktól számoljuk:
-            mouse_y_pixel = (-mouse_norm.getY() + 1) * (self.WINDOW_SIZE / 2) 
-
-            # A 3D-s motor egér Y-ja pont a fordítottja a 2D-s GUI egér Y-jának.
-            # Tehát a pixel y-t: (1 - normalizált_y) * (WINDOW_SIZE / 2)
-
+            mouse_norm = base.mouseWatcherNode.getMouse()
+            mouse_x_pixel, mouse_y_pixel = self.layout.norm_to_pixel(mouse_norm.getX(), mouse_norm.getY())
             print(f"Kattintás pozíciója (Pixel): X={mouse_x_pixel:.2f}, Y={mouse_y_pixel:.2f}")
 
-            # KÉZI IF FELTÉTEL ELLENŐRZÉSE
-            # Ellenőrzi, hogy az egér koordinátái a Frame (125, 125) és (625, 625) között vannak-e
-            
-            if (self.frame_min_x <= mouse_x_pixel <= self.frame_max_x and
-                self.frame_min_y <= mouse_y_pixel <= self.frame_max_y):
-                
-                # Frame-en belül
-                self.status_text.setText("BELEKATTINTOTT")
-                print("BELEKATTINTOTT (Frame-en belül)")
-                self.target_frame['frameColor'] = (0.0, 0.8, 0.0, 0.9) # Zöld
-                self.taskMgr.doMethodLater(1.5, self.reset_color_and_text, 'reset_task')
-                
-            else:
-                # Frame-en kívül
-                self.status_text.setText("NEM BELEKATTINTOTT")
-                print("NEM BELEKATTINTOTT (Frame-en kívül)")
-                self.target_frame['frameColor'] = (0.8, 0.1, 0.1, 0.9) # Piros
-                self.taskMgr.doMethodLater(1.5, self.reset_color_and_text, 'reset_task')
-
-    def reset_color_and_text(self, task):
+    def on_click(self, panel, action, corner):
+        """Frame-en belüli kattintás."""
+        self.log_click()
+        self.status_text.setText("BELEKATTINTOTT")
+        print("BELEKATTINTOTT (Frame-en belül)")
+        self.target_frame['frameColor'] = (0.0, 0.8, 0.0, 0.9) # Zöld
+        self.timers.start('reset', 1.5, self.reset_color_and_text)
+
+    def on_miss(self, x, y):
+        """Frame-en kívüli kattintás."""
+        self.log_click()
+        self.status_text.setText("NEM BELEKATTINTOTT")
+        print("NEM BELEKATTINTOTT (Frame-en kívül)")
+        self.target_frame['frameColor'] = (0.8, 0.1, 0.1, 0.9) # Piros
+        self.timers.start('reset', 1.5, self.reset_color_and_text)
+
+    def reset_color_and_text(self):
         """Visszaállítja a Frame színét és a státusz szöveget."""
         self.target_frame['frameColor'] = (0.1, 0.1, 0.8, 0.9) # Kék
         self.status_text.setText("Kattints az ablakba!")
-        return task.done
 
 # Az alkalmazás futtatása
-app = ManualClickApp()
-app.run()
\ No newline at end of file
+if __name__ == '__main__':
+    app = ManualClickApp()
+    app.run()
@@ -0,0 +1,302 @@
+import os
+import sys
+import math
+import time
+import random
+import importlib
+import subprocess
+import contextlib
+from panda3d.core import (loadPrcFileData, VirtualMouse, MouseWatcher, ButtonThrower,
+                          MouseButton)
+
+# Az öt UI alkalmazás: modul -> ShowBase osztály
+APPS = {
+    'ClickToFrame': 'ManualClickApp',
+    'GrabWindowAndMoving': 'DragApp',
+    'TwoPanelManualDragApp': 'TwoPanelManualDragApp',
+    'ResizableManualFrameApp': 'ManualFrameApp',
+    'ButtonInFrameResizable': 'ManualFrameApp',
+}
+
+PANEL_COUNTS = [0, 100, 1000]
+WINDOW_SIZE = 750
+# Ennyi képkockán belül kell az eseménynek állapotváltozást okoznia
+MAX_LATENCY_FRAMES = 3
+
+
+class OffscreenWindow:
+    """Az offscreen buffer az ablak helyett: a requestProperties hívás nem csinál semmit."""
+
+    def __init__(self, win):
+        self._win = win
+
+    def requestProperties(self, props):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._win, name)
+
+
+class VirtualInput:
+    """
+    Szintetikus egér a valódi adatgráfban: VirtualMouse -> MouseWatcher ->
+    ButtonThrower. Az alkalmazás ugyanazokat a mouse1 / mouse1-up eseményeket
+    és ugyanazt a base.mouseWatcherNode-ot látja, mint valódi egérrel.
+    """
+
+    def __init__(self, app, width, height):
+        self.app = app
+        self.mouse = VirtualMouse('virtual_mouse')
+        self.mouse.setWindowSize(width, height)
+        self.mouse.setMouseOn(True)
+        mouse_np = app.dataRoot.attachNewNode(self.mouse)
+
+        watcher = MouseWatcher('virtual_mouse_watcher')
+        app.mouseWatcher = mouse_np.attachNewNode(watcher)
+        app.mouseWatcherNode = watcher
+        app.buttonThrowers = [app.mouseWatcher.attachNewNode(ButtonThrower('virtual_buttons'))]
+        # A DirectGUI widgetek (PGTop) is ezt a MouseWatcher-t figyelik, mint setupMouse után
+        app.aspect2d.node().setMouseWatcher(watcher)
+        app.pixel2d.node().setMouseWatcher(watcher)
+
+    def move(self, x, y):
+        """Az egér új helye aspect2d koordinátában."""
+        pixel_x, pixel_y = self.app.panel_manager.layout.aspect_to_pixel(x, y)
+        self.mouse.setMousePos(int(round(pixel_x)), int(round(pixel_y)))
+
+    def press(self):
+        self.mouse.pressButton(MouseButton.one())
+
+    def release(self):
+        self.mouse.releaseButton(MouseButton.one())
+
+
+def make_app(module_name, extra_panels, seed=1, batched=False):
+    """
+    Az alkalmazás offscreen, szintetikus egérrel és 'extra_panels' további
+    panellel (batched=True: DirectFrame-ek helyett egy PanelBatchRenderer-ben).
+    A köteg panelei nem keverhetők az alkalmazás DirectFrame paneleivel, ezért
+    batched=True esetén egy saját PanelManager kezeli őket (az alkalmazás
+    panelei alatt rajzolódnak); a mért panel alá nem kerülnek, hogy a
+    lenyomás csak a mért panelt mozgassa.
+    """
+    loadPrcFileData('', f"""
+window-type offscreen
+win-size {WINDOW_SIZE} {WINDOW_SIZE}
+audio-library-name null
+sync-video false
+""")
+    from direct.gui.DirectFrame import DirectFrame
+    from PanelManager import PanelManager
+    from PanelBatchRenderer import PanelBatchRenderer, BatchedPanel
+
+    app_class = getattr(importlib.import_module(module_name), APPS[module_name])
+
+    class ReplayApp(app_class):
+        def openDefaultWindow(self, *args, **kwargs):
+            result = app_class.openDefaultWindow(self, *args, **kwargs)
+            self.win = OffscreenWindow(self.win)
+            return result
+
+    app = ReplayApp()
+    app.virtual_input = VirtualInput(app, WINDOW_SIZE, WINDOW_SIZE)
+
+    # A mért panel az alkalmazás legfelső panele; a többi alá kerül
+    manager = app.panel_manager
+    target = manager.panels[-1]
+    rng = random.Random(seed)
+    if batched:
+        renderer = PanelBatchRenderer(capacity=max(extra_panels, 1))
+        app.extra_manager = PanelManager(layout=manager.layout, name="extra_panels")
+        min_x, max_x, min_y, max_y = target.bounds
+        margin = 0.04 + manager.resize_tolerance
+    for i in range(extra_panels):
+        x, y = rng.uniform(-0.95, 0.95), rng.uniform(-0.95, 0.95)
+        if batched:
+            while min_x - margin < x < max_x + margin and min_y - margin < y < max_y + margin:
+                x, y = rng.uniform(-0.95, 0.95), rng.uniform(-0.95, 0.95)
+            app.extra_manager.insert_panel(BatchedPanel(
+                renderer, (x - 0.04, x + 0.04, y - 0.04, y + 0.04),
+                (0.3, 0.3, 0.3, 0.9), name=f"extra_{i}", resizable=True))
+            continue
+        frame = DirectFrame(frameColor=(0.3, 0.3, 0.3, 0.9),
+                            frameSize=(-0.04, 0.04, -0.04, 0.04), pos=(x, 0, y))
+        manager.add_panel(frame, name=f"extra_{i}", resizable=True)
+    manager.raise_panel(target)
+    return app, target
+
+
+def make_script(target, action, events, manager):
+    """
+    Esemény lista: ('press', x, y), ('move', x, y), ('release', x, y).
+    'drag': a panel közepét kör mentén húzza; 'resize': a jobb felső sarkát
+    húzza ki-be; 'click': kattintás-sorozat a panelen és mellette.
+    """
+    min_x, max_x, min_y, max_y = target.bounds
+    center_x, center_y = target.get_center()
+    script = []
+    if action == 'click':
+        for i in range(events // 2):
+            x = center_x if i % 2 == 0 else 0.99
+            y = center_y if i % 2 == 0 else -0.99
+            script.append(('press', x, y))
+            script.append(('release', x, y))
+        return script
+
+    if action == 'resize':
+        inset = manager.resize_tolerance / 2
+        start_x, start_y = max_x - inset, max_y - inset
+    else:
+        start_x, start_y = center_x, center_y
+    script.append(('press', start_x, start_y))
+    for i in range(1, events - 1):
+        step = i * 0.05
+        if action == 'resize':
+            offset = 0.1 * ((i % 40) / 20.0 - 1.0)
+            script.append(('move', start_x + offset, start_y + offset))
+        else:
+            script.append(('move', start_x + 0.2 * (1.0 - math.cos(step)), start_y + 0.2 * math.sin(step)))
+    script.append(('release',) + script[-1][1:])
+    return script
+
+
+class ReplayRecorder:
+    """
+    A PanelManager press / move / release hívásainak befejezési ideje: az
+    esemény beadásától eddig tart az input -> állapot késleltetés.
+    """
+
+    def __init__(self, manager):
+        self.stamps = {'press': None, 'move': None, 'release': None}
+        for name in self.stamps:
+            setattr(manager, name, self._wrap(name, getattr(manager, name)))
+
+    def _wrap(self, name, method):
+        def wrapper(*args, **kwargs):
+            result = method(*args, **kwargs)
+            # A move csak akkor számít, ha valóban változott valami
+            if name != 'move' or result:
+                self.stamps[name] = time.perf_counter()
+            return result
+        return wrapper
+
+
+def replay(app, recorder, script):
+    """
+    Az események lejátszása képkockánként egy eseménnyel. Visszaadja:
+    (késleltetések us-ban, képkocka idők us-ban, késleltetés képkockában, eldobott események)
+    """
+    mouse = app.virtual_input
+    step = app.taskMgr.step
+    latencies, frame_times, latency_frames = [], [], []
+    dropped = 0
+
+    for kind, x, y in script:
+        mouse.move(x, y)
+        injected = time.perf_counter()
+        if kind == 'press':
+            mouse.press()
+        elif kind == 'release':
+            mouse.release()
+
+        for frame in range(1, MAX_LATENCY_FRAMES + 1):
+            start = time.perf_counter()
+            step()
+            frame_times.append((time.perf_counter() - start) * 1e6)
+            stamp = recorder.stamps[kind]
+            if stamp is not None and stamp >= injected:
+                latencies.append((stamp - injected) * 1e6)
+                latency_frames.append(frame)
+                break
+        else:
+            dropped += 1
+    return latencies, frame_times, latency_frames, dropped
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run_one(module_name, panels, events, render, batched):
+    """Egy alkalmazás, egy panelszám: eredmény sorok a kimenetre."""
+    # Az alkalmazások saját konzol kiírásai nem keverednek az eredménnyel
+    quiet = contextlib.redirect_stdout(open(os.devnull, 'w'))
+    with quiet:
+        app, target = make_app(module_name, panels, batched=batched)
+        if not render:
+            # Csak az interakciós kód mérése: a buffer nem rajzolódik
+            app.win.setActive(False)
+        for _ in range(5):
+            app.taskMgr.step() # Bemelegítés (első kirajzolás, szöveg generálás)
+    recorder = ReplayRecorder(app.panel_manager)
+
+    actions = ['drag' if target.draggable else 'click']
+    if target.resizable:
+        actions.append('resize')
+
+    for action in actions:
+        script = make_script(target, action, events, app.panel_manager)
+        start = time.perf_counter()
+        with quiet:
+            latencies, frame_times, latency_frames, dropped = replay(app, recorder, script)
+        elapsed = time.perf_counter() - start
+        print(f"{module_name:>24} {panels:>6} {action:>7} {len(script) / elapsed:>9.0f} "
+              f"{sum(latencies) / max(len(latencies), 1):>9.1f} {percentile(latencies, 0.95):>9.1f} "
+              f"{max(latency_frames, default=0):>6} "
+              f"{sum(frame_times) / max(len(frame_times), 1):>9.1f} {percentile(frame_times, 0.95):>9.1f} "
+              f"{dropped:>7}")
+        sys.stdout.flush()
+
+
+def main():
+    """
+    Szintetikus egér események lejátszása az öt UI alkalmazáson offscreen,
+    N további panellel. Méri eseményenként az input -> állapot késleltetést
+    (a PanelManager press / move / release lefutásáig) és a képkocka időt
+    húzás, méretezés és kattintás közben.
+
+    Alapesetben a buffer nem rajzolódik ki (csak az interakciós kód és a
+    feladatok ideje számít); --render esetén a kirajzolás is benne van a
+    képkocka időben. --batched esetén a további panelek egyetlen
+    PanelBatchRenderer Geom-ban rajzolódnak, egy külön PanelManager-rel. Minden alkalmazás / panelszám
+    külön folyamatban fut (egy folyamatban egy ShowBase lehet).
+
+    Használat: python InputReplayBenchmark.py [alkalmazás ...] [--events N] [--render] [--batched]
+    """
+    args = sys.argv[1:]
+    events = 2000
+    if '--events' in args:
+        i = args.index('--events')
+        events = int(args[i + 1])
+        del args[i:i + 2]
+    render = '--render' in args
+    if render:
+        args.remove('--render')
+    batched = '--batched' in args
+    if batched:
+        args.remove('--batched')
+
+    if args and args[0] == '--run':
+        run_one(args[1], int(args[2]), events, render, batched)
+        return
+
+    apps = args or list(APPS)
+    print(f"{'alkalmazás':>24} {'panel':>6} {'művelet':>7} {'esemény/s':>9} "
+          f"{'kés. (us)':>9} {'p95 (us)':>9} {'képk.':>6} "
+          f"{'képk. (us)':>9} {'p95 (us)':>9} {'eldobva':>7}")
+    sys.stdout.flush()
+    for module_name in apps:
+        for panels in PANEL_COUNTS:
+            command = [sys.executable, __file__, '--run', module_name, str(panels), '--events', str(events)]
+            if render:
+                command.append('--render')
+            if batched:
+                command.append('--batched')
+            subprocess.run(command, check=True)
+
+
+if __name__ == '__main__':
+    main()
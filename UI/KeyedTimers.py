@@ -0,0 +1,129 @@
+import heapq
+from panda3d.core import ClockObject
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+
+
+class _Timer:
+    __slots__ = ('deadline', 'heap_deadline', 'callback', 'args')
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline          # Mikor kell lefutnia
+        self.heap_deadline = deadline     # Ezzel az időponttal van bent a kupacban
+        self.callback = callback
+        self.args = args
+
+
+class KeyedTimers:
+    """
+    Kulccsal azonosított időzítők egyetlen feladattal. Az azonos kulccsal
+    újraindított időzítő nem kerül be még egyszer, csak a lejárata tolódik ki:
+      - a kupacban kulcsonként legfeljebb egy érvényes bejegyzés van; ha a
+        régi bejegyzés előbb jár le, mint az új lejárat, egyszerűen újra bekerül
+      - későbbi lejáratra újraindítás (a szokásos eset, pl. ismételt
+        kattintás) O(1), a kupachoz nem nyúl
+      - a függőben lévő időzítők száma legfeljebb a kulcsok száma
+    A feladat csak akkor fut, ha van függő időzítő.
+    """
+
+    def __init__(self, name="keyed_timers", clock=None):
+        self.clock = clock if clock is not None else ClockObject.getGlobalClock()
+        self._timers = {}      # kulcs -> _Timer
+        self._heap = []        # (lejárat, sorszám, kulcs)
+        self._seq = 0
+        self._task_name = f"{name}-tick"
+        self._running = False
+
+        # Statisztika (profilozáshoz)
+        self.restart_count = 0
+        self.fire_count = 0
+
+    def __len__(self):
+        return len(self._timers)
+
+    def start(self, key, delay, callback, *args):
+        """
+        callback(*args) 'delay' másodperc múlva. Ha a kulcs már függőben van,
+        az időzítő újraindul (a régi hívás elmarad).
+        """
+        deadline = self.clock.getFrameTime() + delay
+        timer = self._timers.get(key)
+        if timer is not None:
+            self.restart_count += 1
+            timer.deadline = deadline
+            timer.callback = callback
+            timer.args = args
+            if timer.heap_deadline <= deadline:
+                return
+            # Korábbra került: új bejegyzés, a régi elavul
+            timer.heap_deadline = deadline
+            self._compact()
+        else:
+            self._timers[key] = _Timer(deadline, callback, args)
+
+        self._push(deadline, key)
+        if not self._running:
+            self._running = True
+            taskMgr.add(self._tick_task, self._task_name)
+
+    def cancel(self, key):
+        """Függő időzítő törlése. Visszaadja, hogy volt-e ilyen."""
+        if self._timers.pop(key, None) is None:
+            return False
+        self._compact()
+        return True
+
+    def is_pending(self, key):
+        return key in self._timers
+
+    def remaining(self, key):
+        """A lejáratig hátralévő idő másodpercben (None, ha nincs ilyen időzítő)."""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        return max(timer.deadline - self.clock.getFrameTime(), 0.0)
+
+    def destroy(self):
+        taskMgr.remove(self._task_name)
+        self._running = False
+        self._timers.clear()
+        self._heap = []
+
+    # --- Belső működés ---
+
+    def _push(self, deadline, key):
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, key))
+
+    def _compact(self):
+        """Az elavult bejegyzések kiszűrése, ha a kupac túl nagyra nőtt."""
+        if len(self._heap) > 2 * len(self._timers) + 16:
+            self._heap = [entry for entry in self._heap
+                          if entry[2] in self._timers and self._timers[entry[2]].heap_deadline == entry[0]]
+            heapq.heapify(self._heap)
+
+    def update(self):
+        """A lejárt időzítők lefuttatása (a feladat képkockánként hívja)."""
+        now = self.clock.getFrameTime()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            heap_deadline, _, key = heapq.heappop(heap)
+            timer = self._timers.get(key)
+            if timer is None or timer.heap_deadline != heap_deadline:
+                continue # Törölt vagy korábbra újraindított időzítő
+            if timer.deadline > now:
+                # Közben későbbre újraindult: most kerül vissza a kupacba
+                timer.heap_deadline = timer.deadline
+                self._push(timer.deadline, key)
+                continue
+            del self._timers[key]
+            self.fire_count += 1
+            timer.callback(*timer.args)
+
+    def _tick_task(self, task):
+        self.update()
+        if self._timers:
+            return Task.cont
+        self._heap = [] # Csak elavult bejegyzések maradhattak
+        self._running = False
+        return Task.done
@@ -0,0 +1,71 @@
+import sys
+import time
+from panda3d.core import ClockObject
+from direct.task.TaskManagerGlobal import taskMgr
+
+from KeyedTimers import KeyedTimers
+
+# Rövid késleltetés, hogy a mérés végén tényleg lefussanak
+DELAY = 0.05
+
+
+def run_expiry(clock):
+    """Vár a lejáratig, majd a lejáratkori képkockák ideje mikroszekundumban."""
+    time.sleep(DELAY * 2)
+    clock.tick()
+    start = time.perf_counter()
+    # Az első lépés a lejárt doMethodLater feladatokat aktiválja, a második futtatja
+    taskMgr.step()
+    taskMgr.step()
+    return (time.perf_counter() - start) * 1e6
+
+
+def main():
+    """
+    Gyors kattintássorozat: minden kattintás újraindítja a státusz
+    visszaállítást (itt DELAY mp). doMethodLater-rel minden hívás új függő
+    feladat (mind lefut és felülírja a szöveget), KeyedTimers-szel egy kulcs
+    egy időzítő.
+
+    Használat: python KeyedTimersBenchmark.py [kattintások száma]
+    """
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    clock = ClockObject.getGlobalClock() # ShowBase nélkül kézzel léptetjük
+
+    print(f"{'módszer':>12} {'ütemezés (us)':>14} {'függő':>7} {'lejárat (us)':>14} {'lefutott':>9}")
+
+    # doMethodLater: a régi feladat nem törlődik
+    fired = [0]
+
+    def on_reset(task):
+        fired[0] += 1
+        return task.done
+
+    start = time.perf_counter()
+    for _ in range(clicks):
+        taskMgr.doMethodLater(DELAY, on_reset, 'reset_task')
+    schedule_us = (time.perf_counter() - start) / clicks * 1e6
+    pending = len(taskMgr.getDoLaters())
+    frame_us = run_expiry(clock)
+    print(f"{'doMethodLater':>12} {schedule_us:>14.2f} {pending:>7} {frame_us:>14.1f} {fired[0]:>9}")
+    taskMgr.remove('reset_task')
+
+    # KeyedTimers: újraindítás ugyanazzal a kulccsal
+    timers = KeyedTimers()
+    fired = [0]
+
+    def on_keyed_reset():
+        fired[0] += 1
+
+    start = time.perf_counter()
+    for _ in range(clicks):
+        timers.start('reset', DELAY, on_keyed_reset)
+    schedule_us = (time.perf_counter() - start) / clicks * 1e6
+    pending = len(timers)
+    frame_us = run_expiry(clock)
+    print(f"{'KeyedTimers':>12} {schedule_us:>14.2f} {pending:>7} {frame_us:>14.1f} {fired[0]:>9}")
+    timers.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+from direct.showbase.DirectObject import DirectObject
+
+
+class LayoutCache(DirectObject):
+    """
+    Az ablak mérete és a koordináta-rendszerek közötti átváltás gyorsítótárazva:
+      - pixel: (0, 0) a bal felső sarok, Y lefelé nő
+      - norm: az egér (render2d) koordinátái, -1..1 mindkét tengelyen
+      - aspect: az aspect2d koordinátái (ebben vannak a DirectGUI panelek)
+    A 'window-event' eseményre csak akkor számol újra, ha az ablak mérete
+    valóban megváltozott; ekkor egyszer meghívja a feliratkozottakat. A két
+    esemény között minden átváltás néhány szorzás.
+    """
+
+    def __init__(self, win=None):
+        self.win = win if win is not None else base.win
+        self.width = 0
+        self.height = 0
+        self.aspect_ratio = 1.0
+        self._listeners = []
+        self.recompute_count = 0
+
+        self.accept('window-event', self._on_window_event)
+        self.recompute()
+
+    def add_listener(self, callback):
+        """callback(layout) minden tényleges méretváltozás után."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def destroy(self):
+        self.ignoreAll()
+        self._listeners = []
+
+    def _on_window_event(self, window):
+        if self.recompute():
+            for callback in list(self._listeners):
+                callback(self)
+
+    def recompute(self):
+        """Az átváltások újraszámítása. Visszaadja, hogy változott-e a méret."""
+        width, height = self.win.getXSize(), self.win.getYSize()
+        if width <= 0 or height <= 0 or (width, height) == (self.width, self.height):
+            return False
+        self.width, self.height = width, height
+        self.aspect_ratio = base.getAspectRatio(self.win)
+
+        # Az aspect2d skálája a render2d-hez képest (mint a ShowBase-ben)
+        if self.aspect_ratio >= 1.0:
+            self.aspect_sx, self.aspect_sy = 1.0 / self.aspect_ratio, 1.0
+        else:
+            self.aspect_sx, self.aspect_sy = 1.0, self.aspect_ratio
+
+        # Az aspect2d látható szélei
+        self.left, self.right = -1.0 / self.aspect_sx, 1.0 / self.aspect_sx
+        self.bottom, self.top = -1.0 / self.aspect_sy, 1.0 / self.aspect_sy
+
+        # Egy pixel mérete aspect2d egységben
+        self.pixel_to_aspect_x = 2.0 / (width * self.aspect_sx)
+        self.pixel_to_aspect_y = 2.0 / (height * self.aspect_sy)
+        self.recompute_count += 1
+        return True
+
+    # --- Átváltások ---
+
+    def norm_to_aspect(self, x, y):
+        return x / self.aspect_sx, y / self.aspect_sy
+
+    def aspect_to_norm(self, x, y):
+        return x * self.aspect_sx, y * self.aspect_sy
+
+    def norm_to_pixel(self, x, y):
+        return (x + 1.0) * 0.5 * self.width, (1.0 - y) * 0.5 * self.height
+
+    def pixel_to_norm(self, x, y):
+        return x * 2.0 / self.width - 1.0, 1.0 - y * 2.0 / self.height
+
+    def aspect_to_pixel(self, x, y):
+        return self.norm_to_pixel(x * self.aspect_sx, y * self.aspect_sy)
+
+    def pixel_to_aspect(self, x, y):
+        x, y = self.pixel_to_norm(x, y)
+        return x / self.aspect_sx, y / self.aspect_sy
+
+    def pixel_size_to_aspect(self, width, height):
+        """Pixelben megadott méret aspect2d egységben."""
+        return width * self.pixel_to_aspect_x, height * self.pixel_to_aspect_y
@@ -0,0 +1,237 @@
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+
+# A tömeges újraszámítás a képkocka végén, a rajzolás (igLoop, sort 50) előtt fut
+LAYOUT_TASK_SORT = 45
+
+
+class LayoutNode:
+    """
+    Egy widget elrendezési szabályai a szülőjéhez képest:
+      - anchor: a szülő téglalapjának pontja (0..1, 0..1), ide kerül a widget
+        ugyanilyen arányú pontja (0.5, 0.5 = középre, 0, 1 = bal felső sarok)
+      - offset: eltolás az anchor ponttól (a gyökér koordinátáiban)
+      - percent_size: méret a szülő méretének arányában, vagy fixed_size
+      - min_size / max_size: korlátok, aspect: rögzített szélesség/magasság arány
+      - mode: 'scale' - a widget alapmérete (base_size) fix, a NodePath skálája
+        változik (olcsó); 'frame' - a frameSize íródik át
+      - text_scale: a felirat látható mérete, a skálázástól függetlenül
+    A rect és a scale a gyökér (panel) koordináta-rendszerében értendő.
+    """
+
+    def __init__(self, engine, widget, parent=None, anchor=(0.5, 0.5), offset=(0.0, 0.0),
+                 percent_size=None, fixed_size=None, min_size=None, max_size=None,
+                 aspect=None, base_size=None, mode='scale', text_scale=None):
+        self.engine = engine
+        self.widget = widget
+        self.parent = parent
+        self.children = []
+        self.anchor = anchor
+        self.offset = offset
+        self.percent_size = percent_size
+        self.fixed_size = fixed_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.aspect = aspect
+        self.base_size = base_size
+        self.mode = mode
+        self.text_scale = text_scale
+
+        self.rect = None           # (min_x, max_x, min_y, max_y) a gyökér koordinátáiban
+        self.scale = (1.0, 1.0)    # A widget teljes skálája a gyökérhez képest
+        self.origin = (0.0, 0.0)   # A widget helyi origója a gyökér koordinátáiban
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self.dirty = False
+        self.changed = False       # Az utolsó frissítésnél változott-e (a gyerekek ebből tudják)
+
+    def mark_dirty(self):
+        """A csomópont (és így a részfája) újraszámítása a következő frissítéskor."""
+        self.engine.mark_dirty(self)
+
+    def set_rules(self, **rules):
+        """Szabályok módosítása (pl. percent_size=(0.5, 0.5)); a részfa piszkos lesz."""
+        for name, value in rules.items():
+            if not hasattr(self, name):
+                raise AttributeError(f"Ismeretlen elrendezési szabály: {name}")
+            setattr(self, name, value)
+        self.mark_dirty()
+
+    # --- Számítás ---
+
+    def _compute_size(self, parent_rect):
+        parent_w = parent_rect[1] - parent_rect[0]
+        parent_h = parent_rect[3] - parent_rect[2]
+        if self.fixed_size is not None:
+            width, height = self.fixed_size
+        elif self.percent_size is not None:
+            width, height = parent_w * self.percent_size[0], parent_h * self.percent_size[1]
+        else:
+            width, height = parent_w, parent_h
+
+        if self.min_size is not None:
+            width, height = max(width, self.min_size[0]), max(height, self.min_size[1])
+        if self.max_size is not None:
+            width, height = min(width, self.max_size[0]), min(height, self.max_size[1])
+
+        # Rögzített arány: a túl nagy oldal zsugorodik
+        if self.aspect:
+            if width > height * self.aspect:
+                width = height * self.aspect
+            else:
+                height = width / self.aspect
+        return width, height
+
+    def _layout(self):
+        """A rect kiszámítása és alkalmazása. Visszaadja, hogy változott-e valami."""
+        parent = self.parent
+        parent_rect = parent.rect
+        width, height = self._compute_size(parent_rect)
+
+        ax, ay = self.anchor
+        anchor_x = parent_rect[0] + (parent_rect[1] - parent_rect[0]) * ax + self.offset[0]
+        anchor_y = parent_rect[2] + (parent_rect[3] - parent_rect[2]) * ay + self.offset[1]
+        min_x = anchor_x - width * ax
+        min_y = anchor_y - height * ay
+        rect = (min_x, min_x + width, min_y, min_y + height)
+
+        if self.mode == 'scale' and self.base_size:
+            scale = (width / self.base_size[0], height / self.base_size[1])
+        else:
+            scale = parent.scale
+
+        if rect == self.rect and scale == self.scale and not parent.changed:
+            return False
+        self.rect = rect
+        self.scale = scale
+        self.origin = ((rect[0] + rect[1]) / 2, (rect[2] + rect[3]) / 2)
+        self._apply(parent)
+        return True
+
+    def _apply(self, parent):
+        """A widget pozíciója, skálája (vagy frameSize-a) a szülő helyi koordinátáiban."""
+        min_x, max_x, min_y, max_y = self.rect
+        parent_sx, parent_sy = parent.scale
+        parent_ox, parent_oy = parent.origin
+        center_x, center_y = self.origin
+        self.widget.setPos((center_x - parent_ox) / parent_sx, 0, (center_y - parent_oy) / parent_sy)
+
+        if self.mode == 'scale' and self.base_size:
+            self.widget.setScale(self.scale[0] / parent_sx, 1, self.scale[1] / parent_sy)
+        else:
+            half_w = (max_x - min_x) / 2 / parent_sx
+            half_h = (max_y - min_y) / 2 / parent_sy
+            self.widget['frameSize'] = (-half_w, half_w, -half_h, half_h)
+
+        # Felirat: a teljes skálával osztva mindig ugyanakkora látszik
+        if self.text_scale is not None:
+            self.widget['text_scale'] = (self.text_scale / self.scale[0], self.text_scale / self.scale[1])
+
+
+class LayoutEngine:
+    """
+    Piszkos-jelzős, inkrementális elrendezés DirectGUI gyerekekhez. A gyökér
+    egy panel (a rect a frameSize-a); a módosítás csak a piszkos részfákat
+    számolja újra, és a képkockánként legfeljebb egyszeri tömeges frissítés
+    csak akkor fut, ha van mit frissíteni.
+    """
+
+    def __init__(self, name="layout_engine"):
+        self.roots = []
+        self._dirty = set()
+        self._changed_roots = set()
+        self._task_name = f"{name}-flush"
+        self._scheduled = False
+
+        # Statisztika (profilozáshoz)
+        self.layout_count = 0
+        self.flush_count = 0
+
+    def add_root(self, widget, rect):
+        """Gyökér csomópont egy panelhez (rect: a frameSize, helyi koordinátában)."""
+        root = LayoutNode(self, widget)
+        root.rect = tuple(rect)   # A gyökér helyi koordinátái: origó a panel közepén (0, 0)
+        self.roots.append(root)
+        return root
+
+    def add(self, parent, widget, **rules):
+        """Gyerek widget felvétele a szülő csomópont alá (lásd LayoutNode)."""
+        node = LayoutNode(self, widget, parent, **rules)
+        if widget.getParent() != parent.widget:
+            widget.reparentTo(parent.widget)
+        parent.children.append(node)
+        self.mark_dirty(node)
+        return node
+
+    def remove(self, node):
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        else:
+            self.roots.remove(node)
+        self._dirty.discard(node)
+
+    def destroy(self):
+        taskMgr.remove(self._task_name)
+        self._scheduled = False
+        self._dirty.clear()
+        self._changed_roots.clear()
+        self.roots = []
+
+    def set_root_rect(self, root, rect):
+        """A panel új frameSize-a: csak ennek a gyökérnek a részfája lesz piszkos."""
+        rect = tuple(rect)
+        if rect == root.rect:
+            return
+        root.rect = rect
+        self.mark_dirty(root)
+
+    def mark_dirty(self, node):
+        if node.parent is None:
+            # Gyökér: a rect-je kívülről jön, a gyerekei lesznek piszkosak
+            node.changed = True
+            self._changed_roots.add(node)
+            for child in node.children:
+                self.mark_dirty(child)
+            return
+        node.dirty = True
+        self._dirty.add(node)
+        if not self._scheduled:
+            self._scheduled = True
+            taskMgr.add(self._flush_task, self._task_name, sort=LAYOUT_TASK_SORT)
+
+    def flush(self):
+        """Minden piszkos részfa újraszámítása (azonnal)."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        touched = []
+
+        # Felülről lefelé: a mélyebb piszkos csomópontot általában már
+        # az őse bejárása frissíti, akkor kimarad
+        for node in sorted(dirty, key=lambda node: node.depth):
+            if node.dirty:
+                self._layout_subtree(node, touched)
+
+        for node in touched:
+            node.changed = False
+        for root in self._changed_roots:
+            root.changed = False
+        self._changed_roots.clear()
+        self.flush_count += 1
+
+    def _layout_subtree(self, node, touched):
+        """A csomópont és azon leszármazottai, amelyeket a változás érint."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node.dirty = False
+            node.changed = node._layout()
+            touched.append(node)
+            self.layout_count += 1
+            for child in node.children:
+                if node.changed or child.dirty:
+                    stack.append(child)
+
+    def _flush_task(self, task):
+        self._scheduled = False
+        self.flush()
+        return Task.done
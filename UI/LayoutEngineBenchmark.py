@@ -0,0 +1,67 @@
+import sys
+import time
+from panda3d.core import NodePath
+
+from LayoutEngine import LayoutEngine
+
+
+def make_tree(engine, root_np, children, grandchildren):
+    """Egy panel: 'children' gyerek, mindegyik alatt 'grandchildren' unoka widget."""
+    root = engine.add_root(root_np, (-0.2, 0.2, -0.2, 0.2))
+    for i in range(children):
+        child = engine.add(root, root_np.attachNewNode(f'child_{i}'),
+                           anchor=(i / max(children - 1, 1), 0.5),
+                           percent_size=(0.8 / children, 0.5),
+                           base_size=(0.1, 0.1))
+        for j in range(grandchildren):
+            engine.add(child, child.widget.attachNewNode(f'grandchild_{j}'),
+                       anchor=(0.5, j / max(grandchildren - 1, 1)),
+                       percent_size=(0.9, 0.9 / grandchildren),
+                       min_size=(0.01, 0.01), aspect=1.0,
+                       base_size=(0.1, 0.1))
+    return root
+
+
+def main():
+    """
+    Egy panel átméretezésének költsége sok panel mellett: csak a piszkos
+    részfa újraszámítása, illetve a teljes fa újraszámítása (ez felel meg
+    annak, ha minden widget minden képkockán kézzel frissülne).
+
+    Használat: python LayoutEngineBenchmark.py [átméretezések száma]
+    """
+    resizes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'panel':>6} {'widget':>7} {'részfa (us)':>12} {'teljes (us)':>12} {'gyorsulás':>10}")
+    for panels in [10, 100, 1000]:
+        engine = LayoutEngine()
+        scene = NodePath('aspect2d')
+        roots = [make_tree(engine, scene.attachNewNode(f'panel_{i}'), 5, 4) for i in range(panels)]
+        engine.flush()
+        widgets = len(roots) * (1 + 5 + 5 * 4)
+
+        # Egy panel átméretezése képkockánként (több esemény is összevonódik)
+        start = time.perf_counter()
+        for k in range(resizes):
+            half = 0.2 + (k % 10) * 0.01
+            root = roots[k % panels]
+            engine.set_root_rect(root, (-half, half, -half, half))
+            engine.set_root_rect(root, (-half, half, -half, half * 1.1))
+            engine.flush()
+        subtree_us = (time.perf_counter() - start) / resizes * 1e6
+
+        # Referencia: minden gyökér újraszámítása
+        full_runs = max(resizes // 20, 1)
+        start = time.perf_counter()
+        for k in range(full_runs):
+            for root in roots:
+                engine.mark_dirty(root)
+            engine.flush()
+        full_us = (time.perf_counter() - start) / full_runs * 1e6
+
+        print(f"{panels:>6} {widgets:>7} {subtree_us:>12.1f} {full_us:>12.1f} {full_us / subtree_us:>9.1f}x")
+        engine.destroy()
+
+
+if __name__ == '__main__':
+    main()
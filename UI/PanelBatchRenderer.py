@@ -0,0 +1,242 @@
+import bisect
+from array import array
+from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexData, GeomVertexFormat,
+                          GeomVertexWriter, GeomEnums, TransparencyAttrib)
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+
+from PanelManager import Panel, PANEL_BIN
+
+# Az index puffer újraépítése a képkocka végén, a rajzolás (igLoop, sort 50) előtt
+BATCH_TASK_SORT = 46
+
+# Egy panel 8 vertexe: 4 a keret (külső téglalap), 4 a kitöltés (belső téglalap)
+VERTICES_PER_PANEL = 8
+
+# Alapértelmezett kiemelés, ha az egér a panel fölött van (a szín szorzója)
+HOVER_TINT = (1.25, 1.25, 1.25, 1.0)
+
+
+class PanelBatchRenderer:
+    """
+    Egyszerű téglalap panelek (szín, keret, kiemelés) egyetlen Geom-ban:
+    egy dinamikus vertex pufferben, a szín vertex attribútum. Így N panel
+    egy rajzolási hívás, és a szín vagy a határok módosítása csak a panel
+    néhány vertexét írja felül (nincs új node, nincs új render állapot).
+    A rajzolási sorrendet az index puffer adja; ez csak a sorrend
+    változásakor (felülre hozás, új / törölt panel) épül újra, képkockánként
+    legfeljebb egyszer.
+    A teljes köteg egy node: a PANEL_BIN-ben 'sort' értékkel rajzolódik, a
+    különálló DirectFrame panelek közé nem keveredik, ezért egy PanelManager
+    sem kezelhet egyszerre köteg és DirectFrame paneleket.
+    """
+
+    def __init__(self, parent=None, capacity=64, sort=0, name="panel_batch"):
+        self.capacity = capacity
+        self.vdata = GeomVertexData(name, GeomVertexFormat.getV3c4(), Geom.UHDynamic)
+        self.vdata.setNumRows(capacity * VERTICES_PER_PANEL)
+        self.triangles = GeomTriangles(Geom.UHDynamic)
+        self.triangles.setIndexType(GeomEnums.NT_uint32)
+        geom = Geom(self.vdata)
+        geom.addPrimitive(self.triangles)
+        self.geom_node = GeomNode(name)
+        self.geom_node.addGeom(geom)
+        self.geom = self.geom_node.modifyGeom(0)
+
+        self.node = (parent if parent is not None else base.aspect2d).attachNewNode(self.geom_node)
+        self.node.setTransparency(TransparencyAttrib.MAlpha)
+        self.node.setBin(PANEL_BIN, sort)
+
+        self._free = list(range(capacity - 1, -1, -1))   # Szabad helyek
+        self._order = []            # (z, hely) rendezve: a rajzolási sorrend
+        self._z = {}                # hely -> z
+        self._colors = {}           # hely -> (szín, keret szín, szorzó)
+        self._border = {}           # hely -> keret vastagság
+        self._bounds = {}           # hely -> (min_x, max_x, min_y, max_y)
+        self._next_z = 0
+        self._task_name = f"{name}-flush"
+        self._scheduled = False
+
+        # Statisztika (profilozáshoz)
+        self.vertex_write_count = 0
+        self.index_build_count = 0
+
+    def __len__(self):
+        return len(self._z)
+
+    # --- Panelek ---
+
+    def add(self, bounds, color, border_color=None, border_width=0.0, z=None):
+        """Új panel a köteg tetejére. Visszaadja a panel helyét (handle)."""
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self._colors[slot] = (tuple(color), tuple(border_color or color), None)
+        self._border[slot] = border_width
+        self.set_bounds(slot, bounds)
+        self._write_colors(slot)
+        self.set_sort(slot, z)
+        return slot
+
+    def remove(self, slot):
+        z = self._z.pop(slot)
+        del self._order[bisect.bisect_left(self._order, (z, slot))]
+        del self._colors[slot], self._border[slot], self._bounds[slot]
+        self._free.append(slot)
+        self._schedule()
+
+    def set_bounds(self, slot, bounds):
+        """Új határok: a panel 8 vertexének pozíciója íródik felül."""
+        min_x, max_x, min_y, max_y = bounds
+        self._bounds[slot] = (min_x, max_x, min_y, max_y)
+        border = min(self._border[slot], (max_x - min_x) / 2, (max_y - min_y) / 2)
+        writer = GeomVertexWriter(self.vdata, 'vertex')
+        writer.setRow(slot * VERTICES_PER_PANEL)
+        for left, right, bottom, top in ((min_x, max_x, min_y, max_y),
+                                         (min_x + border, max_x - border, min_y + border, max_y - border)):
+            writer.setData3(left, 0, bottom)
+            writer.setData3(right, 0, bottom)
+            writer.setData3(right, 0, top)
+            writer.setData3(left, 0, top)
+        self.vertex_write_count += VERTICES_PER_PANEL
+
+    def get_bounds(self, slot):
+        return self._bounds[slot]
+
+    def set_color(self, slot, color=None, border_color=None):
+        """A kitöltés és/vagy a keret színe: csak a panel szín attribútuma íródik felül."""
+        old_color, old_border_color, tint = self._colors[slot]
+        self._colors[slot] = (tuple(color) if color is not None else old_color,
+                              tuple(border_color) if border_color is not None else old_border_color,
+                              tint)
+        self._write_colors(slot)
+
+    def get_color(self, slot):
+        return self._colors[slot][0]
+
+    def set_tint(self, slot, tint=None):
+        """A kitöltés színének szorzója (pl. HOVER_TINT), None = nincs kiemelés."""
+        color, border_color, old_tint = self._colors[slot]
+        if tint == old_tint:
+            return
+        self._colors[slot] = (color, border_color, tint)
+        self._write_colors(slot)
+
+    def set_sort(self, slot, z=None):
+        """Rajzolási sorrend a kötegen belül (None: a legfelső fölé kerül)."""
+        if z is None:
+            z = self._next_z
+        self._next_z = max(self._next_z, z + 1)
+        old_z = self._z.get(slot)
+        if old_z == z:
+            return
+        if old_z is not None:
+            del self._order[bisect.bisect_left(self._order, (old_z, slot))]
+        self._z[slot] = z
+        bisect.insort(self._order, (z, slot))
+        self._schedule()
+
+    def raise_to_top(self, slot):
+        self.set_sort(slot, None)
+
+    def destroy(self):
+        taskMgr.remove(self._task_name)
+        self._scheduled = False
+        self.node.removeNode()
+
+    # --- Belső működés ---
+
+    def _write_colors(self, slot):
+        color, border_color, tint = self._colors[slot]
+        if tint is not None:
+            color = tuple(min(channel * factor, 1.0) for channel, factor in zip(color, tint))
+        writer = GeomVertexWriter(self.vdata, 'color')
+        writer.setRow(slot * VERTICES_PER_PANEL)
+        for _ in range(4):
+            writer.setData4(*border_color)
+        for _ in range(4):
+            writer.setData4(*color)
+        self.vertex_write_count += VERTICES_PER_PANEL
+
+    def _grow(self):
+        """Kétszeres kapacitás: a vertex puffer bővül, a meglévő adatok maradnak."""
+        old_capacity = self.capacity
+        self.capacity *= 2
+        self.vdata.setNumRows(self.capacity * VERTICES_PER_PANEL)
+        self._free.extend(range(self.capacity - 1, old_capacity - 1, -1))
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            taskMgr.add(self._flush_task, self._task_name, sort=BATCH_TASK_SORT)
+
+    def flush(self):
+        """Az index puffer újraépítése a rajzolási sorrendből (azonnal)."""
+        indices = array('I')
+        for _, slot in self._order:
+            base_row = slot * VERTICES_PER_PANEL
+            if self._border[slot] > 0.0:
+                indices.extend((base_row, base_row + 1, base_row + 2, base_row, base_row + 2, base_row + 3))
+            base_row += 4
+            indices.extend((base_row, base_row + 1, base_row + 2, base_row, base_row + 2, base_row + 3))
+
+        vertices = self.triangles.modifyVertices()
+        vertices.uncleanSetNumRows(len(indices))
+        if indices:
+            memoryview(vertices).cast('B').cast('I')[:] = indices
+        self.triangles.clearMinmax()
+        self.geom.setPrimitive(0, self.triangles)
+        self.index_build_count += 1
+
+    def _flush_task(self, task):
+        self._scheduled = False
+        self.flush()
+        return Task.done
+
+
+class BatchedPanel(Panel):
+    """
+    Egy PanelBatchRenderer-ben rajzolt panel a PanelManager számára: a
+    DirectFrame-es Panel helyett használható (PanelManager.insert_panel), a
+    szín és a határok változása csak a köteg vertexeit írja felül.
+    """
+
+    def __init__(self, renderer, bounds, color, name=None, draggable=True, resizable=False,
+                 border_color=None, border_width=0.0):
+        self._init_panel(None, color, name, draggable, resizable)
+        self.renderer = renderer
+        self.bounds = tuple(bounds)
+        self.slot = renderer.add(self.bounds, color, border_color, border_width)
+
+    def refresh_bounds(self):
+        # A határok itt az elsődleges adatok, nincs mit kiolvasni
+        return self.bounds
+
+    def move_to(self, center_x, center_y):
+        old_x, old_y = self.get_center()
+        dx, dy = center_x - old_x, center_y - old_y
+        min_x, max_x, min_y, max_y = self.bounds
+        self.set_bounds(min_x + dx, max_x + dx, min_y + dy, max_y + dy)
+
+    def set_bounds(self, min_x, max_x, min_y, max_y):
+        self.bounds = (min_x, max_x, min_y, max_y)
+        self.renderer.set_bounds(self.slot, self.bounds)
+
+    def set_color(self, color):
+        self.renderer.set_color(self.slot, color)
+
+    def set_hover(self, hovered, tint=HOVER_TINT):
+        self.renderer.set_tint(self.slot, tint if hovered else None)
+
+    def set_sort(self, z):
+        self.renderer.set_sort(self.slot, z)
+
+    def clear_sort(self):
+        # A köteg sorrendjében marad (mint a DirectFrame a bin nélkül); törlés: destroy()
+        pass
+
+    def destroy(self):
+        self.renderer.remove(self.slot)
+
+    def get_parent(self):
+        return self.renderer.node.getParent()
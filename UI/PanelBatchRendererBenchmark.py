@@ -0,0 +1,98 @@
+import sys
+import time
+import random
+from panda3d.core import loadPrcFileData
+
+from PanelManager import PANEL_BIN
+
+DRAG_COLOR = (0.0, 0.8, 0.0, 0.9)
+BASE_COLOR = (0.3, 0.3, 0.3, 0.9)
+
+
+def random_bounds(rng, count):
+    bounds = []
+    for _ in range(count):
+        x, y = rng.uniform(-0.95, 0.95), rng.uniform(-0.95, 0.95)
+        bounds.append((x - 0.04, x + 0.04, y - 0.04, y + 0.04))
+    return bounds
+
+
+def measure(app, nodes, set_color, colors, frames):
+    """
+    (szín váltás us-ban, képkocka medián us-ban): szín váltás a húzás
+    kezdetén és végén, illetve képkockánként egy panel színváltása.
+    """
+    start = time.perf_counter()
+    for i, node in enumerate(nodes):
+        set_color(node, colors[i % 2])
+    color_us = (time.perf_counter() - start) / len(nodes) * 1e6
+
+    engine = app.graphicsEngine
+    engine.renderFrame()
+    engine.syncFrame()
+    frame_times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        set_color(nodes[i % len(nodes)], colors[i % 2])
+        app.taskMgr.step()
+        engine.renderFrame()
+        engine.syncFrame()
+        frame_times.append((time.perf_counter() - start) * 1e6)
+    return color_us, sorted(frame_times)[len(frame_times) // 2]
+
+
+def main():
+    """
+    N egyszerű panel kirajzolása offscreen: DirectFrame-enként külön node,
+    illetve egyetlen PanelBatchRenderer Geom. Méri a szín váltás (húzás
+    kezdete / vége) költségét és a képkocka időt (képkockánként egy panel
+    színe változik). Szoftveres OpenGL alatt (pl. llvmpipe) a képkocka idő
+    zajos, ezért medián.
+
+    Használat: python PanelBatchRendererBenchmark.py [képkockák száma]
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    loadPrcFileData('', """
+window-type offscreen
+win-size 750 750
+audio-library-name null
+sync-video false
+""")
+    from direct.showbase.ShowBase import ShowBase
+    from direct.gui.DirectFrame import DirectFrame
+    from PanelBatchRenderer import PanelBatchRenderer
+
+    app = ShowBase()
+    print(f"{'panel':>6} {'módszer':>12} {'szín (us)':>10} {'képkocka (us)':>14}")
+    for count in [100, 1000, 5000]:
+        bounds = random_bounds(random.Random(4), count)
+
+        frames_np = []
+        for z, (min_x, max_x, min_y, max_y) in enumerate(bounds):
+            frame = DirectFrame(frameColor=BASE_COLOR,
+                                frameSize=(min_x, max_x, min_y, max_y))
+            frame.setBin(PANEL_BIN, z)
+            frames_np.append(frame)
+
+        def set_frame_color(frame, color):
+            frame['frameColor'] = color
+
+        color_us, frame_us = measure(app, frames_np, set_frame_color, (DRAG_COLOR, BASE_COLOR), frames)
+        print(f"{count:>6} {'DirectFrame':>12} {color_us:>10.2f} {frame_us:>14.1f}")
+        for frame in frames_np:
+            frame.destroy()
+
+        renderer = PanelBatchRenderer(capacity=count)
+        slots = [renderer.add(panel_bounds, BASE_COLOR) for panel_bounds in bounds]
+        renderer.flush()
+
+        def set_batch_color(slot, color):
+            renderer.set_color(slot, color)
+
+        color_us, frame_us = measure(app, slots, set_batch_color, (DRAG_COLOR, BASE_COLOR), frames)
+        print(f"{count:>6} {'köteg':>12} {color_us:>10.2f} {frame_us:>14.1f}")
+        renderer.destroy()
+
+
+if __name__ == '__main__':
+    main()
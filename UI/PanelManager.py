@@ -0,0 +1,539 @@
+from panda3d.core import CardMaker, TransparencyAttrib, MouseWatcher, MouseWatcherRegion
+from direct.showbase.DirectObject import DirectObject
+from direct.task import Task
+
+from LayoutCache import LayoutCache
+from PanelSpatialIndex import PanelSpatialIndex
+
+# Alapértelmezett visszajelző színek
+DRAG_COLOR = (0.0, 0.8, 0.0, 0.9)    # Zöld = húzás
+RESIZE_COLOR = (0.8, 0.1, 0.8, 0.9)  # Lila = méretezés
+
+# A panelek rajzolási sorrendje: a 'fixed' binben a z érték adja a sort értéket
+PANEL_BIN = 'fixed'
+
+# Tűréshatár a sarok érzékeléséhez és a legkisebb panel méret (normált koordinátában)
+RESIZE_TOLERANCE = 0.05
+MIN_PANEL_SIZE = 0.05
+
+# Élő méretezés: ennyiszer másodpercenként íródik vissza a valódi frameSize
+# (közben csak az előnézeti kártya skálázódik); 0 = csak felengedéskor
+LIVE_RESIZE_COMMIT_RATE = 10.0
+PROXY_ALPHA = 0.5
+
+
+class Panel:
+    """
+    Egy DirectFrame és a gyorsítótárazott abszolút határai
+    (min_x, max_x, min_y, max_y) aspect2d koordinátában. A határokat csak a
+    Panel módosítja (move_to, set_bounds), így a találat-vizsgálathoz nem kell
+    a Frame pozícióját és frameSize-át minden kattintásnál újra kiolvasni.
+    """
+
+    renderer = None     # A közös PanelBatchRenderer (csak BatchedPanel-nél)
+
+    def __init__(self, frame, base_color=None, name=None, draggable=True, resizable=False):
+        self._init_panel(frame, base_color if base_color is not None else frame['frameColor'],
+                         name if name is not None else frame['text'], draggable, resizable)
+        self.refresh_bounds()
+
+    def _init_panel(self, frame, base_color, name, draggable, resizable):
+        """A Panel és a leszármazottai (pl. BatchedPanel) közös attribútumai."""
+        self.frame = frame
+        self.base_color = tuple(base_color)
+        self.name = name
+        self.draggable = draggable
+        self.resizable = resizable
+        self.hit_node = None    # A panel gyökere a widget fában (ha van)
+        self.bounds = None
+
+    def refresh_bounds(self):
+        """A határok újraszámítása a Frame pozíciójából és frameSize-ából."""
+        x, y = self.frame.getX(), self.frame.getZ()
+        min_x_size, max_x_size, min_y_size, max_y_size = self.frame['frameSize']
+        self.bounds = (x + min_x_size, x + max_x_size, y + min_y_size, y + max_y_size)
+        return self.bounds
+
+    def get_center(self):
+        min_x, max_x, min_y, max_y = self.bounds
+        return ((min_x + max_x) / 2, (min_y + max_y) / 2)
+
+    def get_size(self):
+        min_x, max_x, min_y, max_y = self.bounds
+        return (max_x - min_x, max_y - min_y)
+
+    def contains(self, x, y):
+        min_x, max_x, min_y, max_y = self.bounds
+        return min_x <= x <= max_x and min_y <= y <= max_y
+
+    def corner_at(self, x, y, tolerance=RESIZE_TOLERANCE):
+        """A pont melletti sarok ('tr', 'tl', 'br', 'bl'), vagy None."""
+        min_x, max_x, min_y, max_y = self.bounds
+        is_right = abs(x - max_x) < tolerance
+        is_left = abs(x - min_x) < tolerance
+        is_top = abs(y - max_y) < tolerance
+        is_bottom = abs(y - min_y) < tolerance
+
+        if is_right and is_top: return 'tr'
+        if is_left and is_top: return 'tl'
+        if is_right and is_bottom: return 'br'
+        if is_left and is_bottom: return 'bl'
+        return None
+
+    def move_to(self, center_x, center_y):
+        """A Frame középpontjának áthelyezése (a méret nem változik)."""
+        old_x, old_y = self.get_center()
+        dx, dy = center_x - old_x, center_y - old_y
+        min_x, max_x, min_y, max_y = self.bounds
+        self.bounds = (min_x + dx, max_x + dx, min_y + dy, max_y + dy)
+        self.frame.setPos(self.frame.getX() + dx, 0, self.frame.getZ() + dy)
+
+    def set_bounds(self, min_x, max_x, min_y, max_y):
+        """Új abszolút határok: a frameSize a középpontra szimmetrikus lesz."""
+        width = max_x - min_x
+        height = max_y - min_y
+        self.frame['frameSize'] = (-width / 2, width / 2, -height / 2, height / 2)
+        self.frame.setPos(min_x + width / 2, 0, min_y + height / 2)
+        self.bounds = (min_x, max_x, min_y, max_y)
+
+    def set_color(self, color):
+        self.frame['frameColor'] = color
+
+    def reset_color(self):
+        self.set_color(self.base_color)
+
+    def set_sort(self, z):
+        """Rajzolási sorrend: a z érték a PANEL_BIN sort értéke."""
+        self.frame.setBin(PANEL_BIN, z)
+
+    def clear_sort(self):
+        self.frame.clearBin()
+
+    def get_parent(self):
+        """A NodePath, amely alá a panel rajzolódik (ide kerül az előnézeti kártya)."""
+        return self.frame.getParent()
+
+
+class PanelManager(DirectObject):
+    """
+    Panelek közös kezelése: találat-vizsgálat (térbeli index), húzás,
+    méretezés sarkoknál, z-sorrend és színes visszajelzés. A z-sorrend egy
+    monoton növekvő számláló: a felülre hozás új, legnagyobb z értéket ad a
+    panelnek, ez egyben a rajzolási sort érték is (nincs reparentTo).
+    Az alkalmazások csak a paneleket adják hozzá, és a visszahívásokban
+    frissítik a saját feliratukat:
+      - on_press(panel, action, corner): action: 'drag', 'resize' vagy 'click'
+      - on_move(panel, action): húzás/méretezés közben, csak ha az egér mozdult
+      - on_release(panel, action)
+      - on_miss(x, y): kattintás üres területre
+      - on_commit(panel): a méretezés új frameSize-a érvénybe lépett
+      - on_hover(panel, hovered): az egér a panel fölé ért / elhagyta
+        (csak track_hover=True vagy use_regions=True mellett)
+    Ha van widget fa (hit_tree), a panelen belüli kattintás előbb a panel
+    gyerek widgetjein halad végig ('press' esemény, capture és bubble); ha
+    valamelyik megállítja, a panel húzása nem indul el.
+    A frissítő feladat csak lenyomott egérgomb mellett fut. Az egér
+    koordinátáit a LayoutCache váltja át aspect2d koordinátára, így a
+    találat-vizsgálat az ablak átméretezése után is helyes.
+
+    Élő méretezésnél (live_resize=True) a DirectFrame nem generálja újra a
+    geometriáját minden képkockán: egy átlátszó előnézeti kártya mutatja az új
+    határokat (csak pozíció és skála változik), a valódi frameSize pedig
+    legfeljebb commit_rate-szor másodpercenként és felengedéskor íródik vissza.
+
+    use_regions=True esetén minden panelhez egy MouseWatcherRegion tartozik
+    (a határokat és a z sorrendet követi), egy saját MouseWatcher-ben. A
+    lenyomás és a hover (belépés / kilépés) felismerése így a C++
+    MouseWatcher-ben történik, Pythonban csak a keletkező események futnak;
+    egér mozgás közben nincs képkockánkénti találat-vizsgálat. A saját
+    MouseWatcher a base.mouseWatcher alatt van, így amit egy DirectGUI widget
+    elnyel (suppressMouse), az ide sem jut el.
+    A lenyomások mindkét úton ugyanazok, a hover viszont eltér, amíg az
+    egérgomb lenyomva van: a MouseWatcher ilyenkor a lenyomás helyéhez köti
+    az egeret, így a natív út a többi panelre nem jelez belépést, a kézi út
+    igen. Felengedés után a hover állapot ismét azonos.
+    """
+
+    def __init__(self, resize_tolerance=RESIZE_TOLERANCE, min_size=MIN_PANEL_SIZE,
+                 drag_color=DRAG_COLOR, resize_color=RESIZE_COLOR, cell_size=0.25,
+                 live_resize=True, commit_rate=LIVE_RESIZE_COMMIT_RATE, layout=None,
+                 hit_tree=None, use_regions=False, track_hover=False, name="panel_manager"):
+        self.layout = layout if layout is not None else LayoutCache()
+        self.layout.add_listener(self._on_layout_changed)
+        self.resize_tolerance = resize_tolerance
+        self.min_size = min_size
+        self.drag_color = drag_color
+        self.resize_color = resize_color
+        self.index = PanelSpatialIndex(cell_size)
+        self.hit_tree = hit_tree
+        self.panels = []
+        self.live_resize = live_resize
+        self.commit_interval = 1.0 / commit_rate if commit_rate else None
+
+        # Visszahívások (az alkalmazás állítja be)
+        self.on_press = None
+        self.on_move = None
+        self.on_release = None
+        self.on_miss = None
+        self.on_commit = None
+        self.on_hover = None
+
+        # Aktív interakció állapota
+        self.active_panel = None
+        self.action = None
+        self.corner = None
+        self.drag_offset = (0.0, 0.0)
+        self.last_mouse = None
+        self.live_bounds = None     # Méretezés közben az előnézet határai
+        self._last_commit = 0.0
+        self._proxy = None          # Előnézeti kártya (egyszer jön létre, újrahasznosítva)
+        self._task_name = f"{name}-interaction"
+        self.hovered_panel = None
+
+        # Natív találat-vizsgálat: panel <-> MouseWatcherRegion
+        self.region_watcher = None
+        self._regions = {}
+        self._region_panels = {}
+        self._region_count = 0
+        self._name = name
+        if use_regions:
+            self._setup_regions()
+        elif track_hover:
+            # Kézi hover: képkockánként egy találat-vizsgálat Pythonban
+            base.taskMgr.add(self._hover_task, f"{name}-hover")
+
+        self.accept('mouse1', self._on_mouse_down)
+        self.accept('mouse1-up', self._on_mouse_up)
+
+    # --- Panelek ---
+
+    def add_panel(self, frame, base_color=None, name=None, draggable=True, resizable=False):
+        """Egy DirectFrame felvétele; a panel az eddigiek fölé kerül."""
+        panel = Panel(frame, base_color, name, draggable, resizable)
+        if self.hit_tree is not None:
+            panel.hit_node = self.hit_tree.add(frame, name=panel.name)
+        return self.insert_panel(panel)
+
+    def insert_panel(self, panel):
+        """
+        Egy már létrehozott panel (pl. BatchedPanel) felvétele az eddigiek fölé.
+        Egy PanelManager panelei vagy mind DirectFrame-ek, vagy mind ugyanannak
+        a PanelBatchRenderer-nek a panelei: a köteg egyetlen node, a z értéke
+        csak a kötegen belüli sorrendet adja, így vegyes paneleknél a
+        találat-vizsgálat és a rajzolás sorrendje eltérne.
+        """
+        if self.panels and panel.renderer is not self.panels[0].renderer:
+            raise ValueError(f"A(z) {panel.name} panel nem keverhető a PanelManager "
+                             f"többi panelével (DirectFrame / más köteg)")
+        self.panels.append(panel)
+        z = self.index.insert(panel, panel.bounds)
+        panel.set_sort(z)
+        if self.region_watcher is not None:
+            self._add_region(panel, z)
+        return panel
+
+    def remove_panel(self, panel):
+        if panel is self.active_panel:
+            self.release()
+        self.panels.remove(panel)
+        self.index.remove(panel)
+        if panel.hit_node is not None:
+            self.hit_tree.remove(panel.hit_node)
+            panel.hit_node = None
+        if panel in self._regions:
+            region = self._regions.pop(panel)
+            del self._region_panels[region]
+            self.region_watcher.removeRegion(region)
+        if panel is self.hovered_panel:
+            self._set_hovered(None)
+        panel.clear_sort()
+
+    def raise_panel(self, panel):
+        """
+        A panel felülre hozása (kirajzolás és találat-vizsgálat szerint is).
+        Csak a sort érték változik: a scene graph szerkezete és a gyorsítótárazott
+        határok érintetlenek maradnak.
+        """
+        if self.index.get_z(panel) == self.index.top_z:
+            return
+        z = self.index.raise_to_top(panel)
+        panel.set_sort(z)
+        if panel in self._regions:
+            self._regions[panel].setSort(z)
+        if panel.hit_node is not None:
+            self.hit_tree.raise_node(panel.hit_node)
+
+    def hit_test(self, x, y):
+        """A pontot tartalmazó legfelső panel (vagy None)."""
+        return self.index.hit_test(x, y)
+
+    def get_interaction(self, x, y, panel=None):
+        """
+        (panel, action, corner) a pontra; action: 'resize', 'drag', 'click' vagy None.
+        Ha a panel ismert (pl. a MouseWatcherRegion-ből), nincs találat-vizsgálat.
+        """
+        if panel is None:
+            panel = self.hit_test(x, y)
+        if panel is None:
+            return None, None, None
+        if panel.resizable:
+            corner = panel.corner_at(x, y, self.resize_tolerance)
+            if corner:
+                return panel, 'resize', corner
+        return panel, ('drag' if panel.draggable else 'click'), None
+
+    # --- Interakció ---
+
+    def press(self, x, y, panel=None):
+        """Interakció indítása a pontban. Visszaadja: (panel, action, corner)."""
+        self.release(notify=False)
+        panel, action, corner = self.get_interaction(x, y, panel)
+        if panel is None:
+            if self.on_miss:
+                self.on_miss(x, y)
+            return None, None, None
+
+        # A panel gyerek widgetjei kapják először (a méretező sarok a panelé)
+        if action != 'resize' and panel.hit_node is not None:
+            hit_event = self.hit_tree.dispatch('press', x, y, root=panel.hit_node)
+            if hit_event is not None and hit_event.stopped:
+                return panel, None, None
+
+        if action != 'click':
+            self.active_panel = panel
+            self.action = action
+            self.corner = corner
+            center_x, center_y = panel.get_center()
+            self.drag_offset = (center_x - x, center_y - y)
+            self.last_mouse = (x, y)
+            panel.set_color(self.resize_color if action == 'resize' else self.drag_color)
+            self.raise_panel(panel)
+            if action == 'resize':
+                self.live_bounds = panel.bounds
+                self._last_commit = globalClock.getFrameTime()
+                if self.live_resize:
+                    self._show_proxy(panel)
+            base.taskMgr.add(self._interaction_task, self._task_name)
+
+        if self.on_press:
+            self.on_press(panel, action, corner)
+        return panel, action, corner
+
+    def move(self, x, y):
+        """Az aktív panel igazítása az egérhez. Visszaadja, hogy történt-e változás."""
+        panel = self.active_panel
+        if panel is None or (x, y) == self.last_mouse:
+            return False
+        self.last_mouse = (x, y)
+
+        if self.action == 'drag':
+            panel.move_to(x + self.drag_offset[0], y + self.drag_offset[1])
+            self._update_panel(panel)
+        else:
+            min_x, max_x, min_y, max_y = self.live_bounds
+            corner = self.corner
+            # A szemközti oldal a helyén marad, a méret nem lesz kisebb min_size-nál
+            if 'r' in corner: max_x = max(x, min_x + self.min_size)
+            elif 'l' in corner: min_x = min(x, max_x - self.min_size)
+            if 't' in corner: max_y = max(y, min_y + self.min_size)
+            elif 'b' in corner: min_y = min(y, max_y - self.min_size)
+            self.live_bounds = (min_x, max_x, min_y, max_y)
+
+            if not self.live_resize:
+                self.commit_resize()
+            else:
+                # Előnézet: csak a kártya transzformációja változik
+                self._place_proxy(self.live_bounds)
+                now = globalClock.getFrameTime()
+                if self.commit_interval is not None and now - self._last_commit >= self.commit_interval:
+                    self.commit_resize()
+
+        if self.on_move:
+            self.on_move(panel, self.action)
+        return True
+
+    def release(self, notify=True):
+        """Az aktív interakció lezárása (szín visszaállítása, feladat leállítása)."""
+        panel, action = self.active_panel, self.action
+        if panel is None:
+            return
+        base.taskMgr.remove(self._task_name)
+        if action == 'resize':
+            self.commit_resize()
+            self.live_bounds = None
+            if self._proxy is not None:
+                self._proxy.stash()
+        panel.reset_color()
+        self.active_panel = None
+        self.action = None
+        self.corner = None
+        self.last_mouse = None
+        if notify and self.on_release:
+            self.on_release(panel, action)
+
+    def get_live_size(self):
+        """Az aktív panel mérete (méretezés közben az előnézet szerint)."""
+        if self.live_bounds is not None:
+            min_x, max_x, min_y, max_y = self.live_bounds
+            return (max_x - min_x, max_y - min_y)
+        return self.active_panel.get_size() if self.active_panel else None
+
+    def commit_resize(self):
+        """Az előnézet határainak visszaírása a panelre (frameSize és pozíció)."""
+        panel = self.active_panel
+        self._last_commit = globalClock.getFrameTime()
+        if panel is None or self.live_bounds is None or self.live_bounds == panel.bounds:
+            return
+        panel.set_bounds(*self.live_bounds)
+        self._update_panel(panel)
+        if self.on_commit:
+            self.on_commit(panel)
+
+    def set_panel_bounds(self, panel, bounds):
+        """A panel új abszolút határai (frameSize és pozíció), az indexszel együtt."""
+        panel.set_bounds(*bounds)
+        self._update_panel(panel)
+
+    def refresh_all_bounds(self):
+        """Minden panel határának újraszámítása (pl. ablak átméretezés után)."""
+        for panel in self.panels:
+            panel.refresh_bounds()
+            self._update_panel(panel)
+
+    def _update_panel(self, panel):
+        """A panel határai változtak: index és a widget fa gyorsítótára."""
+        self.index.update(panel, panel.bounds)
+        if panel.hit_node is not None:
+            self.hit_tree.invalidate(panel.hit_node)
+        if panel in self._regions:
+            self._place_region(self._regions[panel], panel.bounds)
+
+    def destroy(self):
+        self.release(notify=False)
+        self.ignoreAll()
+        base.taskMgr.remove(f"{self._name}-hover")
+        if self.region_watcher is not None:
+            self._region_watcher_np.removeNode()
+            self.region_watcher = None
+            self._regions.clear()
+            self._region_panels.clear()
+        self.layout.remove_listener(self._on_layout_changed)
+        if self._proxy is not None:
+            self._proxy.removeNode()
+            self._proxy = None
+
+    # --- Előnézeti kártya ---
+
+    def _show_proxy(self, panel):
+        """Az előnézeti kártya a panel fölé (a kártya egységnyi, a skála adja a méretét)."""
+        if self._proxy is None:
+            cm = CardMaker('resize_proxy')
+            cm.setFrame(-0.5, 0.5, -0.5, 0.5)
+            self._proxy = panel.get_parent().attachNewNode(cm.generate())
+            self._proxy.setTransparency(TransparencyAttrib.MAlpha)
+            self._proxy.setColor(self.resize_color[0], self.resize_color[1], self.resize_color[2], PROXY_ALPHA)
+        elif self._proxy.getParent() != panel.get_parent():
+            self._proxy.reparentTo(panel.get_parent())
+        self._proxy.unstash()
+        self._proxy.setBin(PANEL_BIN, self.index.get_z(panel) + 1)
+        self._place_proxy(panel.bounds)
+
+    def _place_proxy(self, bounds):
+        min_x, max_x, min_y, max_y = bounds
+        self._proxy.setPos((min_x + max_x) / 2, 0, (min_y + max_y) / 2)
+        self._proxy.setScale(max(max_x - min_x, 1e-4), 1, max(max_y - min_y, 1e-4))
+
+    # --- MouseWatcherRegion-ök ---
+
+    def _setup_regions(self):
+        """Saját MouseWatcher a panelek régióinak; az eseményei a régiót adják paraméterként."""
+        self.region_watcher = MouseWatcher(f"{self._name}-regions")
+        self._region_watcher_np = base.mouseWatcher.attachNewNode(self.region_watcher)
+        self.region_watcher.setEnterPattern(f"{self._name}-enter")
+        self.region_watcher.setLeavePattern(f"{self._name}-leave")
+        self.region_watcher.setButtonDownPattern(f"{self._name}-press-%b")
+        self.accept(f"{self._name}-enter", self._on_region_enter)
+        self.accept(f"{self._name}-leave", self._on_region_leave)
+        self.accept(f"{self._name}-press-mouse1", self._on_region_press)
+
+    def _add_region(self, panel, z):
+        self._region_count += 1
+        region = MouseWatcherRegion(f"{self._name}-{self._region_count}", 0, 0, 0, 0)
+        region.setSort(z)
+        self._place_region(region, panel.bounds)
+        self.region_watcher.addRegion(region)
+        self._regions[panel] = region
+        self._region_panels[region] = panel
+
+    def _place_region(self, region, bounds):
+        """A régió kerete az egér (render2d) koordinátáiban."""
+        min_x, max_x, min_y, max_y = bounds
+        left, bottom = self.layout.aspect_to_norm(min_x, min_y)
+        right, top = self.layout.aspect_to_norm(max_x, max_y)
+        region.setFrame(left, right, bottom, top)
+
+    def _on_region_enter(self, region, button):
+        panel = self._region_panels.get(region)
+        if panel is not None:
+            self._set_hovered(panel)
+
+    def _on_region_leave(self, region, button):
+        if self._region_panels.get(region) is self.hovered_panel:
+            self._set_hovered(None)
+
+    def _on_region_press(self, region, button):
+        panel = self._region_panels.get(region)
+        mouse = self.get_mouse()
+        if panel is not None and mouse is not None:
+            self.press(mouse[0], mouse[1], panel)
+
+    # --- Hover ---
+
+    def _set_hovered(self, panel):
+        old_panel = self.hovered_panel
+        if panel is old_panel:
+            return
+        self.hovered_panel = panel
+        if self.on_hover:
+            if old_panel is not None:
+                self.on_hover(old_panel, False)
+            if panel is not None:
+                self.on_hover(panel, True)
+
+    def _hover_task(self, task):
+        mouse = self.get_mouse()
+        self._set_hovered(self.hit_test(*mouse) if mouse is not None else None)
+        return Task.cont
+
+    # --- Egér események ---
+
+    def get_mouse(self):
+        """Az egér pozíciója aspect2d koordinátában (vagy None)."""
+        if not base.mouseWatcherNode.hasMouse():
+            return None
+        mouse = base.mouseWatcherNode.getMouse()
+        return self.layout.norm_to_aspect(mouse.getX(), mouse.getY())
+
+    def _on_layout_changed(self, layout):
+        self.refresh_all_bounds()
+
+    def _on_mouse_down(self):
+        mouse = self.get_mouse()
+        if mouse is None:
+            return
+        if self.region_watcher is None:
+            self.press(*mouse)
+        elif self.region_watcher.getOverRegion() is None:
+            # Panelen belüli lenyomás a régió eseményéből jön; itt csak az üres terület
+            self.release(notify=False)
+            if self.on_miss:
+                self.on_miss(*mouse)
+
+    def _on_mouse_up(self):
+        self.release()
+
+    def _interaction_task(self, task):
+        mouse = self.get_mouse()
+        if mouse is not None:
+            self.move(*mouse)
+        return Task.cont
@@ -0,0 +1,174 @@
+import sys
+import time
+import random
+from panda3d.core import loadPrcFileData
+
+from PanelManager import PanelManager
+
+# A Pythonban futó belépési pontok: ezek ideje a "Python" oszlop
+TIMED_METHODS = ['_hover_task', '_on_region_enter', '_on_region_leave', '_on_region_press',
+                 '_on_mouse_down', '_on_mouse_up', '_interaction_task']
+
+
+class TimedPanelManager(PanelManager):
+    """PanelManager, amely méri a Python eseménykezelőkben és feladatokban töltött időt."""
+
+    python_time = 0.0
+    python_calls = 0
+
+
+def _timed(name):
+    method = getattr(PanelManager, name)
+
+    def wrapper(self, *args):
+        start = time.perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            self.python_time += time.perf_counter() - start
+            self.python_calls += 1
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in TIMED_METHODS:
+    setattr(TimedPanelManager, _name, _timed(_name))
+
+
+def make_script(frames, rng):
+    """Egér út: végigsöpör a képernyőn, közben néha lenyom, húz és felenged."""
+    script = []
+    x, y = -0.95, -0.95
+    for i in range(frames):
+        x = -0.95 + (i * 0.013) % 1.9
+        y = -0.95 + (i * 0.0071) % 1.9
+        if i % 50 == 10:
+            script.append(('press', x, y))
+        elif i % 50 == 20:
+            script.append(('release', x, y))
+        else:
+            script.append(('move', x, y))
+    return script
+
+
+def free_frames(script):
+    """Képkockánként: az egérgomb az egész képkocka alatt fel van engedve."""
+    free = []
+    held = False
+    for kind, x, y in script:
+        if kind == 'press':
+            held = True
+        free.append(not held and kind != 'release')
+        if kind == 'release':
+            held = False
+    return free
+
+
+def run(app, layout, renderer_class, panel_class, count, mode, script):
+    """
+    Egy mérés: (képkocka us, Python us / képkocka, Python hívás / képkocka,
+    hover váltás, lenyomások, hover állapot). A lenyomások (képkocka, panel
+    neve vagy None, művelet) hármasok; a hover állapot képkockánként a
+    kiemelt panel neve (vagy None).
+    """
+    manager = TimedPanelManager(layout=layout, use_regions=(mode == 'natív'),
+                                track_hover=(mode == 'kézi'), name=f"bench_{mode}_{count}")
+    app.panel_manager = manager
+    renderer = renderer_class(capacity=count)
+    rng = random.Random(5)
+    for i in range(count):
+        x, y = rng.uniform(-0.95, 0.95), rng.uniform(-0.95, 0.95)
+        manager.insert_panel(panel_class(renderer, (x - 0.04, x + 0.04, y - 0.04, y + 0.04),
+                                         (0.3, 0.3, 0.3, 0.9), name=f"panel_{i}"))
+    hover_changes = [0]
+    presses = []
+    hover_states = []
+    frame = [0]
+
+    def on_hover(panel, hovered):
+        hover_changes[0] += 1
+        panel.set_hover(hovered)
+    manager.on_hover = on_hover
+    manager.on_press = lambda panel, action, corner: presses.append((frame[0], panel.name, action))
+    manager.on_miss = lambda x, y: presses.append((frame[0], None, None))
+
+    for _ in range(5):
+        app.taskMgr.step()
+    manager.python_time = 0.0
+    manager.python_calls = 0
+
+    mouse = app.virtual_input
+    start = time.perf_counter()
+    for frame[0], (kind, x, y) in enumerate(script):
+        mouse.move(x, y)
+        if kind == 'press':
+            mouse.press()
+        elif kind == 'release':
+            mouse.release()
+        app.taskMgr.step()
+        hovered = manager.hovered_panel
+        hover_states.append(hovered.name if hovered is not None else None)
+    frame_us = (time.perf_counter() - start) / len(script) * 1e6
+    python_us = manager.python_time / len(script) * 1e6
+    calls = manager.python_calls / len(script)
+
+    manager.destroy()
+    renderer.destroy()
+    return frame_us, python_us, calls, hover_changes[0], presses, hover_states
+
+
+def main():
+    """
+    Hover és lenyomás felismerése sok panel mellett: kézi út (képkockánként
+    egér lekérdezés és találat-vizsgálat Pythonban), illetve natív út
+    (panelenként egy MouseWatcherRegion, Pythonban csak az enter / leave /
+    press események). Az egér végigsöpör a paneleken, közben időnként húz.
+    A "Python" oszlop a PanelManager kezelőiben és feladataiban töltött idő.
+
+    A két út lenyomásainak (panel és művelet) meg kell egyezniük, a hover
+    állapotnak pedig minden olyan képkockán, amikor az egérgomb fel van
+    engedve. Lenyomott gomb mellett a natív út nem jelez hovert más
+    panelekre (a MouseWatcher a lenyomás helyéhez köti az egeret), ezért a
+    hover váltások száma eltérhet.
+
+    Használat: python PanelRegionBenchmark.py [képkockák száma]
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    loadPrcFileData('', """
+window-type offscreen
+win-size 750 750
+audio-library-name null
+sync-video false
+""")
+    from direct.showbase.ShowBase import ShowBase
+    from LayoutCache import LayoutCache
+    from PanelBatchRenderer import PanelBatchRenderer, BatchedPanel
+    from InputReplayBenchmark import VirtualInput
+
+    app = ShowBase()
+    app.win.setActive(False) # Csak az input és a Python kód ideje számít
+    app.virtual_input = VirtualInput(app, 750, 750)
+    layout = LayoutCache()
+    app.panel_manager = None
+    script = make_script(frames, random.Random(6))
+    free = free_frames(script)
+
+    print(f"{'panel':>6} {'mód':>6} {'képkocka (us)':>14} {'Python (us)':>12} "
+          f"{'hívás/képk.':>12} {'hover váltás':>13}")
+    for count in [10, 100, 1000, 5000]:
+        results = {}
+        for mode in ['kézi', 'natív']:
+            frame_us, python_us, calls, hover_changes, presses, hover_states = run(
+                app, layout, PanelBatchRenderer, BatchedPanel, count, mode, script)
+            results[mode] = (presses, hover_states)
+            print(f"{count:>6} {mode:>6} {frame_us:>14.1f} {python_us:>12.1f} "
+                  f"{calls:>12.2f} {hover_changes:>13}")
+        (manual_presses, manual_hover), (native_presses, native_hover) = results['kézi'], results['natív']
+        assert manual_presses == native_presses
+        assert all(m == n for m, n, is_free in zip(manual_hover, native_hover, free) if is_free)
+        print(f"{'':>6} egyező lenyomások: {len(manual_presses)}, "
+              f"egyező hover állapot: {sum(free)} képkockán")
+
+
+if __name__ == '__main__':
+    main()
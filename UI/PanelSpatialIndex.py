@@ -0,0 +1,143 @@
+import math
+
+
+class PanelSpatialIndex:
+    """
+    Egyenletes rács alapú térbeli index a panelek határaihoz (aspect2d koordinátában).
+    Minden panel a határai által lefedett rácscellákba kerül, a z érték (rajzolási
+    sorrend) alapján dől el, melyik van felül. A találat-vizsgálat csak a kattintás
+    cellájában lévő paneleket nézi meg, nem az összeset.
+    """
+
+    def __init__(self, cell_size=0.25):
+        self.cell_size = float(cell_size)
+        self._cells = {}      # (cx, cy) -> panelek halmaza
+        self._bounds = {}     # panel -> (min_x, max_x, min_y, max_y)
+        self._ranges = {}     # panel -> (cx0, cx1, cy0, cy1) lefedett cellák
+        self._z = {}          # panel -> z érték (nagyobb = feljebb)
+        self._z_counter = 0
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, panel):
+        return panel in self._bounds
+
+    # --- Segédfüggvények ---
+
+    def _cell_range(self, bounds):
+        min_x, max_x, min_y, max_y = bounds
+        size = self.cell_size
+        return (math.floor(min_x / size), math.floor(max_x / size),
+                math.floor(min_y / size), math.floor(max_y / size))
+
+    def _add_cells(self, panel, cell_range):
+        cx0, cx1, cy0, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is None:
+                    cell = self._cells[(cx, cy)] = set()
+                cell.add(panel)
+
+    def _remove_cells(self, panel, cell_range):
+        cx0, cx1, cy0, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(panel)
+                    if not cell:
+                        del self._cells[(cx, cy)]
+
+    # --- Módosítás ---
+
+    def insert(self, panel, bounds, z=None):
+        """Új panel felvétele. Ha nincs megadva z, a panel minden eddigi fölé kerül."""
+        if panel in self._bounds:
+            self.remove(panel)
+        if z is None:
+            self._z_counter += 1
+            z = self._z_counter
+        else:
+            self._z_counter = max(self._z_counter, z)
+        bounds = tuple(bounds)
+        cell_range = self._cell_range(bounds)
+        self._bounds[panel] = bounds
+        self._ranges[panel] = cell_range
+        self._z[panel] = z
+        self._add_cells(panel, cell_range)
+        return z
+
+    def update(self, panel, bounds):
+        """
+        A panel határainak frissítése (húzás, méretezés). Csak akkor nyúl a
+        cellákhoz, ha a lefedett cellatartomány megváltozott.
+        """
+        bounds = tuple(bounds)
+        self._bounds[panel] = bounds
+        old_range = self._ranges[panel]
+        new_range = self._cell_range(bounds)
+        if new_range != old_range:
+            self._remove_cells(panel, old_range)
+            self._add_cells(panel, new_range)
+            self._ranges[panel] = new_range
+
+    def remove(self, panel):
+        self._remove_cells(panel, self._ranges.pop(panel))
+        del self._bounds[panel]
+        del self._z[panel]
+
+    def raise_to_top(self, panel):
+        """A panel a legfelső lesz (új, minden eddiginél nagyobb z érték, O(1))."""
+        self._z_counter += 1
+        self._z[panel] = self._z_counter
+        return self._z_counter
+
+    @property
+    def top_z(self):
+        """Az eddig kiosztott legnagyobb z érték."""
+        return self._z_counter
+
+    # --- Lekérdezés ---
+
+    def get_bounds(self, panel):
+        return self._bounds[panel]
+
+    def get_z(self, panel):
+        return self._z[panel]
+
+    def get_z_order(self):
+        """A panelek alulról felfelé (z szerint növekvő sorrendben)."""
+        return sorted(self._z, key=self._z.__getitem__)
+
+    def query_point(self, x, y):
+        """Az összes panel, amely tartalmazza a pontot, felülről lefelé rendezve."""
+        size = self.cell_size
+        cell = self._cells.get((math.floor(x / size), math.floor(y / size)))
+        if not cell:
+            return []
+        hits = []
+        for panel in cell:
+            min_x, max_x, min_y, max_y = self._bounds[panel]
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                hits.append(panel)
+        hits.sort(key=self._z.__getitem__, reverse=True)
+        return hits
+
+    def hit_test(self, x, y):
+        """A pontot tartalmazó legfelső panel (vagy None)."""
+        size = self.cell_size
+        cell = self._cells.get((math.floor(x / size), math.floor(y / size)))
+        if not cell:
+            return None
+        best = None
+        best_z = None
+        z_of = self._z
+        for panel in cell:
+            min_x, max_x, min_y, max_y = self._bounds[panel]
+            if min_x <= x <= max_x and min_y <= y <= max_y:
+                z = z_of[panel]
+                if best_z is None or z > best_z:
+                    best, best_z = panel, z
+        return best
@@ -0,0 +1,85 @@
+import sys
+import time
+import random
+
+from PanelSpatialIndex import PanelSpatialIndex
+
+
+def make_panels(count, seed=1):
+    """Véletlen panelek (min_x, max_x, min_y, max_y) határokkal a [-1, 1] tartományban."""
+    rng = random.Random(seed)
+    panels = []
+    for i in range(count):
+        half_w = rng.uniform(0.01, 0.08)
+        half_h = rng.uniform(0.01, 0.08)
+        x = rng.uniform(-1.0, 1.0)
+        y = rng.uniform(-1.0, 1.0)
+        panels.append((f"panel_{i}", (x - half_w, x + half_w, y - half_h, y + half_h)))
+    return panels
+
+
+def hit_test_linear(frame_list, bounds, x, y):
+    """Referencia: az alkalmazások korábbi, fordított sorrendű lineáris keresése."""
+    for frame in reversed(frame_list):
+        min_x, max_x, min_y, max_y = bounds[frame]
+        if min_x <= x <= max_x and min_y <= y <= max_y:
+            return frame
+    return None
+
+
+def main():
+    """
+    A PanelSpatialIndex találat-vizsgálata, frissítése és felülre hozása 10 000
+    panelig, összevetve a lineáris (reversed(frame_list)) kereséssel.
+
+    Használat: python PanelSpatialIndexBenchmark.py [lekérdezések száma]
+    """
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(2)
+    points = [(rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0)) for _ in range(queries)]
+
+    print(f"{'panel':>7} {'index (us)':>11} {'lineáris (us)':>14} {'gyorsulás':>10} "
+          f"{'update (us)':>12} {'raise (us)':>11}")
+    for count in [10, 100, 1000, 10000]:
+        panels = make_panels(count)
+        index = PanelSpatialIndex(cell_size=0.05)
+        frame_list = []
+        bounds = {}
+        for name, panel_bounds in panels:
+            index.insert(name, panel_bounds)
+            frame_list.append(name)
+            bounds[name] = panel_bounds
+
+        # Ellenőrzés: mindkét módszer ugyanazt a legfelső panelt adja
+        for x, y in points[:200]:
+            assert index.hit_test(x, y) == hit_test_linear(frame_list, bounds, x, y)
+
+        start = time.perf_counter()
+        for x, y in points:
+            index.hit_test(x, y)
+        index_us = (time.perf_counter() - start) / queries * 1e6
+
+        start = time.perf_counter()
+        for x, y in points:
+            hit_test_linear(frame_list, bounds, x, y)
+        linear_us = (time.perf_counter() - start) / queries * 1e6
+
+        # Húzás: kis elmozdulások (a cellatartomány ritkán változik)
+        name, (min_x, max_x, min_y, max_y) = panels[0]
+        start = time.perf_counter()
+        for i in range(queries):
+            dx = (i % 100) * 0.002
+            index.update(name, (min_x + dx, max_x + dx, min_y, max_y))
+        update_us = (time.perf_counter() - start) / queries * 1e6
+
+        start = time.perf_counter()
+        for i in range(queries):
+            index.raise_to_top(panels[i % count][0])
+        raise_us = (time.perf_counter() - start) / queries * 1e6
+
+        print(f"{count:>7} {index_us:>11.2f} {linear_us:>14.2f} {linear_us / index_us:>9.1f}x "
+              f"{update_us:>12.2f} {raise_us:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
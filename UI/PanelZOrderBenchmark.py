@@ -0,0 +1,69 @@
+import sys
+import time
+import random
+from panda3d.core import NodePath, CardMaker
+
+from PanelSpatialIndex import PanelSpatialIndex
+
+
+def make_scene(count, seed=1):
+    """'count' kártya egy aspect2d-szerű gyökér alatt (a DirectFrame-ek helyett)."""
+    rng = random.Random(seed)
+    root = NodePath('aspect2d')
+    cards = []
+    for i in range(count):
+        cm = CardMaker(f'panel_{i}')
+        x = rng.uniform(-1.0, 1.0)
+        y = rng.uniform(-1.0, 1.0)
+        cm.setFrame(x - 0.05, x + 0.05, y - 0.05, y + 0.05)
+        cards.append(root.attachNewNode(cm.generate()))
+    return root, cards
+
+
+def raise_reparent(root, frame_list, card):
+    """Referencia: lista csere + reparentTo (a korábbi alkalmazások módszere)."""
+    frame_list.remove(card)
+    frame_list.append(card)
+    card.reparentTo(root)
+
+
+def raise_sort(index, card):
+    """Új, legnagyobb z érték -> rajzolási sort érték (PanelManager.raise_panel)."""
+    card.setBin('fixed', index.raise_to_top(card))
+
+
+def main():
+    """
+    Panel felülre hozásának költsége 100-tól 10 000 panelig: lista csere és
+    reparentTo, illetve monoton z számláló és setBin.
+
+    Használat: python PanelZOrderBenchmark.py [felülre hozások száma]
+    """
+    raises = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{'panel':>7} {'reparent (us)':>14} {'sort (us)':>10} {'gyorsulás':>10}")
+    for count in [100, 1000, 10000]:
+        rng = random.Random(2)
+        order = [rng.randrange(count) for _ in range(raises)]
+
+        root, cards = make_scene(count)
+        frame_list = list(cards)
+        start = time.perf_counter()
+        for i in order:
+            raise_reparent(root, frame_list, cards[i])
+        reparent_us = (time.perf_counter() - start) / raises * 1e6
+
+        root, cards = make_scene(count)
+        index = PanelSpatialIndex()
+        for card in cards:
+            card.setBin('fixed', index.insert(card, (0.0, 0.0, 0.0, 0.0)))
+        start = time.perf_counter()
+        for i in order:
+            raise_sort(index, cards[i])
+        sort_us = (time.perf_counter() - start) / raises * 1e6
+
+        print(f"{count:>7} {reparent_us:>14.2f} {sort_us:>10.2f} {reparent_us / sort_us:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from panda3d.core import TextNode
+
+
+class StatusLabel:
+    """
+    Az OnscreenText helyett használható státusz felirat. A setText() nem
+    generál új glyph geometriát minden hívásnál:
+      - ha a szöveg nem változott, nem történik semmi
+      - legfeljebb max_rate frissítés másodpercenként; a köztes szövegek közül
+        csak a legutolsó jelenik meg, a keret végén
+      - a már legenerált szövegek geometriája egy LRU gyorsítótárból jön vissza
+    """
+
+    def __init__(self, text="", pos=(0, 0), scale=0.07, fg=(1, 1, 1, 1),
+                 align=TextNode.ACenter, parent=None, max_rate=15.0, cache_size=64,
+                 name="status_label"):
+        self.text_node = TextNode(name)
+        self.text_node.setAlign(align)
+        self.text_node.setTextColor(*fg)
+
+        self.root = (parent if parent is not None else base.aspect2d).attachNewNode(name)
+        self.root.setPos(pos[0], 0, pos[1])
+        self.root.setScale(scale)
+
+        self.min_interval = 1.0 / max_rate if max_rate else 0.0
+        self.cache_size = cache_size
+        self._cache = OrderedDict()    # szöveg -> legenerált geometria (PandaNode)
+        self._geom_np = None
+        self._text = None              # A kirajzolt szöveg
+        self._pending = None           # A következő engedélyezett frissítésre váró szöveg
+        self._last_refresh = None
+        self._flush_task_name = f"{name}-flush-{id(self)}"
+
+        # Statisztika (profilozáshoz)
+        self.refresh_count = 0
+        self.generate_count = 0
+
+        self._show(text)
+
+    def set_text(self, text, force=False):
+        """Új szöveg (force=True: a korlát figyelmen kívül hagyásával azonnal)."""
+        latest = self._pending if self._pending is not None else self._text
+        if text == latest and not force:
+            return
+
+        now = globalClock.getFrameTime()
+        if force or self._last_refresh is None or now - self._last_refresh >= self.min_interval:
+            self._cancel_pending()
+            self._show(text)
+            return
+
+        # Túl korai: csak a legutolsó kért szöveg jelenik meg a keret végén
+        if self._pending is None:
+            delay = self.min_interval - (now - self._last_refresh)
+            base.taskMgr.doMethodLater(delay, self._flush_pending, self._flush_task_name)
+        self._pending = text
+
+    setText = set_text
+
+    def get_text(self):
+        return self._pending if self._pending is not None else self._text
+
+    getText = get_text
+
+    def destroy(self):
+        self._cancel_pending()
+        self.root.removeNode()
+        self._cache.clear()
+
+    # --- Belső működés ---
+
+    def _cancel_pending(self):
+        if self._pending is not None:
+            base.taskMgr.remove(self._flush_task_name)
+            self._pending = None
+
+    def _flush_pending(self, task):
+        text, self._pending = self._pending, None
+        if text is not None:
+            self._show(text)
+        return task.done
+
+    def _show(self, text):
+        self._last_refresh = globalClock.getFrameTime()
+        if text == self._text:
+            return
+
+        node = self._cache.get(text)
+        if node is None:
+            self.text_node.setText(text)
+            node = self.text_node.generate()
+            self.generate_count += 1
+            self._cache[text] = node
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(text)
+
+        if self._geom_np is not None:
+            self._geom_np.detachNode()
+        self._geom_np = self.root.attachNewNode(node)
+        self._text = text
+        self.refresh_count += 1
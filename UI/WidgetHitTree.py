@@ -0,0 +1,223 @@
+from panda3d.core import Point3
+
+
+class HitEvent:
+    """
+    Egy egér esemény útja a widget fában. A kezelők sorrendje:
+      - capture: a gyökértől a célpont felé (a célpont nélkül)
+      - target: a célpont capture, majd bubble kezelői
+      - bubble: a célpont szülőjétől a gyökérig
+    Bármelyik kezelő megállíthatja a továbbhaladást (stop_propagation).
+    """
+
+    def __init__(self, name, x, y, path, data):
+        self.name = name
+        self.x = x
+        self.y = y
+        self.path = path            # [gyökér, ..., célpont]
+        self.target = path[-1]
+        self.data = data
+        self.current = None         # Az éppen futó kezelő csomópontja
+        self.phase = None           # 'capture', 'target' vagy 'bubble'
+        self.stopped = False
+
+    def stop_propagation(self):
+        self.stopped = True
+
+
+class HitNode:
+    """
+    Egy widget a fában. A bounds a widget saját kerete, a hit_bounds a
+    részfájáé (a gyerekekkel együtt), mindkettő a referencia (aspect2d)
+    koordinátáiban, gyorsítótárazva: csak invalidate() után számolódnak újra,
+    és akkor is csak a következő találat-vizsgálatnál.
+    """
+
+    def __init__(self, widget, parent=None, frame=None, name=None):
+        self.widget = widget
+        self.parent = parent
+        self.children = []
+        self.frame = frame          # Helyi keret (None: a DirectGUI widget saját frame-je)
+        self.name = name if name is not None else widget.getName()
+        self.bounds = None
+        self.hit_bounds = None
+        self.bounds_stale = True
+        self.hit_bounds_stale = True
+        self.handlers = {}          # (esemény, capture) -> [callback]
+
+    def contains(self, x, y):
+        min_x, max_x, min_y, max_y = self.bounds
+        return min_x <= x <= max_x and min_y <= y <= max_y
+
+    def __repr__(self):
+        return f"HitNode({self.name})"
+
+
+class WidgetHitTree:
+    """
+    Hierarchikus találat-vizsgálat egymásba ágyazott widgetekhez. A keresés
+    csak azokba a gyerekekbe lép be, amelyek részfájának határa tartalmazza a
+    pontot, így egy kattintás feloldása a mélységgel arányos, nem az összes
+    widget számával. Testvérek közül a később hozzáadott van felül (mint a
+    DirectGUI rajzolási sorrendjében).
+    """
+
+    def __init__(self, reference=None):
+        self.reference = reference if reference is not None else base.aspect2d
+        self.roots = []
+
+        # Statisztika (profilozáshoz)
+        self.visit_count = 0
+
+    # --- Fa felépítése ---
+
+    def add(self, widget, parent=None, frame=None, name=None):
+        """Widget felvétele (parent: HitNode vagy None a gyökér szinthez)."""
+        node = HitNode(widget, parent, frame, name)
+        if parent is None:
+            self.roots.append(node)
+        else:
+            parent.children.append(node)
+            self._invalidate_ancestors(parent)
+        return node
+
+    def remove(self, node):
+        if node.parent is None:
+            self.roots.remove(node)
+        else:
+            node.parent.children.remove(node)
+            self._invalidate_ancestors(node.parent)
+        node.parent = None
+
+    def raise_node(self, node):
+        """A csomópont a testvérei fölé kerül."""
+        siblings = self.roots if node.parent is None else node.parent.children
+        siblings.remove(node)
+        siblings.append(node)
+
+    def invalidate(self, node):
+        """A widget (és így a teljes részfája) elmozdult vagy átméreteződött."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            current.bounds_stale = True
+            current.hit_bounds_stale = True
+            stack.extend(current.children)
+        if node.parent is not None:
+            self._invalidate_ancestors(node.parent)
+
+    def _invalidate_ancestors(self, node):
+        while node is not None and not node.hit_bounds_stale:
+            node.hit_bounds_stale = True
+            node = node.parent
+
+    # --- Kezelők ---
+
+    def bind(self, node, event, callback, capture=False):
+        """callback(hit_event) a csomóponton (capture=True: a lefelé menő fázisban)."""
+        node.handlers.setdefault((event, capture), []).append(callback)
+
+    def unbind(self, node, event, callback, capture=False):
+        handlers = node.handlers.get((event, capture))
+        if handlers and callback in handlers:
+            handlers.remove(callback)
+
+    # --- Találat-vizsgálat ---
+
+    def hit_path(self, x, y, root=None):
+        """A pontot tartalmazó legmélyebb widget útja: [gyökér, ..., célpont], vagy []."""
+        path = []
+        candidates = [root] if root is not None else self.roots
+        for node in reversed(candidates):
+            if self._hit(node, x, y, path):
+                path.reverse()
+                return path
+        return []
+
+    def hit_test(self, x, y, root=None):
+        path = self.hit_path(x, y, root)
+        return path[-1] if path else None
+
+    def _hit(self, node, x, y, path):
+        """Mélységi keresés; a találat útját fordított sorrendben gyűjti."""
+        self.visit_count += 1
+        if node.widget.isHidden():
+            return False
+        self._refresh(node)
+        min_x, max_x, min_y, max_y = node.hit_bounds
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        for child in reversed(node.children):
+            if self._hit(child, x, y, path):
+                path.append(node)
+                return True
+        if node.contains(x, y):
+            path.append(node)
+            return True
+        return False
+
+    def _refresh(self, node):
+        """A gyorsítótárazott határok frissítése (csak ha elavultak)."""
+        if node.bounds_stale:
+            node.bounds = self._compute_bounds(node)
+            node.bounds_stale = False
+        if node.hit_bounds_stale:
+            min_x, max_x, min_y, max_y = node.bounds
+            for child in node.children:
+                self._refresh(child)
+                child_min_x, child_max_x, child_min_y, child_max_y = child.hit_bounds
+                min_x, max_x = min(min_x, child_min_x), max(max_x, child_max_x)
+                min_y, max_y = min(min_y, child_min_y), max(max_y, child_max_y)
+            node.hit_bounds = (min_x, max_x, min_y, max_y)
+            node.hit_bounds_stale = False
+
+    def _compute_bounds(self, node):
+        """A helyi keret négy sarka a referencia koordinátáiban (forgatás is lehet)."""
+        if node.frame is not None:
+            left, right, bottom, top = node.frame
+        else:
+            left, right, bottom, top = node.widget.guiItem.getFrame()
+        mat = node.widget.getMat(self.reference)
+        xs, ys = [], []
+        for corner_x, corner_y in ((left, bottom), (left, top), (right, bottom), (right, top)):
+            point = mat.xformPoint(Point3(corner_x, 0, corner_y))
+            xs.append(point.getX())
+            ys.append(point.getZ())
+        return (min(xs), max(xs), min(ys), max(ys))
+
+    # --- Esemény kiosztás ---
+
+    def dispatch(self, event, x, y, root=None, **data):
+        """
+        Az esemény kiosztása a pont alatti widget útján (capture, target,
+        bubble). Visszaadja a HitEvent-et, vagy None-t, ha nincs találat.
+        """
+        path = self.hit_path(x, y, root)
+        if not path:
+            return None
+        hit_event = HitEvent(event, x, y, path, data)
+        target = path[-1]
+
+        hit_event.phase = 'capture'
+        for node in path[:-1]:
+            if self._call(node, hit_event, True):
+                return hit_event
+
+        hit_event.phase = 'target'
+        if self._call(target, hit_event, True) or self._call(target, hit_event, False):
+            return hit_event
+
+        hit_event.phase = 'bubble'
+        for node in reversed(path[:-1]):
+            if self._call(node, hit_event, False):
+                return hit_event
+        return hit_event
+
+    def _call(self, node, hit_event, capture):
+        """A csomópont kezelői; visszaadja, hogy megállt-e a továbbhaladás."""
+        handlers = node.handlers.get((hit_event.name, capture))
+        if handlers:
+            hit_event.current = node
+            for callback in list(handlers):
+                callback(hit_event)
+        return hit_event.stopped
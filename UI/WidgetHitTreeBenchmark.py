@@ -0,0 +1,80 @@
+import sys
+import time
+import random
+from panda3d.core import NodePath
+
+from WidgetHitTree import WidgetHitTree
+
+
+def make_tree(tree, parent_np, parent_node, depth, branching, half_size):
+    """
+    Egymásba ágyazott widgetek: minden szinten 'branching' gyerek rácsban,
+    a szülő keretén belül. Visszaadja a widgetek listáját (mélységi sorrendben).
+    """
+    nodes = []
+    cells = int(branching ** 0.5 + 0.999)
+    child_half = half_size / cells * 0.9
+    for i in range(branching):
+        x = -half_size + (2 * (i % cells) + 1) * half_size / cells
+        y = -half_size + (2 * (i // cells) + 1) * half_size / cells
+        child_np = parent_np.attachNewNode(f'widget_{depth}_{i}')
+        child_np.setPos(x, 0, y)
+        node = tree.add(child_np, parent_node, frame=(-child_half, child_half, -child_half, child_half))
+        nodes.append(node)
+        if depth > 1:
+            nodes.extend(make_tree(tree, child_np, node, depth - 1, branching, child_half))
+    return nodes
+
+
+def linear_hit(nodes, x, y):
+    """Referencia: minden widget (gyorsítótárazott) határának ellenőrzése, a legmélyebb/legfelső nyer."""
+    hit = None
+    for node in nodes:
+        if node.contains(x, y):
+            hit = node
+    return hit
+
+
+def main():
+    """
+    Kattintás feloldása egymásba ágyazott widgetek között: az összes widget
+    végignézése, illetve a widget fa (csak a pontot tartalmazó részfákba
+    lép be).
+
+    Használat: python WidgetHitTreeBenchmark.py [kattintások száma]
+    """
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rng = random.Random(3)
+    points = [(rng.uniform(-1.0, 1.0), rng.uniform(-1.0, 1.0)) for _ in range(clicks)]
+
+    print(f"{'mélység':>8} {'elágazás':>9} {'widget':>7} {'lineáris (us)':>14} "
+          f"{'fa (us)':>8} {'látogatás':>10} {'gyorsulás':>10}")
+    for depth, branching in [(2, 9), (3, 9), (4, 9), (5, 9), (8, 3)]:
+        reference = NodePath('aspect2d')
+        tree = WidgetHitTree(reference)
+        root_np = reference.attachNewNode('panel')
+        root = tree.add(root_np, frame=(-1.0, 1.0, -1.0, 1.0))
+        nodes = [root] + make_tree(tree, root_np, root, depth, branching, 1.0)
+        tree.hit_test(0.0, 0.0) # A határok első kiszámítása
+
+        start = time.perf_counter()
+        for x, y in points:
+            linear_hit(nodes, x, y)
+        linear_us = (time.perf_counter() - start) / clicks * 1e6
+
+        tree.visit_count = 0
+        start = time.perf_counter()
+        for x, y in points:
+            tree.hit_test(x, y)
+        tree_us = (time.perf_counter() - start) / clicks * 1e6
+
+        # Ellenőrzés: ugyanazt a widgetet találják
+        for x, y in points[:200]:
+            assert tree.hit_test(x, y) is linear_hit(nodes, x, y)
+
+        print(f"{depth:>8} {branching:>9} {len(nodes):>7} {linear_us:>14.1f} "
+              f"{tree_us:>8.1f} {tree.visit_count / clicks:>10.1f} {linear_us / tree_us:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()